@@ -24,6 +24,30 @@ def _is_action_status_topic(topic_name, action_name):
     return action_name + '/_action/status' == topic_name
 
 
+def _get_action_names_and_types_by_node(node):
+    """
+    Get the action clients and servers of all nodes in the graph.
+
+    Through a daemon that supports it, the whole graph is queried at once.
+
+    :return: an iterable of (node name, node namespace, action clients
+      names and types, action servers names and types) tuples
+    """
+    daemon_node = node.daemon_node if isinstance(node, NodeStrategy) else None
+    if daemon_node is not None and 'get_node_graph' in daemon_node.methods:
+        for node_name, node_ns, endpoints in daemon_node.get_node_graph():
+            yield node_name, node_ns, endpoints['action_clients'], endpoints['action_servers']
+        return
+
+    for node_name, node_ns in node.get_node_names_and_namespaces():
+        yield (
+            node_name,
+            node_ns,
+            node.get_action_client_names_and_types_by_node(node_name, node_ns),
+            node.get_action_server_names_and_types_by_node(node_name, node_ns),
+        )
+
+
 def get_action_clients_and_servers(*, node, action_name):
     action_clients = []
     action_servers = []
@@ -31,25 +55,17 @@ def get_action_clients_and_servers(*, node, action_name):
     expanded_name = expand_topic_name(action_name, node.get_name(), node.get_namespace())
     validate_full_topic_name(expanded_name)
 
-    node_names_and_ns = node.get_node_names_and_namespaces()
-    for node_name, node_ns in node_names_and_ns:
+    for node_name, node_ns, client_names_and_types, server_names_and_types in \
+            _get_action_names_and_types_by_node(node):
         # Construct fully qualified name
         node_fqn = '/'.join(node_ns) + node_name
 
         # Get any action clients associated with the node
-        client_names_and_types = node.get_action_client_names_and_types_by_node(
-            node_name,
-            node_ns,
-        )
         for client_name, client_types in client_names_and_types:
             if client_name == expanded_name:
                 action_clients.append((node_fqn, client_types))
 
         # Get any action servers associated with the node
-        server_names_and_types = node.get_action_server_names_and_types_by_node(
-            node_name,
-            node_ns,
-        )
         for server_name, server_types in server_names_and_types:
             if server_name == expanded_name:
                 action_servers.append((node_fqn, server_types))
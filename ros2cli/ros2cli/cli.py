@@ -16,15 +16,34 @@
 import argparse
 import builtins
 import functools
+import os
 import signal
 import sys
 
-from rclpy.executors import ExternalShutdownException
+from ros2cli.server import is_server_requested
+from ros2cli.server import run_on_server
 
-from ros2cli.command import add_subparsers_on_demand
+
+def _is_external_shutdown(exception):
+    # rclpy is imported lazily by the extensions which need it, if it hasn't
+    # been imported the exception can't be an ExternalShutdownException
+    executors = sys.modules.get('rclpy.executors')
+    if executors is None:
+        return False
+    return isinstance(exception, executors.ExternalShutdownException)
 
 
 def main(*, script_name='ros2', argv=None, description=None, extension=None):
+    # forward the invocation to the resident server if requested
+    if extension is None and is_server_requested() and \
+            '_ARGCOMPLETE' not in os.environ:
+        rc = run_on_server(sys.argv[1:] if argv is None else argv)
+        if rc is not None:
+            return rc
+
+    # only import the plugin system when executing the command in this process
+    from ros2cli.command import add_subparsers_on_demand
+
     if description is None:
         description = f'{script_name} is an extensible command-line tool ' \
             'for ROS 2.'
@@ -55,13 +74,14 @@ def main(*, script_name='ros2', argv=None, description=None, extension=None):
             hide_extensions=['extension_points', 'extensions'],
             required=False, argv=argv)
 
-    # register argcomplete hook if available
-    try:
-        from argcomplete import autocomplete
-    except ImportError:
-        pass
-    else:
-        autocomplete(parser, exclude=['-h', '--help'])
+    # register argcomplete hook if available and completion is requested
+    if '_ARGCOMPLETE' in os.environ:
+        try:
+            from argcomplete import autocomplete
+        except ImportError:
+            pass
+        else:
+            autocomplete(parser, exclude=['-h', '--help'])
 
     # parse the command line arguments
     args = parser.parse_args(args=argv)
@@ -91,8 +111,11 @@ def main(*, script_name='ros2', argv=None, description=None, extension=None):
         rc = extension.main(parser=parser, args=args)
     except KeyboardInterrupt:
         rc = signal.SIGINT
-    except ExternalShutdownException:
-        rc = signal.SIGTERM
-    except RuntimeError as e:
-        rc = str(e)
+    except Exception as e:
+        if _is_external_shutdown(e):
+            rc = signal.SIGTERM
+        elif isinstance(e, RuntimeError):
+            rc = str(e)
+        else:
+            raise
     return rc
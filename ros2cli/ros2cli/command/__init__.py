@@ -19,7 +19,9 @@ import os
 import types
 
 from ros2cli.entry_points import get_entry_points
+from ros2cli.entry_points import get_extension_specs
 from ros2cli.entry_points import get_first_line_doc
+from ros2cli.entry_points import store_extension_specs
 from ros2cli.plugin_system import instantiate_extensions
 from ros2cli.plugin_system import PLUGIN_SYSTEM_VERSION
 from ros2cli.plugin_system import satisfies_version
@@ -153,7 +155,8 @@ def add_subparsers_on_demand(
 
     For each extension a subparser is created is necessary.
     If no extension has been selected by command line arguments all first level
-    extension must be loaded and instantiated.
+    extension must be loaded and instantiated, unless their descriptions
+    are cached (see `ros2cli.entry_points.get_extension_specs`).
     If a specific extension has been selected by command line arguments the
     sibling extension can be skipped and only that one extension (as well as
     potentially its recursive extensions) are loaded and instantiated.
@@ -203,6 +206,7 @@ def add_subparsers_on_demand(
             from argcomplete import split_line
             _, _, _, comp_words, _ = split_line(os.environ['COMP_LINE'])
             args = comp_words[1:]
+        parsed = True
         try:
             known_args, _ = root_parser.parse_known_args(args=args)
         except SystemExit:
@@ -210,25 +214,35 @@ def add_subparsers_on_demand(
                 raise
             # if the partial arguments can't be parsed use no known args
             known_args = argparse.Namespace(**{subparser.dest: None})
+            parsed = False
 
     # check if a specific subparser is selected
     name = getattr(known_args, subparser.dest)
     if name is None:
+        # No extension will be selected by parsing the same arguments again,
+        # so only descriptions are needed, which are cached to not load all
+        # extensions each time.  Unless parsing failed, during completion.
+        specs = get_extension_specs(group_name) if parsed else None
+        if specs is None:
+            command_extensions = get_command_extensions(group_name)
+            for name, extension in command_extensions.items():
+                command_parsers[name].set_defaults(**{dest: extension})
+            specs = {
+                name: {'description': get_first_line_doc(extension)}
+                for name, extension in command_extensions.items()
+            }
+            store_extension_specs(group_name, specs)
         # add description for all command extensions to the root parser
-        command_extensions = get_command_extensions(group_name)
-        if command_extensions:
+        if specs:
             description = ''
             max_length = max(
-                len(name) for name in command_extensions.keys()
+                len(name) for name in specs.keys()
                 if hide_extensions is None or name not in hide_extensions)
-            for name in sorted(command_extensions.keys()):
+            for name in sorted(specs.keys()):
                 if hide_extensions is not None and name in hide_extensions:
                     continue
-                extension = command_extensions[name]
                 description += '%s  %s\n' % (
-                    name.ljust(max_length), get_first_line_doc(extension))
-                command_parser = command_parsers[name]
-                command_parser.set_defaults(**{dest: extension})
+                    name.ljust(max_length), specs[name]['description'])
             mutable_description.value = description
     else:
         # add description for the selected command extension to the subparser
@@ -16,6 +16,7 @@
 from ros2cli.command import CommandExtension
 from ros2cli.entry_points import get_all_entry_points
 from ros2cli.entry_points import get_first_line_doc
+from ros2cli.entry_points import rebuild_entry_point_cache
 
 
 class ExtensionsCommand(CommandExtension):
@@ -33,8 +34,17 @@ class ExtensionsCommand(CommandExtension):
             action='store_true',
             default=False,
             help='Show more information for each extension')
+        parser.add_argument(
+            '--rebuild-cache',
+            action='store_true',
+            default=False,
+            help='Rebuild the cached index of entry points from scratch')
 
     def main(self, *, parser, args):
+        if args.rebuild_cache:
+            count = rebuild_entry_point_cache()
+            print(f'Rebuilt entry point cache ({count} distributions)')
+            return
         all_entry_points = get_all_entry_points()
         for group_name in sorted(all_entry_points.keys()):
             print(group_name)
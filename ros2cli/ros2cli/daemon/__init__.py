@@ -13,22 +13,43 @@
 # limitations under the License.
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+import errno
+import functools
 import os
+import socket
 import time
 import uuid
 
 import rclpy
-import rclpy.action
+
+from ros2cli.daemon.event_loop import EventLoop
+from ros2cli.daemon.graph_cache import GraphCache
+from ros2cli.daemon.graph_cache import GraphChangeListener
+from ros2cli.daemon.graph_snapshot import get_graph_snapshot_path
+from ros2cli.daemon.graph_snapshot import GraphSnapshotWriter
+from ros2cli.daemon.graph_snapshot import is_graph_snapshot_supported
+from ros2cli.daemon.graph_watch import GraphWatcher
+from ros2cli.daemon.graph_watch import take_graph_snapshot
+from ros2cli.daemon.graph_watch import WATCH_PERIOD
+from ros2cli.daemon.stats import DaemonStats
 
 from ros2cli.helpers import before_invocation
-from ros2cli.helpers import bind
 from ros2cli.helpers import get_ros_domain_id
+from ros2cli.helpers import get_runtime_dir
 from ros2cli.helpers import pretty_print_call
 
 from ros2cli.node.network_aware import NetworkAwareNode
 
+from ros2cli.rpc.local_server import KEEP_ALIVE_TIMEOUT
+from ros2cli.rpc.local_server import LocalRPCServer
+
+from ros2cli.xmlrpc.client import ServerProxy
+from ros2cli.xmlrpc.client import UnixStreamTransport
+from ros2cli.xmlrpc.local_server import LocalUnixXMLRPCServer
 from ros2cli.xmlrpc.local_server import LocalXMLRPCServer
 from ros2cli.xmlrpc.local_server import SimpleXMLRPCRequestHandler
+from ros2cli.xmlrpc.local_server import UnixXMLRPCRequestHandler
 
 
 def get_port():
@@ -43,18 +64,64 @@ def get_address():
 
 class RequestHandler(SimpleXMLRPCRequestHandler):
     rpc_paths = ('/ros2cli/',)
+    # keep connections alive across requests, but close them when idle
+    # so that they do not hold on to a worker thread for too long
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+
+    def handle_one_request(self):
+        super().handle_one_request()
+        if self.server.closing:
+            self.close_connection = True
+
+
+class UnixRequestHandler(UnixXMLRPCRequestHandler, RequestHandler):
+    pass
 
 
 def get_xmlrpc_server_url(address=None):
     if not address:
         address = get_address()
-    host, port = address
     path = RequestHandler.rpc_paths[0]
+    if isinstance(address, str):
+        # a Unix domain socket, the host is only used in HTTP headers
+        return f'http://localhost{path}'
+    host, port = address
     return f'http://{host}:{port}{path}'
 
 
+def get_xmlrpc_server_path():
+    """
+    Get the path of the Unix domain socket of the XML-RPC transport.
+
+    The path is specific to the current user and ROS domain id.
+    """
+    return os.path.join(
+        get_runtime_dir(), f'ros2cli-daemon-{os.getuid()}-{get_ros_domain_id()}-xmlrpc.sock')
+
+
 def make_xmlrpc_server() -> LocalXMLRPCServer:
-    """Make local XMLRPC server listening over ros2cli daemon's default port."""
+    """
+    Make local XMLRPC server listening on ros2cli daemon's address.
+
+    The server listens on a Unix domain socket (see `get_xmlrpc_server_path()`)
+    if available, and over ros2cli daemon's default port otherwise, e.g. if
+    the socket path is too long or its directory is not writable.
+
+    :raises OSError: with `errno.EADDRINUSE` if a daemon is already running.
+    """
+    if hasattr(socket, 'AF_UNIX'):
+        try:
+            return LocalUnixXMLRPCServer(
+                get_xmlrpc_server_path(), logRequests=False,
+                requestHandler=UnixRequestHandler,
+                allow_none=True
+            )
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE:
+                raise
+
     address = get_address()
 
     return LocalXMLRPCServer(
@@ -64,91 +131,281 @@ def make_xmlrpc_server() -> LocalXMLRPCServer:
     )
 
 
-def serve(server: LocalXMLRPCServer, *, timeout: int = 2 * 60 * 60):
+def make_xmlrpc_server_proxy() -> ServerProxy:
+    """Make a proxy to the server made by `make_xmlrpc_server()`."""
+    path = None
+    if hasattr(socket, 'AF_UNIX'):
+        try:
+            path = get_xmlrpc_server_path()
+        except PermissionError:
+            # the server can't listen there either, see `get_runtime_dir()`
+            pass
+    if path is not None and os.path.exists(path):
+        transport = UnixStreamTransport(path)
+        return ServerProxy(
+            get_xmlrpc_server_url(path), transport=transport, allow_none=True)
+    return ServerProxy(get_xmlrpc_server_url(), allow_none=True)
+
+
+def get_rpc_server_path():
+    """
+    Get the path of the Unix domain socket of the compact RPC transport.
+
+    The path is specific to the current user and ROS domain id.
+    """
+    return os.path.join(
+        get_runtime_dir(), f'ros2cli-daemon-{os.getuid()}-{get_ros_domain_id()}.sock')
+
+
+def make_rpc_server():
+    """
+    Make local compact RPC server listening on ros2cli daemon's socket path.
+
+    :return: the server, or `None` if Unix domain sockets are not available,
+      or if the runtime directory can't be trusted (see `get_runtime_dir()`)
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    try:
+        path = get_rpc_server_path()
+    except PermissionError:
+        return None
+    # the daemon owns the XML-RPC port, any existing socket must be stale
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    return LocalRPCServer(path)
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _process_request(server, request, client_address):
+    # mimics socketserver.ThreadingMixIn.process_request_thread()
+    try:
+        server.finish_request(request, client_address)
+    except Exception:
+        server.handle_error(request, client_address)
+    finally:
+        server.shutdown_request(request)
+
+
+def handle_request_in_executor(server, executor):
+    """
+    Accept a request on `server` and process it in `executor`.
+
+    `server` must be ready to accept a connection.
+    """
+    try:
+        request, client_address = server.get_request()
+    except OSError:
+        return
+    if server.verify_request(request, client_address):
+        executor.submit(_process_request, server, request, client_address)
+    else:
+        server.shutdown_request(request)
+
+
+def get_graph_queries(node):
+    """
+    Get the graph queries served by the daemon.
+
+    :param node: a `ros2cli.node.network_aware.NetworkAwareNode` instance
+    :return: a list of bound methods of `node`
+    """
+    return [
+        node.get_node_names_and_namespaces,
+        node.get_node_names_and_namespaces_with_enclaves,
+        node.get_topic_names_and_types,
+        node.get_service_names_and_types,
+        node.get_action_names_and_types,
+        node.get_publisher_names_and_types_by_node,
+        node.get_publishers_info_by_topic,
+        node.get_subscriber_names_and_types_by_node,
+        node.get_subscriptions_info_by_topic,
+        node.get_service_names_and_types_by_node,
+        node.get_client_names_and_types_by_node,
+        node.get_action_server_names_and_types_by_node,
+        node.get_action_client_names_and_types_by_node,
+        node.count_publishers,
+        node.count_subscribers,
+        node.count_clients,
+        node.count_services,
+        node.get_node_graph
+    ]
+
+
+def serve(
+    server: LocalXMLRPCServer, *, timeout: int = 2 * 60 * 60,
+    max_workers: int = DEFAULT_MAX_WORKERS
+):
     """
     Serve the ros2cli daemon API using the given `server`.
 
-    :param server: an XMLRPC server instance
+    Besides the given XMLRPC `server`, the API is also served over the
+    compact RPC transport if available (see `make_rpc_server()`).
+    Graph queries are answered from a snapshot that is only refreshed
+    when the graph changes (see `ros2cli.daemon.graph_cache`), and that is
+    also shared with clients through a memory-mapped file if supported
+    (see `ros2cli.daemon.graph_snapshot`).
+
+    :param server: an XMLRPC server instance, closed on return
     :param timeout: how long to wait before shutting
       down the server due to inactivity.
+    :param max_workers: how many requests may be processed concurrently,
+      half of which at most by clients waiting for graph changes.
     """
     ros_domain_id = get_ros_domain_id()
     node_args = argparse.Namespace(
         node_name_suffix=f'_daemon_{ros_domain_id}_{uuid.uuid4().hex}',
         start_parameter_services=False,
-        start_type_description_service=False)
+        start_type_description_service=False,
+        no_daemon=True)
     with NetworkAwareNode(node_args) as node:
+        graph_cache = GraphCache()
+        # clients waiting for changes wake the loop below, see `EventLoop`,
+        # and must leave workers for other requests
+        graph_watcher = GraphWatcher(
+            functools.partial(take_graph_snapshot, node),
+            max_watchers=max_workers // 2,
+            on_watch=lambda: event_loop.wake())
+        graph_snapshot = None
+        if is_graph_snapshot_supported():
+            try:
+                graph_snapshot = GraphSnapshotWriter(get_graph_snapshot_path())
+            except PermissionError as e:
+                print(f'Not publishing graph snapshots: {e}')
+
+        def on_graph_change():
+            graph_watcher.notify_change()
+            if graph_snapshot is not None:
+                graph_snapshot.invalidate()
+        graph_listener = GraphChangeListener(node, graph_cache, on_change=on_graph_change)
+        # pending changes are processed before every query, not only
+        # once per connection, as connections may be kept alive
+        queries = {
+            query.__name__: graph_cache.cached(query, poll=graph_listener.poll)
+            for query in get_graph_queries(node)
+        }
         functions = [
             node.get_name,
             node.get_namespace,
-            node.get_node_names_and_namespaces,
-            node.get_node_names_and_namespaces_with_enclaves,
-            node.get_topic_names_and_types,
-            node.get_service_names_and_types,
-            bind(rclpy.action.get_action_names_and_types, node),
-            node.get_publisher_names_and_types_by_node,
-            node.get_publishers_info_by_topic,
-            node.get_subscriber_names_and_types_by_node,
-            node.get_subscriptions_info_by_topic,
-            node.get_service_names_and_types_by_node,
-            node.get_client_names_and_types_by_node,
-            bind(rclpy.action.get_action_server_names_and_types_by_node, node),
-            bind(rclpy.action.get_action_client_names_and_types_by_node, node),
-            node.count_publishers,
-            node.count_subscribers,
-            node.count_clients,
-            node.count_services
+            *queries.values(),
+            graph_watcher.get_graph_changes
         ]
 
-        # Dealing with the timeouts in this server is a bit tricky.  The caller
-        # passes in an overall inactivity timeout via the 'timeout' parameter;
-        # this server should quit when there is no activity within that timeout.
-        # The 'server.timeout' specifies how long 'server.handle_request()'
-        # should wait in 'select()' before returning with no work to do.  We set
-        # the 'server.timeout' to 200 milliseconds so we will react fairly
-        # quickly to external signals and quit.  To deal with the overall
-        # timeout, each function that is called resets the timer.  The result
-        # of all of this is that we properly react to signals (SIGINT and
-        # SIGTERM), we properly timeout when we are idle, and we properly quit
-        # when we are told to shutdown.
-
-        last_function_call_time = time.time()
+        def publish_graph_snapshot():
+            try:
+                graph_snapshot.publish(
+                    queries['get_topic_names_and_types'](),
+                    queries['get_service_names_and_types'](),
+                    queries['get_node_graph'](),
+                    max_age=graph_cache.max_age)
+            except Exception as e:
+                print(f'Failed to publish graph snapshot: {e}')
+
+        # The daemon quits when no function has been called for 'timeout'
+        # seconds, when told to shutdown, or on SIGINT and SIGTERM.  Rather
+        # than waking up periodically to check for any of these, the loop
+        # below blocks until a connection comes in, a signal is received,
+        # the shutdown function is called or the inactivity timeout elapses
+        # (see `EventLoop`).  As functions are called in other threads, the
+        # remaining time is computed again whenever the loop wakes up.
+        # While clients watch the graph, or may read a graph snapshot, the
+        # loop also wakes up every WATCH_PERIOD to look for changes on their
+        # behalf.  Graph snapshots are published again on demand, i.e. after
+        # a request comes in while there is no fresh snapshot.
+
+        last_function_call_time = time.monotonic()
 
         def reset_timer_and_pretty_print(func, *args, **kwargs):
             nonlocal last_function_call_time
-            last_function_call_time = time.time()
+            last_function_call_time = time.monotonic()
             pretty_print_call(func, args, kwargs)
 
-        server.register_introspection_functions()
-        for func in functions:
-            server.register_function(
-                before_invocation(
-                    func, reset_timer_and_pretty_print))
+        try:
+            rpc_server = make_rpc_server()
+        except OSError as e:
+            print(f'Failed to serve compact RPC: {e}')
+            rpc_server = None
+        servers = [server] if rpc_server is None else [server, rpc_server]
+
+        # see `ros2 daemon stats`
+        stats = DaemonStats()
+        functions = [stats.instrument(func) for func in functions]
+
+        for s in servers:
+            s.register_introspection_functions()
+            s.register_multicall_functions()
+            for func in functions:
+                s.register_function(
+                    before_invocation(
+                        func, reset_timer_and_pretty_print))
+            s.register_function(stats.to_dict, 'system.stats')
+            s.request_stats = stats
 
         shutdown = False
-
-        def timeout_handler():
-            nonlocal shutdown
-
-            if time.time() - last_function_call_time > timeout:
-                print('Shutdown due to timeout')
-                shutdown = True
-        server.handle_timeout = timeout_handler
-        server.timeout = 0.2
+        event_loop = EventLoop(servers)
 
         # function to shutdown daemon remotely
         def shutdown_handler():
             nonlocal shutdown
             print('Remote shutdown requested')
             shutdown = True
-        server.register_function(shutdown_handler, 'system.shutdown')
-
-        print('Serving XML-RPC on ' + get_xmlrpc_server_url(server.server_address))
+            for s in servers:
+                s.closing = True
+            event_loop.wake()
+        for s in servers:
+            s.register_function(shutdown_handler, 'system.shutdown')
+
+        if isinstance(server.server_address, str):
+            print('Serving XML-RPC on ' + server.server_address)
+        else:
+            print('Serving XML-RPC on ' + get_xmlrpc_server_url(server.server_address))
+        if rpc_server is not None:
+            print('Serving compact RPC on ' + rpc_server.server_address)
+        # Connections are accepted here, requests are processed by a pool
+        # of threads such that slow queries do not stall other clients.
+        # The daemon node may not be reset while in use (see
+        # `NetworkAwareNode.in_use()`), so concurrent graph queries are safe.
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='ros2cli_daemon')
         try:
-            while rclpy.ok() and not shutdown:
-                server.handle_request()
+            with event_loop:
+                while rclpy.ok() and not shutdown:
+                    remaining_time = last_function_call_time + timeout - time.monotonic()
+                    if remaining_time <= 0:
+                        print('Shutdown due to timeout')
+                        break
+                    watched = graph_watcher.watched or (
+                        graph_snapshot is not None and graph_snapshot.is_fresh())
+                    if watched:
+                        remaining_time = min(remaining_time, WATCH_PERIOD)
+                    readable = event_loop.wait(remaining_time)
+                    if not readable and not watched:
+                        continue
+                    graph_listener.poll()
+                    graph_watcher.update(max_age=graph_cache.max_age)
+                    for s in readable:
+                        handle_request_in_executor(s, executor)
+                    if (
+                        readable and graph_snapshot is not None and
+                        not graph_snapshot.is_fresh() and graph_cache.is_settled()
+                    ):
+                        publish_graph_snapshot()
         except KeyboardInterrupt:
             pass
+        finally:
+            for s in servers:
+                s.closing = True
+            graph_watcher.close()
+            if graph_snapshot is not None:
+                graph_snapshot.close()
+            executor.shutdown(wait=True)
+            # also removes the socket files of servers on Unix domain sockets
+            for s in servers:
+                s.server_close()
 
 
 def main(*, argv=None):
@@ -165,6 +422,9 @@ def main(*, argv=None):
     parser.add_argument(
         '--timeout', metavar='N', type=int, default=2 * 60 * 60,
         help='Shutdown the daemon after N seconds of inactivity')
+    parser.add_argument(
+        '--max-workers', metavar='N', type=int, default=DEFAULT_MAX_WORKERS,
+        help='Process up to N requests concurrently')
     args = parser.parse_args(args=argv)
 
     # the arguments are only passed for visibility in e.g. the process list
@@ -172,7 +432,7 @@ def main(*, argv=None):
     assert args.ros_domain_id == get_ros_domain_id()
 
     with make_xmlrpc_server() as server:
-        serve(server, timeout=args.timeout)
+        serve(server, timeout=args.timeout, max_workers=args.max_workers)
 
 
 if __name__ == '__main__':
@@ -16,10 +16,14 @@ import copyreg
 import os
 import pickle
 import platform
+import select
+import signal
 import socket
 import subprocess
 import sys
 import threading
+import time
+import traceback
 
 from ros2cli.helpers import wait_for
 
@@ -79,7 +83,131 @@ def main():
     return callable_()
 
 
-def daemonize(callable_, tags={}, timeout=None, debug=False):
+def list_open_fds():
+    """
+    List the file descriptors open in this process.
+
+    :return: a list of file descriptors, or `None` if
+      they can't be listed on this platform.
+    """
+    for fd_dir in ('/proc/self/fd', '/dev/fd'):
+        try:
+            # the descriptor of the directory itself is listed too
+            return [int(fd) for fd in os.listdir(fd_dir)]
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def is_fork_safe():
+    """Check if this process may be forked to spawn a daemon, i.e. it's single threaded."""
+    if not hasattr(os, 'fork') or not hasattr(os, 'setsid'):
+        return False
+    try:
+        # also accounts for threads not started by Python
+        return len(os.listdir('/proc/self/task')) == 1
+    except OSError:
+        return threading.active_count() == 1
+
+
+def _print_timings(timings):
+    print('Daemon spawn timings: ' + ', '.join(
+        f'{phase} {duration * 1e3:.1f} ms' for phase, duration in timings))
+
+
+def _release_non_inheritable_fds(null_fd, keep):
+    # What exec() would do given the close-on-exec flags, except that
+    # descriptors are replaced rather than closed: objects inherited from
+    # the parent process may still close them later on, by which time
+    # their numbers could have been reused by the daemon.
+    fds = list_open_fds()
+    if fds is None:
+        fds = range(3, os.sysconf('SC_OPEN_MAX'))
+    for fd in fds:
+        if fd < 3 or fd == null_fd or fd in keep:
+            continue
+        try:
+            if not os.get_inheritable(fd):
+                os.dup2(null_fd, fd, inheritable=False)
+        except OSError:
+            # e.g. the descriptor of the listed directory
+            continue
+
+
+def _run_forked_daemon(callable_, ready_fd, debug):
+    """Run the callable object in the (grandchild) daemon process, this function never returns."""
+    rc = 1
+    try:
+        if not debug:
+            os.setsid()
+        null_fd = os.open(os.devnull, os.O_RDWR)
+        _release_non_inheritable_fds(null_fd, keep={ready_fd})
+        os.dup2(null_fd, 0)
+        if not debug:
+            os.dup2(null_fd, 1)
+            os.dup2(null_fd, 2)
+        os.close(null_fd)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for name in ('SIGTERM', 'SIGCHLD', 'SIGPIPE'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), signal.SIG_DFL)
+        # the daemon is ready
+        os.write(ready_fd, b'\0')
+        os.close(ready_fd)
+        callable_()
+        rc = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(rc)
+
+
+def _fork_daemon(callable_, timeout, debug, timings):
+    start = time.perf_counter()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    ready_fd, daemon_ready_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(ready_fd)
+            # fork again, such that the daemon is not a child
+            # of this process and does not have to be reaped
+            if os.fork() == 0:
+                _run_forked_daemon(callable_, daemon_ready_fd, debug)
+        finally:
+            os._exit(0)
+    os.close(daemon_ready_fd)
+    try:
+        os.waitpid(pid, 0)
+        timings.append(('fork', time.perf_counter() - start))
+
+        if timeout is None:
+            return
+        start = time.perf_counter()
+        if timeout < 0:
+            timeout = None
+        readable, _, _ = select.select([ready_fd], [], [], timeout)
+        if not readable:
+            raise RuntimeError(
+                'Timed out waiting for '
+                'daemon to become ready'
+            )
+        if not os.read(ready_fd, 1):
+            # the pipe was closed before the daemon got ready
+            raise RuntimeError('Daemon process died')
+        timings.append(('ready', time.perf_counter() - start))
+    finally:
+        os.close(ready_fd)
+        if debug:
+            _print_timings(timings)
+
+
+def daemonize(callable_, tags={}, timeout=None, debug=False, *, fork=False, timings=None):
     """
     Spawn a callable object as a daemon.
 
@@ -98,8 +226,24 @@ def daemonize(callable_, tags={}, timeout=None, debug=False):
       result in an indefinite wait.
     :param debug: if `True`, the daemon process will not be
       detached and share both `stdout` and `stderr` streams
-      with its parent process.
+      with its parent process. Timings of each phase of the
+      spawn are printed as well.
+    :param fork: if `True`, the daemon process is forked from
+      the current process, instead of being a new interpreter.
+      This is much faster, as modules imported already do not
+      have to be imported again, but only safe in single threaded
+      processes (see `is_fork_safe()`). Inheritable file descriptors
+      are kept and the callable object is not pickled. Tags are
+      ignored, as the command line of the current process is kept.
+    :param timings: optional list of (phase, duration) tuples, for
+      phases of the spawn preceding this call. Durations of each phase
+      of daemonization are appended to it.
     """
+    if timings is None:
+        timings = []
+    if fork:
+        return _fork_daemon(callable_, timeout, debug, timings)
+
     # Use daemon `main()` function
     prog = f'from {__name__} import main; main()'
     cmd = [sys.executable, '-c', prog]
@@ -127,14 +271,21 @@ def daemonize(callable_, tags={}, timeout=None, debug=False):
     # some.
     kwargs['close_fds'] = False
 
+    start = time.perf_counter()
+
     # Spawn child process
     process = subprocess.Popen(cmd, **kwargs)
+    timings.append(('popen', time.perf_counter() - start))
 
     # Send serialized callable object through stdin pipe
+    start = time.perf_counter()
     pickler = PicklerForProcess(process)
     pickler.dump(callable_)
+    timings.append(('transfer', time.perf_counter() - start))
 
     if timeout is not None:
+        start = time.perf_counter()
+
         # Wait for daemon to be ready by
         # monitoring when the stdin pipe
         # is closed
@@ -150,6 +301,9 @@ def daemonize(callable_, tags={}, timeout=None, debug=False):
                 'Timed out waiting for '
                 'daemon to become ready'
             )
+        timings.append(('ready', time.perf_counter() - start))
+    if debug:
+        _print_timings(timings)
     # Make sure the daemon process is still alive
     # (and that the stdin pipe was purposefully closed)
     # before returning.
@@ -0,0 +1,91 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import selectors
+import signal
+import socket
+
+
+class EventLoop:
+    """
+    Wait for requests on a set of servers without polling.
+
+    The loop blocks until a server is ready to accept a connection, a signal
+    is received, another thread calls `wake()` or a timeout elapses, whichever
+    comes first.
+    Signals are noticed through `signal.set_wakeup_fd()`, such that handlers
+    installed outside Python (e.g. by rclpy) also interrupt the wait.
+    """
+
+    def __init__(self, servers):
+        """
+        Construct an EventLoop.
+
+        :param servers: `socketserver.BaseServer` instances to wait on.
+        """
+        self._selector = selectors.DefaultSelector()
+        for server in servers:
+            self._selector.register(server, selectors.EVENT_READ)
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._previous_wakeup_fd = None
+
+    def __enter__(self):
+        try:
+            self._previous_wakeup_fd = signal.set_wakeup_fd(
+                self._wakeup_send.fileno(), warn_on_full_buffer=False)
+        except ValueError:
+            # not in the main thread, signals will not interrupt the wait
+            self._previous_wakeup_fd = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._previous_wakeup_fd is not None:
+            signal.set_wakeup_fd(self._previous_wakeup_fd)
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+    def wake(self):
+        """Interrupt an ongoing (or the next) `wait()`, from any thread."""
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:
+            # the buffer is full, a wake up is pending already
+            pass
+
+    def wait(self, timeout=None):
+        """
+        Wait for events.
+
+        :param timeout: optional duration, in seconds, to wait for.
+        :return: a list of the servers ready to accept a connection,
+          empty if interrupted or if the timeout elapsed.
+        """
+        readable = []
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._wakeup_recv:
+                self._drain()
+            else:
+                readable.append(key.fileobj)
+        return readable
+
+    def _drain(self):
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except OSError:
+            pass
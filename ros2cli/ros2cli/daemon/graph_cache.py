@@ -0,0 +1,203 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Graph snapshot cache for the ros2cli daemon.
+
+Results of graph queries are kept in memory until the graph changes.
+Changes are detected by listening to the ``ros_discovery_info`` topic, on
+which every participant of DDS based RMW implementations announces updates
+to its nodes and their endpoints.
+Since these announcements may precede discovery of the endpoints themselves,
+queries answered shortly after a change are not cached (see `settle_time`).
+Not all changes are announced, e.g. a participant that crashed will only be
+removed once its lease expires, so cached results also expire after
+`max_age` seconds.
+"""
+
+import functools
+import threading
+import time
+
+import rclpy
+from rclpy.qos import DurabilityPolicy
+from rclpy.qos import QoSProfile
+from rclpy.qos import ReliabilityPolicy
+
+DEFAULT_MAX_AGE = 5.0
+
+DEFAULT_SETTLE_TIME = 1.0
+
+# used if graph changes are not announced, e.g. by non DDS based RMW implementations
+FALLBACK_MAX_AGE = 0.5
+
+GRAPH_CHANGES_TOPIC = '/ros_discovery_info'
+
+# prefixes of the identifiers of the (DDS based) RMW implementations
+# that announce graph changes on GRAPH_CHANGES_TOPIC
+ANNOUNCING_RMW_IMPLEMENTATIONS = (
+    'rmw_connextdds', 'rmw_cyclonedds', 'rmw_fastrtps', 'rmw_gurumdds')
+
+
+def are_graph_changes_announced(rmw_implementation):
+    """
+    Check whether an RMW implementation announces graph changes.
+
+    :param rmw_implementation: an RMW implementation identifier.
+    """
+    return rmw_implementation.startswith(ANNOUNCING_RMW_IMPLEMENTATIONS)
+
+
+class GraphCache:
+    """Cache of graph query results, keyed by query name and arguments."""
+
+    def __init__(
+        self, *, max_age=DEFAULT_MAX_AGE, settle_time=DEFAULT_SETTLE_TIME,
+        clock=time.monotonic
+    ):
+        """
+        Construct a GraphCache.
+
+        :param max_age: duration, in seconds, after which
+          a cached result is discarded.
+        :param settle_time: duration, in seconds, after a graph
+          change during which results are not cached.
+        :param clock: function returning the current time, in seconds.
+        """
+        self.max_age = max_age
+        self.settle_time = settle_time
+        self._clock = clock
+        self._entries = {}
+        self._last_change_time = None
+
+    def notify_change(self):
+        """Discard all cached results, the graph has changed."""
+        self._entries.clear()
+        self._last_change_time = self._clock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_settled(self):
+        """Check whether the last graph change is older than `settle_time`."""
+        if self._last_change_time is None:
+            return True
+        return self._clock() - self._last_change_time >= self.settle_time
+
+    def cached(self, func, *, poll=None):
+        """
+        Wrap a graph query `func` such that its results are cached.
+
+        :param func: the graph query to wrap.
+        :param poll: optional function processing pending graph changes,
+          called before each lookup, e.g. `GraphChangeListener.poll()`.
+        """
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if poll is not None:
+                poll()
+            try:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and self._is_valid(entry[0], now):
+                return entry[1]
+            value = func(*args, **kwargs)
+            if self._is_valid(now, now):
+                self._entries[key] = (now, value)
+            return value
+        return wrapper
+
+    def _is_valid(self, timestamp, now):
+        if now - timestamp >= self.max_age:
+            return False
+        if self._last_change_time is None:
+            return True
+        return timestamp - self._last_change_time >= self.settle_time
+
+
+class GraphChangeListener:
+    """Notify a `GraphCache` of changes seen by a (network aware) daemon node."""
+
+    def __init__(self, node, cache, *, on_change=None):
+        """
+        Construct a GraphChangeListener.
+
+        :param node: a `ros2cli.node.network_aware.NetworkAwareNode` instance.
+        :param cache: the `GraphCache` instance to notify.
+        :param on_change: optional function to call as well on graph changes.
+        """
+        self._node = node
+        self._cache = cache
+        self._on_change_callback = on_change
+        self._rclpy_node = None
+        self._subscription = None
+        self._pending = False
+        # spinning the node from several threads at once is not supported
+        self._lock = threading.Lock()
+
+    def _on_change(self, msg):
+        self._pending = True
+        self._notify_change()
+
+    def _notify_change(self):
+        self._cache.notify_change()
+        if self._on_change_callback is not None:
+            self._on_change_callback()
+
+    def _subscribe(self, rclpy_node):
+        # the message type may be available even if the RMW implementation
+        # in use never publishes it, e.g. rmw_zenoh_cpp
+        if not are_graph_changes_announced(rclpy.get_rmw_implementation_identifier()):
+            return None
+        try:
+            from rmw_dds_common.msg import ParticipantEntitiesInfo
+        except ImportError:
+            return None
+        qos_profile = QoSProfile(
+            depth=100,
+            reliability=ReliabilityPolicy.RELIABLE,
+            durability=DurabilityPolicy.VOLATILE,
+            avoid_ros_namespace_conventions=True)
+        return rclpy_node.create_subscription(
+            ParticipantEntitiesInfo, GRAPH_CHANGES_TOPIC, self._on_change, qos_profile)
+
+    def poll(self):
+        """
+        Process pending graph change announcements.
+
+        This method is thread-safe, it only blocks while
+        another thread processes announcements.
+        """
+        with self._node.in_use(), self._lock:
+            direct_node = self._node.node
+            rclpy_node = direct_node.node
+            if rclpy_node is not self._rclpy_node:
+                # the daemon node was (re)created, start from scratch
+                self._rclpy_node = rclpy_node
+                self._subscription = self._subscribe(rclpy_node)
+                if self._subscription is None:
+                    self._cache.max_age = min(self._cache.max_age, FALLBACK_MAX_AGE)
+                self._notify_change()
+            if self._subscription is None:
+                return
+            self._pending = True
+            while self._pending:
+                self._pending = False
+                direct_node.spin_once(timeout_sec=0)
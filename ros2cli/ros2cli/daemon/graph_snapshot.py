@@ -0,0 +1,428 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Graph snapshots shared by the ros2cli daemon through memory-mapped files.
+
+The daemon publishes the nodes, topics and services in the graph, and the
+endpoints of each node, in a file that clients map into memory and query
+without any request to the daemon (see `GraphSnapshot`).
+
+A snapshot file holds a header, an array of 32-bit words and a table of
+UTF-8 strings, each of them stored once and referred to by index.
+Lists of names and types are sorted by name, and nodes by name and
+namespace, such that they can be looked up by bisection.
+Snapshot files are never modified but for the sequence number in their
+header: a new snapshot is written to a new file that atomically replaces
+the previous one, while the sequence number of a snapshot is bumped in place
+as soon as the daemon sees the graph change, such that clients find out
+that the snapshot has gone stale.
+Snapshots also expire after a while, e.g. if the daemon is gone.
+"""
+
+import array
+import errno
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from ros2cli.helpers import get_ros_domain_id
+from ros2cli.helpers import get_runtime_dir
+
+MAGIC = b'R2GS'
+
+FORMAT_VERSION = 1
+
+# magic, format version, sequence number, sequence number of the snapshot,
+# expiration time, word count and size of the string table; snapshots never
+# leave the machine they were taken on, so native byte order is used
+_HEADER = struct.Struct('=4sIQQdII')
+
+_SEQUENCE = struct.Struct('=Q')
+
+_SEQUENCE_OFFSET = 8
+
+_WORD_SIZE = 4
+
+# kinds of endpoints of a node, as in `DirectNode.get_node_graph()`
+ENDPOINT_KINDS = (
+    'subscribers', 'publishers', 'service_servers',
+    'service_clients', 'action_servers', 'action_clients',
+)
+
+# node queries served by a snapshot, and the kind of endpoints they are about
+_ENDPOINT_QUERIES = {
+    'get_subscriber_names_and_types_by_node': 'subscribers',
+    'get_publisher_names_and_types_by_node': 'publishers',
+    'get_service_names_and_types_by_node': 'service_servers',
+    'get_client_names_and_types_by_node': 'service_clients',
+    'get_action_server_names_and_types_by_node': 'action_servers',
+    'get_action_client_names_and_types_by_node': 'action_clients',
+}
+
+QUERIES = (
+    'get_node_names_and_namespaces',
+    'get_topic_names_and_types',
+    'get_service_names_and_types',
+    'get_node_graph',
+    *_ENDPOINT_QUERIES,
+)
+
+
+class GraphSnapshotUnavailable(Exception):
+    """The snapshot cannot answer a query, which must be sent elsewhere."""
+
+
+def get_graph_snapshot_path():
+    """
+    Get the path of the graph snapshot file of the ros2cli daemon.
+
+    The path is specific to the current user and ROS domain id.
+    """
+    return os.path.join(
+        get_runtime_dir(), f'ros2cli-daemon-{os.getuid()}-{get_ros_domain_id()}-graph')
+
+
+def is_graph_snapshot_supported():
+    # files in use can't be replaced elsewhere, and expiration times
+    # rely on time.monotonic() being a system-wide clock
+    return os.name == 'posix'
+
+
+class _Encoder:
+
+    def __init__(self):
+        # reserved for the indices of the string table, topics,
+        # services and nodes, see `encode_graph_snapshot()`
+        self.words = array.array('I', [0] * 4)
+        self.strings = {}
+
+    def intern(self, string):
+        return self.strings.setdefault(string, len(self.strings))
+
+    def add_names_and_types(self, names_and_types):
+        entries = sorted((name, list(types)) for name, types in names_and_types)
+        types_indices = []
+        for _, types in entries:
+            types_indices.append(len(self.words))
+            self.words.extend(self.intern(type_) for type_ in types)
+        index = len(self.words)
+        self.words.append(len(entries))
+        for (name, types), types_index in zip(entries, types_indices):
+            self.words.extend((self.intern(name), types_index, len(types)))
+        return index
+
+    def add_nodes(self, node_graph):
+        entries = sorted(node_graph, key=lambda entry: entry[:2])
+        endpoints_indices = []
+        for _, _, endpoints in entries:
+            tables = [self.add_names_and_types(endpoints[kind]) for kind in ENDPOINT_KINDS]
+            endpoints_indices.append(len(self.words))
+            self.words.extend(tables)
+        index = len(self.words)
+        self.words.append(len(entries))
+        for (name, namespace, _), endpoints_index in zip(entries, endpoints_indices):
+            self.words.extend((self.intern(name), self.intern(namespace), endpoints_index))
+        return index
+
+    def add_strings(self):
+        data = [string.encode('utf-8') for string in self.strings]
+        index = len(self.words)
+        self.words.append(len(data))
+        offset = 0
+        for encoded in data:
+            self.words.append(offset)
+            offset += len(encoded)
+        self.words.append(offset)
+        return index, b''.join(data)
+
+
+def encode_graph_snapshot(
+    topic_names_and_types, service_names_and_types, node_graph, *,
+    sequence, valid_until
+):
+    """
+    Encode a graph snapshot.
+
+    :param topic_names_and_types: as returned by `get_topic_names_and_types()`.
+    :param service_names_and_types: as returned by `get_service_names_and_types()`.
+    :param node_graph: as returned by `DirectNode.get_node_graph()`.
+    :param sequence: the sequence number of the snapshot.
+    :param valid_until: when the snapshot expires, per `time.monotonic()`.
+    :return: the snapshot, as bytes.
+    """
+    encoder = _Encoder()
+    topics = encoder.add_names_and_types(topic_names_and_types)
+    services = encoder.add_names_and_types(service_names_and_types)
+    nodes = encoder.add_nodes(node_graph)
+    strings, data = encoder.add_strings()
+    encoder.words[0:4] = array.array('I', [strings, topics, services, nodes])
+    if encoder.words.itemsize != _WORD_SIZE:
+        raise RuntimeError('no 32-bit array type available')
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, sequence, sequence, valid_until,
+        len(encoder.words), len(data))
+    return header + encoder.words.tobytes() + data
+
+
+class GraphSnapshot:
+    """
+    A graph snapshot published by the ros2cli daemon.
+
+    Queries are named and answered like those of a `DirectNode`, as long as
+    the snapshot is fresh (see `is_fresh()`).  Otherwise, or if a query is
+    given arguments it can't honor, `GraphSnapshotUnavailable` is raised.
+    """
+
+    def __init__(self, path, *, clock=time.monotonic):
+        """
+        Construct a GraphSnapshot.
+
+        :param path: path to the snapshot file.
+        :param clock: function returning the current time, in seconds.
+        :raises: `OSError` if the file can't be mapped or is not owned by the
+          current user, `ValueError` if it is not a snapshot or not in a
+          supported format.
+        """
+        self._clock = clock
+        with open(path, 'rb') as f:
+            # only trust snapshots published by a daemon of the current user
+            if os.fstat(f.fileno()).st_uid != os.getuid():
+                raise PermissionError(
+                    errno.EACCES, 'Graph snapshot is not owned by the current user', path)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mmap) < _HEADER.size:
+                raise ValueError(f"'{path}' is not a graph snapshot")
+            magic, version, _, self._sequence, self._valid_until, word_count, \
+                strings_size = _HEADER.unpack_from(self._mmap)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"'{path}' is not a graph snapshot in a supported format")
+            strings_offset = _HEADER.size + word_count * _WORD_SIZE
+            if len(self._mmap) != strings_offset + strings_size:
+                raise ValueError(f"'{path}' is truncated")
+            self._buffer = memoryview(self._mmap)
+            self._words = self._buffer[_HEADER.size:strings_offset].cast('I')
+            self._strings_offset = strings_offset
+            strings_index, self._topics, self._services, self._nodes = self._words[0:4]
+            self._string_count = self._words[strings_index]
+            self._string_offsets = strings_index + 1
+            self._string_cache = {}
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        for attr in ('_words', '_buffer'):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def sequence(self):
+        """The sequence number of this snapshot."""
+        return self._sequence
+
+    def is_fresh(self):
+        """Check whether the graph has not changed since, as far as the daemon knows."""
+        sequence, = _SEQUENCE.unpack_from(self._mmap, _SEQUENCE_OFFSET)
+        return sequence == self._sequence and self._clock() < self._valid_until
+
+    def _check_fresh(self):
+        if not self.is_fresh():
+            raise GraphSnapshotUnavailable('the graph snapshot is stale')
+
+    def _get_string(self, index):
+        string = self._string_cache.get(index)
+        if string is None:
+            start = self._strings_offset + self._words[self._string_offsets + index]
+            end = self._strings_offset + self._words[self._string_offsets + index + 1]
+            string = str(self._buffer[start:end], 'utf-8')
+            self._string_cache[index] = string
+        return string
+
+    def _get_names_and_types(self, index):
+        names_and_types = []
+        for i in range(self._words[index]):
+            entry_index = index + 1 + 3 * i
+            name, types_index, type_count = self._words[entry_index:entry_index + 3]
+            names_and_types.append((
+                self._get_string(name),
+                [self._get_string(type_) for type_ in
+                 self._words[types_index:types_index + type_count]]))
+        return names_and_types
+
+    def _get_node(self, i):
+        index = self._nodes + 1 + 3 * i
+        name, namespace, endpoints_index = self._words[index:index + 3]
+        return self._get_string(name), self._get_string(namespace), endpoints_index
+
+    def _find_node(self, node_name, node_namespace):
+        key = (node_name, node_namespace)
+        low, high = 0, self._words[self._nodes]
+        while low < high:
+            middle = (low + high) // 2
+            name, namespace, endpoints_index = self._get_node(middle)
+            if (name, namespace) < key:
+                low = middle + 1
+            elif (name, namespace) > key:
+                high = middle
+            else:
+                return endpoints_index
+        # let the caller get the error for an unknown node
+        raise GraphSnapshotUnavailable(f"node '{node_namespace}/{node_name}' is not known")
+
+    def get_node_names_and_namespaces(self):
+        self._check_fresh()
+        return [self._get_node(i)[:2] for i in range(self._words[self._nodes])]
+
+    def get_topic_names_and_types(self, no_demangle=False):
+        self._check_fresh()
+        if no_demangle:
+            raise GraphSnapshotUnavailable('the graph snapshot only holds demangled names')
+        return self._get_names_and_types(self._topics)
+
+    def get_service_names_and_types(self):
+        self._check_fresh()
+        return self._get_names_and_types(self._services)
+
+    def get_node_graph(self):
+        self._check_fresh()
+        graph = []
+        for i in range(self._words[self._nodes]):
+            name, namespace, endpoints_index = self._get_node(i)
+            graph.append((name, namespace, {
+                kind: self._get_names_and_types(self._words[endpoints_index + j])
+                for j, kind in enumerate(ENDPOINT_KINDS)
+            }))
+        return graph
+
+    def __getattr__(self, name):
+        if name not in _ENDPOINT_QUERIES:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'")
+        kind_index = ENDPOINT_KINDS.index(_ENDPOINT_QUERIES[name])
+
+        def query(node_name, node_namespace, no_demangle=False):
+            self._check_fresh()
+            if no_demangle:
+                raise GraphSnapshotUnavailable('the graph snapshot only holds demangled names')
+            endpoints_index = self._find_node(node_name, node_namespace)
+            return self._get_names_and_types(self._words[endpoints_index + kind_index])
+        query.__name__ = name
+        return query
+
+
+def open_graph_snapshot(path=None):
+    """
+    Open the graph snapshot published by the ros2cli daemon, if fresh.
+
+    :param path: optional path to the snapshot file,
+      see `get_graph_snapshot_path()` for the default.
+    :return: a `GraphSnapshot`, or `None` if there is no fresh snapshot.
+    """
+    if not is_graph_snapshot_supported():
+        return None
+    try:
+        if path is None:
+            path = get_graph_snapshot_path()
+        snapshot = GraphSnapshot(path)
+    except (OSError, ValueError):
+        return None
+    if not snapshot.is_fresh():
+        snapshot.close()
+        return None
+    return snapshot
+
+
+class GraphSnapshotWriter:
+    """Publish graph snapshots on behalf of the ros2cli daemon."""
+
+    def __init__(self, path, *, clock=time.monotonic):
+        """
+        Construct a GraphSnapshotWriter.
+
+        :param path: path to the snapshot file.
+        :param clock: function returning the current time, in seconds.
+        """
+        self.path = path
+        self._clock = clock
+        self._sequence = 0
+        self._mmap = None
+        self._valid_until = None
+
+    def is_fresh(self):
+        """Check whether the last snapshot published is still fresh."""
+        return (
+            self._mmap is not None and self._valid_until is not None and
+            self._clock() < self._valid_until)
+
+    def publish(self, topic_names_and_types, service_names_and_types, node_graph, *, max_age):
+        """
+        Publish a new snapshot, replacing the previous one.
+
+        See `encode_graph_snapshot()` for the arguments.
+
+        :param max_age: duration, in seconds, after which the snapshot expires.
+        """
+        # clients still reading the previous snapshot must move on
+        self.invalidate()
+        self._sequence += 1
+        valid_until = self._clock() + max_age
+        data = encode_graph_snapshot(
+            topic_names_and_types, service_names_and_types, node_graph,
+            sequence=self._sequence, valid_until=valid_until)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self.path), prefix=os.path.basename(self.path) + '.')
+        try:
+            with open(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, 'r+b') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        self._valid_until = valid_until
+
+    def invalidate(self):
+        """Mark the last snapshot published as stale, the graph has changed."""
+        if self._mmap is None or self._valid_until is None:
+            return
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._mmap, _SEQUENCE_OFFSET, self._sequence)
+        self._valid_until = None
+
+    def close(self):
+        """Mark the last snapshot published as stale, and remove it."""
+        if self._mmap is None:
+            return
+        self.invalidate()
+        self._mmap.close()
+        self._mmap = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
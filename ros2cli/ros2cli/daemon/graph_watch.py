@@ -0,0 +1,275 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Incremental graph changes for clients watching the ros2cli daemon.
+
+The daemon API is request/response only, so changes are delivered by long
+polling: a client calls ``get_graph_changes(sequence, timeout, epoch)`` with
+the sequence number and epoch of the last changes it has seen, and the call
+returns as soon as newer changes are available, or once `timeout` elapses.
+The epoch identifies the watcher that numbered changes, such that sequence
+numbers from before a daemon restart are never mistaken for current ones.
+Clients waiting for changes hold a daemon thread each, so only so many may
+wait at once: others get an answer right away, and are told to throttle
+their polling.
+Changes are described as events, i.e. dicts with an ``event`` key
+(``'added'`` or ``'removed'``), a ``kind`` key (``'node'``, ``'publisher'``
+or ``'subscription'``) and the attributes of the entity, including the QoS
+profile of endpoints.
+"""
+
+import collections
+import threading
+import time
+import uuid
+
+# how often, in seconds, the graph is checked for changes while watched
+WATCH_PERIOD = 0.1
+
+# how many changes are kept for clients that fall behind
+HISTORY_DEPTH = 100
+
+MAX_WATCH_TIMEOUT = 30.0
+
+# how long, in seconds, throttled clients should wait before polling again
+THROTTLED_WATCH_PERIOD = 1.0
+
+# how long, in seconds, to keep track of changes after the last client left,
+# such that clients may come back for more without missing any
+WATCH_LINGER = 5.0
+
+_QOS_POLICIES = ('history', 'depth', 'reliability', 'durability', 'liveliness')
+
+
+def _format_qos_profile(qos_profile):
+    values = []
+    for policy in _QOS_POLICIES:
+        value = getattr(qos_profile, policy)
+        values.append((policy, getattr(value, 'name', value)))
+    return tuple(values)
+
+
+def _get_fully_qualified_name(name, namespace):
+    return namespace.rstrip('/') + '/' + name
+
+
+def take_graph_snapshot(node):
+    """
+    Take a snapshot of the nodes and topic endpoints in the graph.
+
+    :param node: a `ros2cli.node.direct.DirectNode` or alike.
+    :return: a set of hashable entries, see `make_event()`.
+    """
+    snapshot = set()
+    for name, namespace in node.get_node_names_and_namespaces():
+        snapshot.add(('node', _get_fully_qualified_name(name, namespace)))
+    for topic_name, _ in node.get_topic_names_and_types():
+        for kind, query in (
+            ('publisher', node.get_publishers_info_by_topic),
+            ('subscription', node.get_subscriptions_info_by_topic),
+        ):
+            for info in query(topic_name):
+                snapshot.add((
+                    kind, topic_name, info.topic_type,
+                    _get_fully_qualified_name(info.node_name, info.node_namespace),
+                    _format_qos_profile(info.qos_profile)))
+    return snapshot
+
+
+def make_event(event, entry):
+    """
+    Describe a snapshot entry that was added or removed.
+
+    :param event: either ``'added'`` or ``'removed'``.
+    :param entry: an entry of a snapshot taken by `take_graph_snapshot()`.
+    :return: a dict, suitable for any daemon transport.
+    """
+    if entry[0] == 'node':
+        kind, node_name = entry
+        return {'event': event, 'kind': kind, 'node': node_name}
+    kind, topic_name, topic_type, node_name, qos_profile = entry
+    return {
+        'event': event, 'kind': kind, 'node': node_name,
+        'topic': topic_name, 'type': topic_type, 'qos': dict(qos_profile),
+    }
+
+
+def diff_graph_snapshots(old, new):
+    """Get the events turning snapshot `old` into snapshot `new`."""
+    return [
+        *(make_event('removed', entry) for entry in sorted(old - new)),
+        *(make_event('added', entry) for entry in sorted(new - old)),
+    ]
+
+
+class GraphWatcher:
+    """Keep track of graph changes on behalf of watching clients."""
+
+    def __init__(
+        self, take_snapshot, *, history_depth=HISTORY_DEPTH,
+        max_watchers=None, on_watch=None, clock=time.monotonic
+    ):
+        """
+        Construct a GraphWatcher.
+
+        :param take_snapshot: function taking a graph snapshot,
+          see `take_graph_snapshot()`.
+        :param history_depth: how many changes to keep.
+        :param max_watchers: optional maximum number of clients waiting
+          for changes at once, others are throttled.
+        :param on_watch: optional function called whenever a client
+          starts waiting for changes, from the client's thread.
+        :param clock: function returning the current time, in seconds.
+        """
+        self._take_snapshot = take_snapshot
+        self._max_watchers = max_watchers
+        self._on_watch = on_watch
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._history = collections.deque(maxlen=history_depth)
+        self._snapshot = None
+        self._snapshot_time = None
+        # 0 is reserved for callers that have seen nothing yet
+        self._sequence = 1
+        self.epoch = uuid.uuid4().hex
+        self._watchers = 0
+        self._last_watch_time = None
+        self._closed = False
+
+    @property
+    def watched(self):
+        """Whether any client is, or recently was, waiting for changes."""
+        if self._watchers:
+            return True
+        return (
+            self._last_watch_time is not None and
+            self._clock() - self._last_watch_time < WATCH_LINGER)
+
+    def update(self, *, max_age=None):
+        """
+        Take a new snapshot if needed and record changes, if any.
+
+        A new snapshot is only taken if the graph is `watched` and known to
+        have changed (see `notify_change()`), or the last snapshot is older
+        than `max_age`.
+        This method is not thread-safe, it is meant to be called by the
+        thread that owns the daemon node.
+
+        :param max_age: optional duration, in seconds, after which
+          a snapshot is taken again.
+        """
+        if not self.watched:
+            if self._snapshot is not None:
+                # nobody is watching, start afresh when somebody does
+                with self._condition:
+                    self._snapshot = None
+                    self._history.clear()
+                    self._sequence += 1
+            return
+        now = self._clock()
+        if (
+            self._snapshot is not None and self._snapshot_time is not None and
+            (max_age is None or now - self._snapshot_time < max_age)
+        ):
+            return
+        snapshot = self._take_snapshot()
+        with self._condition:
+            if self._snapshot is not None:
+                events = diff_graph_snapshots(self._snapshot, snapshot)
+                if events:
+                    self._sequence += 1
+                    self._history.append((self._sequence, events))
+            self._snapshot = snapshot
+            self._snapshot_time = now
+            self._condition.notify_all()
+
+    def notify_change(self):
+        """Take a new snapshot on the next `update()`, the graph has changed."""
+        self._snapshot_time = None
+
+    def close(self):
+        """Release all waiting clients."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get_graph_changes(self, sequence=0, timeout=MAX_WATCH_TIMEOUT, epoch=None):
+        """
+        Wait for changes to the graph.
+
+        :param sequence: the sequence number of the last changes seen by
+          the caller, ``0`` (or any stale number) to get the whole graph.
+        :param timeout: maximum duration, in seconds, to wait for changes,
+          capped at `MAX_WATCH_TIMEOUT`.
+        :param epoch: the epoch of the last changes seen by the caller, if any.
+          Sequence numbers of another epoch are stale.
+        :return: a dict with the new ``sequence`` number and ``epoch``, the
+          list of ``changes`` since `sequence`, whether the graph was ``reset``,
+          i.e. if changes describe the whole graph rather than a delta, and
+          whether the caller is ``throttled``, i.e. it did not wait for
+          changes and should wait `THROTTLED_WATCH_PERIOD` before polling again.
+        """
+        with self._condition:
+            throttled = (
+                self._max_watchers is not None and self._watchers >= self._max_watchers)
+            if throttled:
+                # don't hold any more daemon threads
+                timeout = 0
+            self._watchers += 1
+        deadline = self._clock() + min(max(timeout, 0), MAX_WATCH_TIMEOUT)
+        if epoch is not None and epoch != self.epoch:
+            sequence = 0
+        try:
+            if self._on_watch is not None:
+                self._on_watch()
+            with self._condition:
+                while True:
+                    if self._snapshot is not None:
+                        if not sequence or not self._has_changes_since(sequence):
+                            return {
+                                'sequence': self._sequence, 'epoch': self.epoch,
+                                'changes': diff_graph_snapshots(set(), self._snapshot),
+                                'reset': True, 'throttled': throttled,
+                            }
+                        changes = [
+                            event for change_sequence, events in self._history
+                            if change_sequence > sequence for event in events
+                        ]
+                        if changes:
+                            return {
+                                'sequence': self._sequence, 'epoch': self.epoch,
+                                'changes': changes, 'reset': False, 'throttled': throttled,
+                            }
+                    remaining_time = deadline - self._clock()
+                    if self._closed or remaining_time <= 0:
+                        # nothing new, as far as the caller can tell
+                        return {
+                            'sequence': sequence, 'epoch': epoch,
+                            'changes': [], 'reset': False, 'throttled': throttled,
+                        }
+                    self._condition.wait(remaining_time)
+        finally:
+            with self._condition:
+                self._watchers -= 1
+                self._last_watch_time = self._clock()
+
+    def _has_changes_since(self, sequence):
+        # a sequence number is only known if no change since was forgotten
+        if sequence > self._sequence:
+            # from before a daemon restart, for callers telling no epoch
+            return False
+        if not self._history:
+            return sequence == self._sequence
+        return sequence >= self._history[0][0] - 1
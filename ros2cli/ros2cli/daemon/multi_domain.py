@@ -0,0 +1,251 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A ros2cli daemon serving several ROS domains from a single process.
+
+Unlike the regular daemon, which serves the ROS domain it was spawned for,
+this daemon listens on a single Unix domain socket (see
+`get_multi_domain_server_path()`) and every request carries the id of the
+domain it is meant for, as a ``domain_id`` request option.
+A daemon node is created lazily for each domain, in an rclpy context of its
+own, and destroyed once the domain has been idle for a while.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import os
+import threading
+import time
+import uuid
+
+from ros2cli.daemon import DEFAULT_MAX_WORKERS
+from ros2cli.daemon import get_graph_queries
+from ros2cli.daemon import handle_request_in_executor
+from ros2cli.daemon.event_loop import EventLoop
+from ros2cli.daemon.graph_cache import GraphCache
+from ros2cli.daemon.graph_cache import GraphChangeListener
+from ros2cli.daemon.stats import DaemonStats
+
+from ros2cli.helpers import get_runtime_dir
+from ros2cli.helpers import pretty_print_call
+
+from ros2cli.node.network_aware import NetworkAwareNode
+
+from ros2cli.rpc.local_server import LocalRPCServer
+
+DEFAULT_DOMAIN_TIMEOUT = 10 * 60
+
+
+def get_multi_domain_server_path():
+    """Get the path of the Unix domain socket of the multi-domain daemon."""
+    return os.path.join(get_runtime_dir(), f'ros2cli-daemon-{os.getuid()}-multi.sock')
+
+
+class _Domain:
+    """A daemon node for a ROS domain, and the functions serving it."""
+
+    def __init__(self, domain_id, stats):
+        node_args = argparse.Namespace(
+            node_name_suffix=f'_daemon_{domain_id}_{uuid.uuid4().hex}',
+            start_parameter_services=False,
+            start_type_description_service=False,
+            no_daemon=True,
+            domain_id=domain_id)
+        self.node = NetworkAwareNode(node_args)
+        self.node.__enter__()
+        self.graph_cache = GraphCache()
+        self.graph_listener = GraphChangeListener(self.node, self.graph_cache)
+        self.functions = {
+            function.__name__: stats.instrument(function) for function in [
+                self.node.get_name,
+                self.node.get_namespace,
+                *(
+                    self.graph_cache.cached(query, poll=self.graph_listener.poll)
+                    for query in get_graph_queries(self.node)
+                )
+            ]
+        }
+        self.users = 0
+        self.last_use_time = time.monotonic()
+
+    def destroy(self):
+        self.node.__exit__(None, None, None)
+
+
+class MultiDomainRPCServer(LocalRPCServer):
+    """A compact RPC server dispatching requests to per domain functions."""
+
+    def __init__(self, path, *args, **kwargs):
+        super().__init__(path, *args, **kwargs)
+        self.last_request_time = time.monotonic()
+        self.request_stats = DaemonStats()
+        self._domains = {}
+        self._domains_lock = threading.Condition()
+
+    def __getstate__(self):
+        # locks can't be pickled, and there are no domains yet
+        state = self.__dict__.copy()
+        del state['_domains_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._domains_lock = threading.Condition()
+
+    @contextlib.contextmanager
+    def _use_domain(self, domain_id):
+        with self._domains_lock:
+            # wait for another thread that may be creating the domain
+            while self._domains.get(domain_id, True) is None:
+                self._domains_lock.wait()
+            domain = self._domains.get(domain_id)
+            if domain is None:
+                self._domains[domain_id] = None
+        if domain is None:
+            try:
+                print(f'Creating node for domain {domain_id}')
+                domain = _Domain(domain_id, self.request_stats)
+            finally:
+                with self._domains_lock:
+                    if domain is None:
+                        del self._domains[domain_id]
+                    else:
+                        self._domains[domain_id] = domain
+                    self._domains_lock.notify_all()
+        with self._domains_lock:
+            domain.users += 1
+        try:
+            yield domain
+        finally:
+            with self._domains_lock:
+                domain.users -= 1
+                domain.last_use_time = time.monotonic()
+
+    def evict_idle_domains(self, timeout):
+        """Destroy the nodes of domains that have not been used for `timeout` seconds."""
+        now = time.monotonic()
+        with self._domains_lock:
+            idle_domains = {
+                domain_id: domain for domain_id, domain in self._domains.items()
+                if domain is not None and not domain.users and
+                now - domain.last_use_time > timeout
+            }
+            for domain_id in idle_domains:
+                del self._domains[domain_id]
+        for domain_id, domain in idle_domains.items():
+            print(f'Destroying node for idle domain {domain_id}')
+            domain.destroy()
+
+    def get_next_eviction_time(self, timeout):
+        """Get when the next domain will have been idle for `timeout` seconds, if any."""
+        now = time.monotonic()
+        with self._domains_lock:
+            # domains in use will be idle at the earliest after this call
+            last_use_times = [
+                now if domain.users else domain.last_use_time
+                for domain in self._domains.values() if domain is not None
+            ]
+        if not last_use_times:
+            return None
+        return min(last_use_times) + timeout
+
+    def destroy_domains(self):
+        self.evict_idle_domains(float('-inf'))
+
+    def system_listMethods(self, *, domain_id=None):
+        methods = super().system_listMethods()
+        if domain_id is not None:
+            with self._use_domain(domain_id) as domain:
+                methods.extend(domain.functions.keys())
+        return sorted(methods)
+
+    def dispatch(self, method, params, *, domain_id=None):
+        self.last_request_time = time.monotonic()
+        if domain_id is not None:
+            domain_id = int(domain_id)
+        if method == 'system.listMethods':
+            return self.system_listMethods(*params, domain_id=domain_id)
+        if method == 'system.multicall':
+            return self.system_multicall(*params, domain_id=domain_id)
+        if method in self._functions:
+            return super().dispatch(method, params)
+        if domain_id is None:
+            raise Exception(f'method "{method}" requires a domain id')
+        with self._use_domain(domain_id) as domain:
+            try:
+                function = domain.functions[method]
+            except KeyError:
+                raise Exception(f'method "{method}" is not supported')
+            pretty_print_call(function, *params, domain_id=domain_id)
+            return function(*params)
+
+
+def serve(
+    server: MultiDomainRPCServer, *, timeout: int = 2 * 60 * 60,
+    domain_timeout: int = DEFAULT_DOMAIN_TIMEOUT,
+    max_workers: int = DEFAULT_MAX_WORKERS
+):
+    """
+    Serve the ros2cli daemon API for any ROS domain using the given `server`.
+
+    :param server: a multi-domain compact RPC server instance
+    :param timeout: how long to wait before shutting
+      down the server due to inactivity.
+    :param domain_timeout: how long to wait before destroying
+      the node of a ROS domain due to inactivity.
+    :param max_workers: how many requests may be processed concurrently.
+    """
+    shutdown = False
+    event_loop = EventLoop([server])
+
+    def shutdown_handler():
+        nonlocal shutdown
+        print('Remote shutdown requested')
+        shutdown = True
+        server.closing = True
+        event_loop.wake()
+
+    server.register_introspection_functions()
+    server.register_multicall_functions()
+    server.register_function(shutdown_handler, 'system.shutdown')
+    server.register_function(server.request_stats.to_dict, 'system.stats')
+
+    print('Serving compact RPC for all domains on ' + server.server_address)
+    # See ros2cli.daemon.serve() for details on timeouts.  The loop also
+    # wakes up to destroy the nodes of domains that became idle.
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix='ros2cli_daemon')
+    try:
+        with event_loop:
+            while not shutdown:
+                server.evict_idle_domains(domain_timeout)
+                now = time.monotonic()
+                remaining_time = server.last_request_time + timeout - now
+                if remaining_time <= 0:
+                    print('Shutdown due to timeout')
+                    break
+                next_eviction_time = server.get_next_eviction_time(domain_timeout)
+                if next_eviction_time is not None:
+                    remaining_time = min(remaining_time, max(next_eviction_time - now, 0))
+                for s in event_loop.wait(remaining_time):
+                    handle_request_in_executor(s, executor)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.closing = True
+        executor.shutdown(wait=True)
+        server.destroy_domains()
+        server.server_close()
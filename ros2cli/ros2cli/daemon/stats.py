@@ -0,0 +1,242 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Request statistics for the ros2cli daemon.
+
+For each method, the daemon records how often it is called and how long
+calls take, i.e. the time spent querying the graph, as well as how long it
+takes to (un)marshal requests and responses and how large responses are.
+Durations and sizes are kept in histograms with power of two buckets, so
+memory use does not grow with the number of requests.
+Servers record requests through their ``request_stats`` attribute (see
+`ros2cli.rpc.local_server.LocalRPCServer` and
+`ros2cli.xmlrpc.local_server.LocalXMLRPCServer`), while served functions
+are wrapped by `DaemonStats.instrument()`.
+"""
+
+import functools
+import math
+import threading
+import time
+
+# durations are binned in microseconds, sizes in bytes
+DURATION_UNIT = 1e-6
+
+SIZE_UNIT = 1
+
+BUCKET_COUNT = 40
+
+
+class Histogram:
+    """A histogram of non-negative values, with power of two buckets."""
+
+    def __init__(self, unit):
+        """
+        Construct a Histogram.
+
+        :param unit: upper bound of the first bucket,
+          each of the next buckets being twice as wide.
+        """
+        self.unit = unit
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = [0] * BUCKET_COUNT
+
+    def record(self, value):
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        # frexp() yields e such that 2**(e - 1) <= value / unit < 2**e
+        _, exponent = math.frexp(value / self.unit)
+        self._buckets[min(max(exponent, 0), BUCKET_COUNT - 1)] += 1
+
+    def to_dict(self):
+        """
+        Get the histogram as a dict, suitable for any daemon transport.
+
+        Only non-empty buckets are listed, as ``[upper bound, count]`` pairs.
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'buckets': [
+                [self.unit * 2.0 ** index, count]
+                for index, count in enumerate(self._buckets) if count
+            ],
+        }
+
+
+def estimate_percentile(histogram, fraction):
+    """
+    Estimate a percentile from a histogram.
+
+    :param histogram: a histogram, as returned by `Histogram.to_dict()`.
+    :param fraction: the percentile, as a fraction in the [0, 1] range.
+    :return: an upper bound of the percentile,
+      or `None` if the histogram is empty.
+    """
+    if not histogram['count']:
+        return None
+    rank = fraction * histogram['count']
+    seen = 0
+    for upper_bound, count in histogram['buckets']:
+        seen += count
+        if seen >= rank:
+            return min(upper_bound, histogram['max'])
+    return histogram['max']
+
+
+class MethodStats:
+    """Statistics of a method served by the daemon."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.call_time = Histogram(DURATION_UNIT)
+        self.requests = 0
+        self.marshalling_time = Histogram(DURATION_UNIT)
+        self.response_size = Histogram(SIZE_UNIT)
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'call_time': self.call_time.to_dict(),
+            'requests': self.requests,
+            'marshalling_time': self.marshalling_time.to_dict(),
+            'response_size': self.response_size.to_dict(),
+        }
+
+
+class Request:
+    """A request being handled, see `DaemonStats.start_request()`."""
+
+    def __init__(self, stats, method, clock):
+        self.method = method
+        self.call_time = 0.0
+        self._stats = stats
+        self._clock = clock
+        self._start_time = clock()
+
+    def finish(self, response_size):
+        """
+        Record the request as handled.
+
+        :param response_size: size, in bytes, of the encoded response.
+        """
+        self._stats._finish_request(self, self._clock() - self._start_time, response_size)
+
+
+class DaemonStats:
+    """Thread-safe statistics of the requests served by the daemon."""
+
+    def __init__(self, *, clock=time.perf_counter):
+        """
+        Construct a DaemonStats.
+
+        :param clock: function returning the current time, in seconds.
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._methods = {}
+        self._start_time = time.monotonic()
+
+    def __getstate__(self):
+        # locks can't be pickled, and there are no statistics yet
+        return {'clock': self._clock}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _get_method_stats(self, method):
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = MethodStats()
+        return stats
+
+    def start_request(self, method=None):
+        """
+        Start handling a request, in the current thread.
+
+        :param method: the method requested, if known at this point,
+          see `set_request_method()` otherwise.
+        :return: a `Request`, to be finished once the response is encoded.
+        """
+        request = Request(self, method, self._clock)
+        self._local.request = request
+        return request
+
+    def set_request_method(self, method):
+        """Set the method of the current request, unless known already."""
+        request = getattr(self._local, 'request', None)
+        if request is not None and request.method is None:
+            request.method = method
+
+    def _finish_request(self, request, duration, response_size):
+        if getattr(self._local, 'request', None) is request:
+            self._local.request = None
+        with self._lock:
+            stats = self._get_method_stats(request.method or 'unknown')
+            stats.requests += 1
+            stats.marshalling_time.record(max(duration - request.call_time, 0.0))
+            stats.response_size.record(response_size)
+
+    def instrument(self, func, name=None):
+        """
+        Wrap `func` such that its calls are recorded.
+
+        :param func: the function to wrap.
+        :param name: the name `func` is served under, defaults to its name.
+        """
+        if name is None:
+            name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            error = True
+            start_time = self._clock()
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                duration = self._clock() - start_time
+                request = getattr(self._local, 'request', None)
+                if request is not None:
+                    request.call_time += duration
+                with self._lock:
+                    stats = self._get_method_stats(name)
+                    stats.calls += 1
+                    stats.errors += error
+                    stats.call_time.record(duration)
+        return wrapper
+
+    def to_dict(self):
+        """Get all statistics as a dict, suitable for any daemon transport."""
+        with self._lock:
+            return {
+                'uptime': time.monotonic() - self._start_time,
+                'methods': {
+                    method: stats.to_dict() for method, stats in self._methods.items()
+                },
+            }
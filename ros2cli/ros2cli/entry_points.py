@@ -14,7 +14,13 @@
 # limitations under the License.
 
 from collections import defaultdict
+import json
 import logging
+import os
+import pathlib
+import re
+import sys
+import zlib
 
 try:
     import importlib.metadata as importlib_metadata
@@ -30,9 +36,327 @@ Those need to be declared using this group name.
 """
 EXTENSION_POINT_GROUP_NAME = 'ros2cli.extension_point'
 
+"""
+The version of the on-disk entry point index format.
+
+Bump it whenever the layout of the cache file changes.
+"""
+ENTRY_POINT_CACHE_VERSION = 1
+
+"""
+The version of the on-disk extension spec cache format.
+
+Bump it whenever the layout of the cache file, or of the specs, changes.
+"""
+EXTENSION_SPEC_CACHE_VERSION = 1
+
 logger = logging.getLogger(__name__)
 
 
+def get_entry_point_cache_path():
+    """
+    Get the path of the on-disk entry point index.
+
+    The index lives under ``$ROS_HOME/ros2cli`` (``~/.ros/ros2cli`` by
+    default).
+
+    :returns: the path to the cache file, ``None`` if no home directory could
+      be determined
+    :rtype: str
+    """
+    ros_home = os.environ.get('ROS_HOME')
+    if not ros_home:
+        home = os.path.expanduser('~')
+        if home == '~':
+            return None
+        ros_home = os.path.join(home, '.ros')
+    return os.path.join(ros_home, 'ros2cli', 'entry_points_cache.json')
+
+
+def get_extension_spec_cache_path():
+    """
+    Get the path of the on-disk extension spec cache.
+
+    The cache lives next to the entry point index, see
+    `get_entry_point_cache_path()`.
+
+    :returns: the path to the cache file, ``None`` if no home directory could
+      be determined
+    :rtype: str
+    """
+    cache_path = get_entry_point_cache_path()
+    if cache_path is None:
+        return None
+    return os.path.join(os.path.dirname(cache_path), 'extension_specs_cache.json')
+
+
+def _normalize_distribution_name(name):
+    return re.sub(r'[-_.]+', '_', name).lower()
+
+
+def _is_distribution_metadata(name):
+    return name.lower().endswith(('.dist-info', '.egg-info'))
+
+
+def _get_path_fingerprint(path):
+    """
+    Get a cheap fingerprint of the distributions found in a ``sys.path`` entry.
+
+    The fingerprint captures the names of all ``.dist-info`` / ``.egg-info``
+    entries and the modification time of their ``entry_points.txt`` files,
+    without reading any of the package metadata.
+
+    :param str path: a ``sys.path`` entry
+    :returns: a JSON-serializable fingerprint, ``None`` if the entry doesn't
+      exist
+    """
+    fingerprint = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not _is_distribution_metadata(entry.name):
+                    continue
+                try:
+                    if entry.is_dir():
+                        mtime = os.stat(
+                            os.path.join(entry.path, 'entry_points.txt')).st_mtime_ns
+                    else:
+                        mtime = entry.stat().st_mtime_ns
+                except OSError:
+                    mtime = None
+                fingerprint.append([entry.name, mtime])
+    except OSError:
+        return None
+    return sorted(fingerprint)
+
+
+def _scan_path(path):
+    """
+    Collect the entry points of all distributions found in a ``sys.path`` entry.
+
+    :param str path: a directory on ``sys.path``
+    :returns: list of dictionaries describing each distribution, in the same
+      order ``importlib.metadata`` would discover them
+    """
+    distributions = []
+    try:
+        names = sorted(
+            name for name in os.listdir(path) if _is_distribution_metadata(name))
+    except OSError:
+        return distributions
+    for name in names:
+        dist_path = os.path.join(path, name)
+        dist = importlib_metadata.PathDistribution(pathlib.Path(dist_path))
+        try:
+            entry_points = [
+                [ep.group, ep.name, ep.value] for ep in dist.entry_points]
+        except Exception as e:  # noqa: F841
+            logger.warning(
+                f"Failed to read entry points of '{dist_path}': {e}")
+            continue
+        distributions.append({
+            'name': _normalize_distribution_name(
+                name.rsplit('.', 1)[0].split('-', 1)[0]),
+            'path': dist_path,
+            'entry_points': entry_points,
+        })
+    return distributions
+
+
+def _load_entry_point_cache(cache_path):
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, 'r') as h:
+            cache = json.load(h)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or \
+            cache.get('version') != ENTRY_POINT_CACHE_VERSION:
+        return {}
+    return cache.get('paths', {})
+
+
+def _store_json(cache_path, content):
+    if cache_path is None:
+        return
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w') as h:
+            json.dump(content, h)
+        # atomically replace the cache in case of concurrent invocations
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache '{cache_path}': {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _store_entry_point_cache(cache_path, paths):
+    _store_json(cache_path, {'version': ENTRY_POINT_CACHE_VERSION, 'paths': paths})
+
+
+_distribution_index = None
+
+_distribution_index_fingerprint = None
+
+
+def _get_distribution_index(*, rebuild=False):
+    """
+    Get the entry points of all distributions on ``sys.path``.
+
+    The result is backed by an on-disk index keyed by the ``sys.path`` entries.
+    Only entries whose fingerprint changed since the index has been written
+    are rescanned, all others are served from the index.
+    Entries which are not directories (e.g. zip archives) are always scanned.
+    The result is memoized for the lifetime of the process.
+
+    :param bool rebuild: if ``True`` ignore the existing index and rescan all
+      entries
+    :returns: list of dictionaries describing each distribution in
+      ``sys.path`` order
+    :rtype: list
+    """
+    global _distribution_index
+    global _distribution_index_fingerprint
+    if _distribution_index is not None and not rebuild:
+        return _distribution_index
+
+    cache_path = get_entry_point_cache_path()
+    cached_paths = {} if rebuild else _load_entry_point_cache(cache_path)
+    modified = rebuild
+
+    distributions = []
+    fingerprints = []
+    for path in sys.path:
+        path = os.path.abspath(path or os.curdir)
+        if os.path.isdir(path):
+            fingerprint = _get_path_fingerprint(path)
+            fingerprints.append([path, fingerprint])
+            cached = cached_paths.get(path)
+            if cached is None or cached.get('fingerprint') != fingerprint:
+                cached = {
+                    'fingerprint': fingerprint,
+                    'distributions': _scan_path(path),
+                }
+                cached_paths[path] = cached
+                modified = True
+            distributions.extend(
+                dict(dist) for dist in cached['distributions'])
+        elif os.path.exists(path):
+            for dist in importlib_metadata.distributions(path=[path]):
+                distributions.append({
+                    'name': _normalize_distribution_name(
+                        dist.metadata['Name'] or ''),
+                    'distribution': dist,
+                    'entry_points': [
+                        [ep.group, ep.name, ep.value]
+                        for ep in dist.entry_points],
+                })
+                fingerprints.append([path, distributions[-1]['entry_points']])
+
+    if modified:
+        _store_entry_point_cache(cache_path, cached_paths)
+    _distribution_index = distributions
+    _distribution_index_fingerprint = zlib.crc32(json.dumps(fingerprints).encode())
+    return distributions
+
+
+def _get_distribution(dist):
+    if 'distribution' not in dist:
+        dist['distribution'] = importlib_metadata.PathDistribution(
+            pathlib.Path(dist['path']))
+    return dist['distribution']
+
+
+def rebuild_entry_point_cache():
+    """
+    Rebuild the on-disk entry point index from scratch.
+
+    The extension spec cache is cleared as well.
+
+    :returns: the number of distributions which have been indexed
+    :rtype: int
+    """
+    spec_cache_path = get_extension_spec_cache_path()
+    if spec_cache_path is not None:
+        try:
+            os.remove(spec_cache_path)
+        except OSError:
+            pass
+    return len(_get_distribution_index(rebuild=True))
+
+
+def _load_extension_spec_cache(cache_path):
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, 'r') as h:
+            cache = json.load(h)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or \
+            cache.get('version') != EXTENSION_SPEC_CACHE_VERSION or \
+            cache.get('fingerprint') != _distribution_index_fingerprint:
+        return {}
+    return cache.get('groups', {})
+
+
+def _get_entry_point_values(group_name):
+    return {
+        name: entry_point.value
+        for name, entry_point in get_entry_points(group_name).items()
+    }
+
+
+def get_extension_specs(group_name):
+    """
+    Get the cached specs of the extensions of a specific group.
+
+    Specs are whatever callers stored with `store_extension_specs()`, e.g.
+    descriptions of the extensions, such that the extensions need not be
+    loaded to get them.
+    They are discarded whenever the entry point index changes, or any entry
+    point of the group does.
+
+    :param str group_name: the name of the ``entry_point`` group
+    :returns: mapping of entry point names to specs, ``None`` if not cached.
+      Entry points which failed to load have no spec.
+    :rtype: dict
+    """
+    _get_distribution_index()
+    group = _load_extension_spec_cache(get_extension_spec_cache_path()).get(group_name)
+    if not isinstance(group, dict) or \
+            group.get('entry_points') != _get_entry_point_values(group_name):
+        return None
+    return group.get('specs')
+
+
+def store_extension_specs(group_name, specs):
+    """
+    Store the specs of the extensions of a specific group.
+
+    :param str group_name: the name of the ``entry_point`` group
+    :param dict specs: mapping of entry point names to JSON-serializable specs,
+      for all entry points of the group which could be loaded
+    """
+    _get_distribution_index()
+    cache_path = get_extension_spec_cache_path()
+    groups = _load_extension_spec_cache(cache_path)
+    groups[group_name] = {
+        'entry_points': _get_entry_point_values(group_name),
+        'specs': specs,
+    }
+    _store_json(cache_path, {
+        'version': EXTENSION_SPEC_CACHE_VERSION,
+        'fingerprint': _distribution_index_fingerprint,
+        'groups': groups,
+    })
+
+
 def get_all_entry_points():
     """
     Get all entry points related to ``ros2cli`` and any of its extensions.
@@ -44,13 +368,15 @@ def get_all_entry_points():
 
     entry_points = defaultdict(dict)
 
-    for dist in importlib_metadata.distributions():
-        for ep in dist.entry_points:
+    for dist in _get_distribution_index():
+        for group, name, value in dist['entry_points']:
             # skip groups which are not registered as extension points
-            if ep.group not in extension_points:
+            if group not in extension_points:
                 continue
 
-            entry_points[ep.group][ep.name] = (dist, ep)
+            entry_points[group][name] = (
+                _get_distribution(dist),
+                importlib_metadata.EntryPoint(name, value, group))
     return entry_points
 
 
@@ -63,14 +389,18 @@ def get_entry_points(group_name):
       to ``EntryPoint`` instances
     :rtype: dict
     """
-    entry_points_impl = importlib_metadata.entry_points()
-    if hasattr(entry_points_impl, 'select'):
-        groups = entry_points_impl.select(group=group_name)
-    else:
-        groups = entry_points_impl.get(group_name, [])
     entry_points = {}
-    for entry_point in groups:
-        entry_points[entry_point.name] = entry_point
+    seen = set()
+    for dist in _get_distribution_index():
+        # only the first distribution with a given name is visible,
+        # consistent with ``importlib.metadata.entry_points()``
+        if dist['name'] in seen:
+            continue
+        seen.add(dist['name'])
+        for group, name, value in dist['entry_points']:
+            if group == group_name:
+                entry_points[name] = importlib_metadata.EntryPoint(
+                    name, value, group)
     return entry_points
 
 
@@ -13,9 +13,11 @@
 # limitations under the License.
 
 from argparse import ArgumentTypeError
+import errno
 import functools
 import inspect
 import os
+import stat
 import sys
 import time
 
@@ -24,6 +26,40 @@ def get_ros_domain_id():
     return int(os.environ.get('ROS_DOMAIN_ID', 0))
 
 
+def get_runtime_dir():
+    """
+    Get the directory for runtime files, such as sockets, of the current user.
+
+    The directory is ``ros2cli-<uid>``, in ``$XDG_RUNTIME_DIR`` if set or in
+    the temporary directory otherwise, which other users may write to.
+    It is created if needed, such that only the current user may access it,
+    and checked to be so, as files in it are trusted to be genuine.
+
+    :return: the path to the directory.
+    :raises PermissionError: if the directory exists but is not private to
+      the current user, e.g. if another user created it first.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        # tempfile is comparatively expensive to import and rarely needed
+        import tempfile
+        runtime_dir = tempfile.gettempdir()
+    path = os.path.join(runtime_dir, f'ros2cli-{os.getuid()}')
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    # symbolic links are not followed, the link itself would have to be trusted
+    st = os.lstat(path)
+    if (
+        not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or
+        stat.S_IMODE(st.st_mode) & 0o077
+    ):
+        raise PermissionError(
+            errno.EACCES, 'Runtime directory is not private to the current user', path)
+    return path
+
+
 def wait_for(predicate, timeout, period=0.1):
     """
     Wait for a predicate to evaluate to `True`.
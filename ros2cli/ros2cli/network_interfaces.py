@@ -0,0 +1,163 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Network interface addresses, shared by all users in a process.
+
+Enumerating network interfaces and their addresses is comparatively
+expensive, especially on hosts with many (virtual) interfaces, so a
+snapshot is cached until interfaces change (see `InterfaceChangeMonitor`).
+"""
+
+import socket
+import threading
+import time
+
+import psutil
+
+# rtnetlink multicast groups, see rtnetlink.h
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+# duration, in seconds, for which network interface addresses are cached
+# when changes can't be monitored (i.e. no netlink)
+DEFAULT_TTL = 1.0
+
+
+def _open_netlink_socket():
+    if not hasattr(socket, 'AF_NETLINK'):
+        return None
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    try:
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+class InterfaceChangeMonitor:
+    """
+    Tell whether network interfaces may have changed since last checked.
+
+    On Linux, the kernel announces changes to links and addresses over a
+    netlink socket, so checking boils down to a non-blocking read.
+    Elsewhere, changes are assumed at most every `min_interval` seconds.
+    """
+
+    def __init__(self, *, min_interval=DEFAULT_TTL, clock=time.monotonic):
+        """
+        Construct an InterfaceChangeMonitor.
+
+        :param min_interval: minimum duration, in seconds, between two
+          changes, if these can't be monitored.
+        :param clock: function returning the current time, in seconds.
+        """
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_change_time = clock()
+        try:
+            self._sock = _open_netlink_socket()
+        except OSError:
+            self._sock = None
+
+    def may_have_changed(self):
+        """Check whether network interfaces may have changed since the last call."""
+        with self._lock:
+            if self._sock is None:
+                now = self._clock()
+                if now - self._last_change_time < self.min_interval:
+                    return False
+                self._last_change_time = now
+                return True
+            changed = False
+            while True:
+                try:
+                    if not self._sock.recv(65536):
+                        break
+                except BlockingIOError:
+                    break
+                except OSError:
+                    # e.g. ENOBUFS, some announcements were dropped
+                    return True
+                changed = True
+            return changed
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class InterfaceAddressCache:
+    """Cache of network interface addresses, refreshed when interfaces change."""
+
+    def __init__(self, *, monitor=None):
+        """
+        Construct an InterfaceAddressCache.
+
+        :param monitor: optional `InterfaceChangeMonitor` instance,
+          telling when to refresh addresses.
+        """
+        self._monitor = monitor if monitor is not None else InterfaceChangeMonitor()
+        self._lock = threading.Lock()
+        self._addresses = None
+        self._fingerprint = None
+        self._ipv4_addresses = None
+
+    def _refresh_if_changed(self):
+        with self._lock:
+            if self._addresses is not None and not self._monitor.may_have_changed():
+                return
+            self._addresses = psutil.net_if_addrs()
+            self._fingerprint = frozenset(
+                (name, addr.family, addr.address, addr.netmask)
+                for name, addrs in self._addresses.items() for addr in addrs)
+            self._ipv4_addresses = frozenset(
+                addr.address for addrs in self._addresses.values()
+                for addr in addrs if addr.family == socket.AF_INET)
+
+    def get_addresses(self):
+        """Get addresses by interface name, like `psutil.net_if_addrs()` does."""
+        self._refresh_if_changed()
+        return self._addresses
+
+    def get_fingerprint(self):
+        """Get a hashable value, that is equal for as long as addresses do not change."""
+        self._refresh_if_changed()
+        return self._fingerprint
+
+    def get_ipv4_addresses(self):
+        """Get the IPv4 addresses of all interfaces."""
+        self._refresh_if_changed()
+        return self._ipv4_addresses
+
+    def close(self):
+        self._monitor.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_interface_address_cache():
+    """Get the `InterfaceAddressCache` shared by all users in this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = InterfaceAddressCache()
+        return _cache
@@ -14,55 +14,187 @@
 
 import errno
 import functools
+import hashlib
+import json
 import os
 import platform
 import socket
+import tempfile
+import time
 
 import rclpy
 
 import ros2cli.daemon as daemon
 from ros2cli.daemon.daemonize import daemonize
+from ros2cli.daemon.daemonize import is_fork_safe
+from ros2cli.daemon.daemonize import list_open_fds
+import ros2cli.daemon.multi_domain as multi_domain
+from ros2cli.daemon.multi_domain import get_multi_domain_server_path
+from ros2cli.daemon.multi_domain import MultiDomainRPCServer
 
 from ros2cli.helpers import get_ros_domain_id
 from ros2cli.helpers import wait_for
 
-from ros2cli.xmlrpc.client import ServerProxy
+from ros2cli.rpc.client import Fault
+from ros2cli.rpc.client import ServerProxy as RPCServerProxy
+
+
+# lists of methods, keyed by the identity of the socket of the daemon
+# serving them, i.e. valid for as long as that daemon is running, and
+# cached on disk for later processes too (see `_load_methods()`)
+_methods_by_daemon = {}
+
+
+def _get_socket_identity(path):
+    st = os.stat(path)
+    return (path, st.st_dev, st.st_ino, st.st_mtime_ns)
+
+
+def _get_methods_cache_path(path, options):
+    # next to the socket, i.e. in the private runtime directory of the user
+    key = json.dumps([path, sorted(options.items())])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(os.path.dirname(path), f'ros2cli-methods-{digest}.json')
+
+
+def _load_methods(path, options, identity):
+    """
+    Load the list of methods of a daemon, as stored by `_store_methods()`.
+
+    :param path: path of the socket of the daemon.
+    :param options: options of requests to the daemon.
+    :param identity: identity of the socket, see `_get_socket_identity()`.
+    :return: the list of methods, or `None` if not stored for this daemon
+      instance, e.g. if it was stored before the daemon restarted.
+    """
+    try:
+        with open(_get_methods_cache_path(path, options)) as f:
+            entry = json.load(f)
+        if entry['identity'] != list(identity):
+            return None
+        methods = entry['methods']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(methods, list) or not all(isinstance(m, str) for m in methods):
+        return None
+    return methods
+
+
+def _store_methods(path, options, identity, methods):
+    """Store the list of methods of a daemon, see `_load_methods()`."""
+    cache_path = _get_methods_cache_path(path, options)
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path), prefix=os.path.basename(cache_path) + '.')
+    except OSError:
+        # the cache only helps to speed things up
+        return
+    try:
+        with open(fd, 'w') as f:
+            json.dump({'identity': list(identity), 'methods': methods}, f)
+        # replaced at once, concurrent readers never see a partial file
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
 class DaemonNode:
 
     def __init__(self, args):
         self._args = args
-        self._proxy = ServerProxy(
-            daemon.get_xmlrpc_server_url(),
-            allow_none=True)
+        self._xmlrpc_proxy = daemon.make_xmlrpc_server_proxy()
+        self._rpc_proxies = []
+        if hasattr(socket, 'AF_UNIX'):
+            try:
+                self._rpc_proxies = [
+                    RPCServerProxy(daemon.get_rpc_server_path()),
+                    # a multi-domain daemon needs to be told the domain of every request
+                    RPCServerProxy(
+                        get_multi_domain_server_path(),
+                        options={'domain_id': get_ros_domain_id()}),
+                ]
+            except PermissionError:
+                # no daemon listens there, see `ros2cli.helpers.get_runtime_dir()`
+                pass
+        self._proxy = self._xmlrpc_proxy
         self._methods = []
+        self._supports_multicall = False
+
+    def _list_methods(self):
+        # prefer the compact RPC transport, to a daemon for the current domain
+        # or else to a multi-domain daemon, and fall back to XML-RPC
+        for rpc_proxy in self._rpc_proxies:
+            try:
+                # always check on a fresh connection
+                rpc_proxy.close()
+                rpc_proxy.connect()
+                identity = _get_socket_identity(rpc_proxy.path)
+                key = (identity, tuple(sorted(rpc_proxy.options.items())))
+                methods = _methods_by_daemon.get(key)
+                if methods is None:
+                    methods = _load_methods(rpc_proxy.path, rpc_proxy.options, identity)
+                if methods is None:
+                    methods = rpc_proxy.system.listMethods()
+                    _store_methods(rpc_proxy.path, rpc_proxy.options, identity, methods)
+                _methods_by_daemon[key] = methods
+            except OSError:
+                rpc_proxy.close()
+            else:
+                self._proxy = rpc_proxy
+                return methods
+        self._proxy = self._xmlrpc_proxy
+        return self._proxy.system.listMethods()
 
     @property
     def connected(self):
         try:
-            self._methods = [
-                method
-                for method in self._proxy.system.listMethods()
-                if not method.startswith('system.')
-            ]
-        except ConnectionRefusedError:
+            methods = self._list_methods()
+        except (ConnectionRefusedError, FileNotFoundError):
             return False
+        self._methods = [
+            method for method in methods if not method.startswith('system.')
+        ]
+        self._supports_multicall = 'system.multicall' in methods
         return True
 
     @property
     def methods(self):
         return self._methods
 
+    @property
+    def supports_multicall(self):
+        return self._supports_multicall
+
+    def multicall(self, calls):
+        """
+        Invoke several methods in a single request.
+
+        :param calls: a list of (method name, arguments) tuples.
+        :return: a list with the result of each invocation, in order.
+        :raises: a `Fault` for the first failed invocation, if any.
+        """
+        results = self._proxy.system.multicall([
+            {'methodName': name, 'params': list(args)} for name, args in calls
+        ])
+        for result in results:
+            if isinstance(result, dict):
+                raise Fault(result['faultCode'], result['faultString'])
+        return [result[0] for result in results]
+
     def __enter__(self):
-        self._proxy.__enter__()
+        self._xmlrpc_proxy.__enter__()
         return self
 
     def __getattr__(self, name):
         return getattr(self._proxy, name)
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self._proxy.__exit__(exc_type, exc_value, traceback)
+        for rpc_proxy in self._rpc_proxies:
+            rpc_proxy.close()
+        self._xmlrpc_proxy.__exit__(exc_type, exc_value, traceback)
 
 
 def is_daemon_running(args):
@@ -75,10 +207,38 @@ def is_daemon_running(args):
         return node.connected
 
 
+def _is_xmlrpc_daemon_reachable():
+    # always check on a fresh connection, to the daemon of the current domain only
+    with daemon.make_xmlrpc_server_proxy() as proxy:
+        try:
+            proxy.system.listMethods()
+        except OSError:
+            return False
+    return True
+
+
+def _shutdown(shutdown, is_running, timeout):
+    if not is_running():
+        return False
+    shutdown()
+    if timeout is not None:
+        predicate = (lambda: not is_running())
+        if not wait_for(predicate, timeout):
+            raise RuntimeError(
+                'Timed out waiting for '
+                'daemon to shutdown'
+            )
+    return True
+
+
 def shutdown_daemon(args, timeout=None):
     """
     Shut down daemon node if it's running.
 
+    Only the daemon serving the current ROS domain is shut down, which is
+    always reachable over XML-RPC, never a multi-domain daemon that other
+    domains may depend on (see `shutdown_multi_domain_daemon()`).
+
     :param args: `DaemonNode` arguments namespace.
     :param timeout: optional duration, in seconds, to wait
       until the daemon node is fully shut down. Non-positive
@@ -87,21 +247,56 @@ def shutdown_daemon(args, timeout=None):
       `False` if it was already shut down.
     :raises: if it fails to shutdown the daemon.
     """
-    with DaemonNode(args) as node:
-        if not node.connected:
-            return False
-        node.system.shutdown()
-        if timeout is not None:
-            predicate = (lambda: not node.connected)
-            if not wait_for(predicate, timeout):
-                raise RuntimeError(
-                    'Timed out waiting for '
-                    'daemon to shutdown'
-                )
-        return True
+    def shutdown():
+        with daemon.make_xmlrpc_server_proxy() as proxy:
+            proxy.system.shutdown()
+    return _shutdown(shutdown, _is_xmlrpc_daemon_reachable, timeout)
+
+
+def _make_fds_non_inheritable(keep):
+    # During tab completion on the ros2 tooling, we can get here and attempt to spawn a daemon.
+    # In that scenario, there may be open file descriptors that can prevent us from successfully
+    # daemonizing, and instead cause the terminal to hang.  Here we mark all file handles except
+    # for 0, 1, 2, and the server socket (`keep`) as non-inheritable, which will cause
+    # daemonize() to close those file descriptors.
+    # See https://github.com/ros2/ros2cli/issues/851 for more details.
+    if platform.system() == 'Windows':
+        return
+    # Only visit open file descriptors if these can be listed, rather
+    # than every possible one up to the (potentially high) limit.
+    fds = list_open_fds()
+    if fds is None:
+        # Some unices have a high soft_limit; read fdsize if available.
+        fdlimit = None
+        try:
+            string_to_find = 'FDSize:'
+            with open('/proc/self/status', 'r') as f:
+                for line in f:
+                    if line.startswith(string_to_find):
+                        fdlimit = int(line.removeprefix(string_to_find).strip())
+                        break
+        except (FileNotFoundError, ValueError):
+            pass
+        # The soft limit might be quite high on some systems.
+        if fdlimit is None:
+            import resource
+            fdlimit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        fds = range(3, fdlimit)
+    for i in fds:
+        try:
+            if i > 2 and i != keep and os.get_inheritable(i):
+                os.set_inheritable(i, False)
+        except OSError:
+            # Just in case the file handles might be [3(closed), ..., 8(pipe handle), ...]
+            continue
+
 
+def _can_fork_daemon():
+    # the daemon can't share ROS state with this process
+    return is_fork_safe() and not rclpy.ok()
 
-def spawn_daemon(args, timeout=None, debug=False):
+
+def spawn_daemon(args, timeout=None, debug=False, *, fork=None):
     """
     Spawn daemon node if it's not running.
 
@@ -110,17 +305,27 @@ def spawn_daemon(args, timeout=None, debug=False):
     and transfers it to the daemon process through pipes
     (sending the inheritable socket with it). In a sense,
     the socket functionally behaves as a mutex.
+    Where possible, the daemon process is forked from this
+    process rather than started from scratch, which is much
+    faster (see `ros2cli.daemon.daemonize.daemonize()`).
 
     :param args: `DaemonNode` arguments namespace.
     :param timeout: optional duration, in seconds, to wait
       until the daemon node is ready. Non-positive
       durations will result in an indefinite wait.
     :param debug: if `True`, the daemon process will output
-      to the current `stdout` and `stderr` streams.
+      to the current `stdout` and `stderr` streams, and the
+      duration of each phase of the spawn is printed.
+    :param fork: whether to fork the daemon process, by
+      default only if it's safe to do so.
     :return: `True` if the the daemon was spawned,
       `False` if it was already running.
     :raises: if it fails to spawn the daemon.
     """
+    if fork is None:
+        fork = _can_fork_daemon()
+    timings = []
+    start = time.perf_counter()
     # Acquire socket by instantiating XMLRPC server.
     try:
         server = daemon.make_xmlrpc_server()
@@ -131,35 +336,11 @@ def spawn_daemon(args, timeout=None, debug=False):
             # Daemon already running
             return False
         raise
+    timings.append(('bind', time.perf_counter() - start))
 
-    # During tab completion on the ros2 tooling, we can get here and attempt to spawn a daemon.
-    # In that scenario, there may be open file descriptors that can prevent us from successfully
-    # daemonizing, and instead cause the terminal to hang.  Here we mark all file handles except
-    # for 0, 1, 2, and the server socket as non-inheritable, which will cause daemonize() to close
-    # those file descriptors.  See https://github.com/ros2/ros2cli/issues/851 for more details.
-    if platform.system() != 'Windows':
-        # Some unices have a high soft_limit; read fdsize if available.
-        fdlimit = None
-        try:
-            string_to_find = 'FDSize:'
-            with open('/proc/self/status', 'r') as f:
-                for line in f:
-                    if line.startswith(string_to_find):
-                        fdlimit = int(line.removeprefix(string_to_find).strip())
-                        break
-        except (FileNotFoundError, ValueError):
-            pass
-        # The soft limit might be quite high on some systems.
-        if fdlimit is None:
-            import resource
-            fdlimit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
-        for i in range(3, fdlimit):
-            try:
-                if i != server.socket.fileno() and os.get_inheritable(i):
-                    os.set_inheritable(i, False)
-            except OSError:
-                # Just in case the file handles might be [3(closed), ..., 8(pipe handle), ...]
-                continue
+    start = time.perf_counter()
+    _make_fds_non_inheritable(keep=server.socket.fileno())
+    timings.append(('fds', time.perf_counter() - start))
 
     # Transfer XMLRPC server to daemon (and the socket with it).
     try:
@@ -169,9 +350,99 @@ def spawn_daemon(args, timeout=None, debug=False):
 
         daemonize(
             functools.partial(daemon.serve, server),
-            tags=tags, timeout=timeout, debug=debug)
+            tags=tags, timeout=timeout, debug=debug,
+            fork=fork, timings=timings)
+    finally:
+        # only close the socket, the daemon owns the server now
+        server.socket.close()
+
+    return True
+
+
+def is_multi_domain_daemon_running():
+    """Check if the multi-domain daemon is running."""
+    try:
+        proxy = RPCServerProxy(get_multi_domain_server_path())
+    except PermissionError:
+        # no daemon listens there, see `ros2cli.helpers.get_runtime_dir()`
+        return False
+    try:
+        proxy.connect()
+    except OSError:
+        return False
+    finally:
+        proxy.close()
+    return True
+
+
+def shutdown_multi_domain_daemon(timeout=None):
+    """
+    Shut down the daemon serving all ROS domains if it's running.
+
+    :param timeout: optional duration, in seconds, to wait
+      until the daemon is fully shut down. Non-positive
+      durations will result in an indefinite wait.
+    :return: `True` if the the daemon was shut down,
+      `False` if it was already shut down.
+    :raises: if it fails to shutdown the daemon.
+    """
+    def shutdown():
+        with RPCServerProxy(get_multi_domain_server_path()) as proxy:
+            proxy.system.shutdown()
+    return _shutdown(shutdown, is_multi_domain_daemon_running, timeout)
+
+
+def spawn_multi_domain_daemon(timeout=None, debug=False):
+    """
+    Spawn a daemon serving all ROS domains if it's not running.
+
+    Like `spawn_daemon()`, this function binds the socket of the
+    server in the calling process and transfers it to the daemon.
+    The multi-domain daemon is only reachable through the compact
+    RPC transport, i.e. on platforms with Unix domain sockets.
+
+    :param timeout: optional duration, in seconds, to wait
+      until the daemon is ready. Non-positive
+      durations will result in an indefinite wait.
+    :param debug: if `True`, the daemon process will output
+      to the current `stdout` and `stderr` streams.
+    :return: `True` if the the daemon was spawned,
+      `False` if it was already running.
+    :raises: if it fails to spawn the daemon.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise RuntimeError('a multi-domain daemon requires Unix domain sockets')
+    path = get_multi_domain_server_path()
+    try:
+        try:
+            server = MultiDomainRPCServer(path)
+        except socket.error as e:
+            if e.errno != errno.EADDRINUSE or is_multi_domain_daemon_running():
+                raise
+            # remove the socket of a daemon which didn't shut down cleanly
+            os.unlink(path)
+            server = MultiDomainRPCServer(path)
+    except socket.error as e:
+        if e.errno == errno.EADDRINUSE:
+            # Daemon already running
+            return False
+        raise
+    server.socket.set_inheritable(True)
+
+    _make_fds_non_inheritable(keep=server.socket.fileno())
+
+    try:
+        tags = {
+            'name': 'ros2-daemon', 'ros_domain_id': 'any',
+            'rmw_implementation': rclpy.get_rmw_implementation_identifier()}
+
+        daemonize(
+            functools.partial(multi_domain.serve, server),
+            tags=tags, timeout=timeout, debug=debug,
+            fork=_can_fork_daemon())
     finally:
-        server.server_close()
+        # only close the socket, the daemon owns the path now
+        server.socket.close()
 
     return True
 
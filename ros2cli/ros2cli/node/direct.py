@@ -13,18 +13,136 @@
 # limitations under the License.
 
 import os
+import time
 
 import rclpy
 import rclpy.action
+import rclpy.executors
 
 from rclpy.parameter import Parameter
 from ros2cli.node import NODE_NAME_PREFIX
 DEFAULT_TIMEOUT = 0.5
 
+# initial period, in seconds, at which discovery is checked for completion,
+# doubled after every check up to the maximum period
+DISCOVERY_CHECK_PERIOD = 0.01
+
+MAX_DISCOVERY_CHECK_PERIOD = 0.16
+
+DISCOVERY_MODES = ('fixed', 'adaptive')
+
+# duration, in seconds, for which the graph must not change for discovery
+# to be considered done, in adaptive mode, well below the default spin time
+# for adaptive mode to pay off with default arguments.  Unlike the settle
+# time of the daemon's graph cache, which must not cache stale results for
+# long, a premature end only misses late participants once.
+DEFAULT_QUIET_PERIOD = 0.1
+
+# kinds of endpoints of a node, as in `DirectNode.get_node_graph()`, which
+# are counted to tell when discovery is done, with the node queries listing them
+DISCOVERY_ENDPOINT_QUERIES = {
+    'subscribers': 'get_subscriber_names_and_types_by_node',
+    'publishers': 'get_publisher_names_and_types_by_node',
+    'service_servers': 'get_service_names_and_types_by_node',
+    'service_clients': 'get_client_names_and_types_by_node',
+}
+
+
+def get_daemon_node_graph(args):
+    """
+    Get the nodes known to a running daemon, if any, with their endpoint counts.
+
+    :param args: `DaemonNode` arguments namespace.
+    :return: a dict mapping (node name, node namespace) tuples to dicts
+      mapping kinds of endpoints (see `DISCOVERY_ENDPOINT_QUERIES`) to counts,
+      or to `None` if the daemon can't tell endpoints,
+      or `None` if no daemon is running.
+    """
+    # imported here, as the daemon itself is built upon direct nodes
+    from ros2cli.node.daemon import DaemonNode
+    try:
+        with DaemonNode(args) as daemon_node:
+            if not daemon_node.connected:
+                return None
+            if 'get_node_graph' in daemon_node.methods:
+                return {
+                    (name, namespace): {
+                        kind: len(endpoints[kind]) for kind in DISCOVERY_ENDPOINT_QUERIES
+                    }
+                    for name, namespace, endpoints in daemon_node.get_node_graph()
+                }
+            if 'get_node_names_and_namespaces' in daemon_node.methods:
+                return {
+                    (name, namespace): None
+                    for name, namespace in daemon_node.get_node_names_and_namespaces()
+                }
+            return None
+    except Exception:
+        # the daemon only helps to speed things up
+        return None
+
+
+class GraphSettleMonitor:
+    """Tell when the graph seen by a node has not changed for a while."""
+
+    def __init__(self, node, *, quiet_period=DEFAULT_QUIET_PERIOD, clock=time.monotonic):
+        """
+        Construct a GraphSettleMonitor.
+
+        :param node: an `rclpy.node.Node` instance.
+        :param quiet_period: duration, in seconds, for which the graph
+          must not change to be considered settled.
+        :param clock: function returning the current time, in seconds.
+        """
+        self._node = node
+        self.quiet_period = quiet_period
+        self._clock = clock
+        self._fingerprint = None
+        self._last_change_time = clock()
+
+    def _get_fingerprint(self):
+        return (
+            frozenset(self._node.get_node_names_and_namespaces()),
+            frozenset(
+                (name, tuple(types))
+                for name, types in self._node.get_topic_names_and_types()),
+            frozenset(
+                (name, tuple(types))
+                for name, types in self._node.get_service_names_and_types()),
+        )
+
+    def is_settled(self):
+        """Check whether the graph has not changed for the quiet period."""
+        now = self._clock()
+        fingerprint = self._get_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._last_change_time = now
+            return False
+        return now - self._last_change_time >= self.quiet_period
+
 
 class DirectNode:
 
-    def __init__(self, args, *, node_name=None):
+    def __init__(self, args, *, node_name=None, seed_from_daemon=True):
+        """
+        Construct a DirectNode.
+
+        The node spins for `args.spin_time` seconds to let discovery happen.
+        If a daemon is running, the nodes it knows are used to tell when
+        discovery is done instead, such that spinning stops as soon as all
+        of them have been discovered along with as many endpoints as the
+        daemon knows of (but still after `args.spin_time` seconds at most).
+        If the daemon can't tell endpoints, spinning goes on once all nodes
+        have been discovered until the graph settles.
+        Otherwise, if `args.discovery_mode` is 'adaptive', spinning stops
+        as soon as the graph settles (see `GraphSettleMonitor`).
+
+        :param args: arguments namespace.
+        :param node_name: optional name of the node.
+        :param seed_from_daemon: whether to ask a running daemon for the
+          nodes to be discovered, unless `args.no_daemon` is set.
+        """
         timeout_reached = False
 
         def timer_callback():
@@ -33,7 +151,16 @@ class DirectNode:
 
         argv = getattr(args, 'argv', [])
 
-        rclpy.init(args=argv)
+        # nodes for a specific domain get a context (and executor) of their own,
+        # such that nodes in different domains can coexist in the same process
+        domain_id = getattr(args, 'domain_id', None)
+        self._context = None
+        self._executor = None
+        if domain_id is not None:
+            self._context = rclpy.Context()
+        rclpy.init(args=argv, context=self._context, domain_id=domain_id)
+        if self._context is not None:
+            self._executor = rclpy.executors.SingleThreadedExecutor(context=self._context)
 
         node_name_suffix = getattr(
             args, 'node_name_suffix', '_%d' % os.getpid())
@@ -51,19 +178,75 @@ class DirectNode:
             parameter_overrides=[
                 Parameter('use_sim_time', value=use_sim_time),
                 Parameter('start_type_description_service', value=start_type_description_service),
-            ], automatically_declare_parameters_from_overrides=True)
+            ], automatically_declare_parameters_from_overrides=True,
+            context=self._context)
+
+        expected_nodes = None
+        if seed_from_daemon and not getattr(args, 'no_daemon', False):
+            expected_nodes = get_daemon_node_graph(args)
+
+        settle_monitor = None
+        if expected_nodes is not None:
+            expected_nodes = {
+                (name, namespace): counts
+                for (name, namespace), counts in expected_nodes.items()
+                # other ros2cli nodes come and go, the daemon may still know exited ones
+                if not name.startswith(NODE_NAME_PREFIX)
+            }
+            if any(counts is None for counts in expected_nodes.values()):
+                settle_monitor = GraphSettleMonitor(self.node)
+        elif getattr(args, 'discovery_mode', 'fixed') == 'adaptive':
+            settle_monitor = GraphSettleMonitor(self.node)
 
         timeout = getattr(args, 'spin_time', DEFAULT_TIMEOUT)
         timer = self.node.create_timer(timeout, timer_callback)
 
+        check_period = DISCOVERY_CHECK_PERIOD
         while not timeout_reached:
-            rclpy.spin_once(self.node)
+            if expected_nodes is not None:
+                if self._has_discovered(expected_nodes) and (
+                    settle_monitor is None or settle_monitor.is_settled()
+                ):
+                    break
+            elif settle_monitor is not None:
+                if settle_monitor.is_settled():
+                    break
+            else:
+                self.spin_once()
+                continue
+            self.spin_once(timeout_sec=check_period)
+            check_period = min(2 * check_period, MAX_DISCOVERY_CHECK_PERIOD)
 
         self.node.destroy_timer(timer)
 
     def __enter__(self):
         return self
 
+    def _has_discovered(self, nodes):
+        """
+        Check whether nodes have been discovered, along with their endpoints.
+
+        Nodes found to be discovered are removed, not to be checked again.
+
+        :param nodes: dict as returned by `get_daemon_node_graph()`.
+        """
+        discovered_nodes = set(self.node.get_node_names_and_namespaces())
+        for (name, namespace), counts in list(nodes.items()):
+            if (name, namespace) not in discovered_nodes:
+                return False
+            for kind, count in (counts or {}).items():
+                query = getattr(self.node, DISCOVERY_ENDPOINT_QUERIES[kind])
+                try:
+                    if len(query(name, namespace)) < count:
+                        return False
+                except rclpy.node.NodeNameNonExistentError:
+                    return False
+            del nodes[(name, namespace)]
+        return True
+
+    def spin_once(self, *, timeout_sec=None):
+        rclpy.spin_once(self.node, executor=self._executor, timeout_sec=timeout_sec)
+
     # TODO(hidmic): generalize/standardize rclpy graph API
     #               to not have to make a special case for
     #               rclpy.action
@@ -78,22 +261,60 @@ class DirectNode:
         return rclpy.action.get_action_server_names_and_types_by_node(
             self.node, remote_node_name, remote_node_namespace)
 
+    def get_node_graph(self):
+        """
+        Get the endpoints of all nodes in the graph at once.
+
+        :return: a list of (node name, node namespace, endpoints) tuples, where
+          endpoints is a dict mapping each kind of endpoint ('subscribers',
+          'publishers', 'service_servers', 'service_clients', 'action_servers'
+          and 'action_clients') to a list of (name, types) tuples
+        """
+        queries = {
+            'subscribers': self.node.get_subscriber_names_and_types_by_node,
+            'publishers': self.node.get_publisher_names_and_types_by_node,
+            'service_servers': self.node.get_service_names_and_types_by_node,
+            'service_clients': self.node.get_client_names_and_types_by_node,
+            'action_servers': self.get_action_server_names_and_types_by_node,
+            'action_clients': self.get_action_client_names_and_types_by_node,
+        }
+        graph = []
+        for node_name, node_namespace in self.node.get_node_names_and_namespaces():
+            try:
+                endpoints = {
+                    kind: query(node_name, node_namespace)
+                    for kind, query in queries.items()
+                }
+            except rclpy.node.NodeNameNonExistentError:
+                # the node left the graph in the meantime
+                continue
+            graph.append((node_name, node_namespace, endpoints))
+        return graph
+
     def __getattr__(self, name):
-        if not rclpy.ok():
+        if not rclpy.ok(context=self._context):
             raise RuntimeError('!rclpy.ok()')
 
         return getattr(self.node, name)
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.node.destroy_node()
-        rclpy.try_shutdown()
+        if self._executor is not None:
+            self._executor.shutdown()
+        rclpy.try_shutdown(context=self._context)
 
 
 def add_arguments(parser):
     parser.add_argument(
         '--spin-time', type=float, default=DEFAULT_TIMEOUT,
         help='Spin time in seconds to wait for discovery (only applies when '
-             'not using an already running daemon)')
+             'not using an already running daemon), an upper bound in adaptive '
+             'discovery mode')
+    parser.add_argument(
+        '--discovery-mode', choices=DISCOVERY_MODES, default='fixed',
+        help="How long to wait for discovery: 'fixed' waits for the whole spin time, "
+             "'adaptive' only until the graph has not changed for "
+             f'{DEFAULT_QUIET_PERIOD} seconds')
     parser.add_argument(
         '-s', '--use-sim-time', action='store_true',
         help='Enable ROS simulation time')
@@ -12,21 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import functools
 import inspect
+import threading
 
-import psutil
-import rclpy
+from ros2cli.network_interfaces import get_interface_address_cache
 
 from ros2cli.node.direct import DirectNode
 
 
-def get_interfaces_ip_addresses():
-    addresses_by_interfaces = psutil.net_if_addrs()
-    print(f'Addresses by interfaces: {addresses_by_interfaces}')
-    return addresses_by_interfaces
-
-
 class NetworkAwareNode:
     """A direct node, that resets itself when a network interface changes."""
 
@@ -35,7 +30,12 @@ class NetworkAwareNode:
         # TODO(ivanpauno): A race condition is possible here, since it isn't possible to know
         # exactly which interfaces were available at node creation.
         self.node = DirectNode(args)
-        self.addresses_at_start = get_interfaces_ip_addresses()
+        self.interface_address_cache = get_interface_address_cache()
+        self.addresses_at_start = self.interface_address_cache.get_fingerprint()
+        # resets wait for all (concurrent) users of the node to be done
+        self._condition = threading.Condition()
+        self._users = 0
+        self._resetting = False
 
     def __enter__(self):
         self.node.__enter__()
@@ -48,8 +48,9 @@ class NetworkAwareNode:
             @functools.wraps(attr)
             def wrapper(*args, **kwargs):
                 self.reset_if_addresses_changed()
-                # The attribute has to be get here again, in case self.node changed
-                return getattr(self.node, name)(*args, **kwargs)
+                with self.in_use():
+                    # The attribute has to be get here again, in case self.node changed
+                    return getattr(self.node, name)(*args, **kwargs)
             wrapper.__signature__ = inspect.signature(attr)
             return wrapper
         self.reset_if_addresses_changed()
@@ -58,12 +59,39 @@ class NetworkAwareNode:
     def __exit__(self, exc_type, exc_value, traceback):
         self.node.__exit__(exc_type, exc_value, traceback)
 
+    @contextlib.contextmanager
+    def in_use(self):
+        """Prevent the node from being reset, e.g. by another thread, within this context."""
+        with self._condition:
+            while self._resetting:
+                self._condition.wait()
+            self._users += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._users -= 1
+                self._condition.notify_all()
+
     def reset_if_addresses_changed(self):
-        new_addresses = get_interfaces_ip_addresses()
-        if new_addresses != self.addresses_at_start:
+        # cheap unless interfaces changed, see ros2cli.network_interfaces
+        new_addresses = self.interface_address_cache.get_fingerprint()
+        if new_addresses == self.addresses_at_start:
+            return
+        with self._condition:
+            if new_addresses == self.addresses_at_start:
+                # another thread took care of it
+                return
             self.addresses_at_start = new_addresses
-            self.node.destroy_node()
-            rclpy.shutdown()
+            self._resetting = True
+            while self._users:
+                self._condition.wait()
+        try:
+            self.node.__exit__(None, None, None)
             self.node = DirectNode(self.args)
             self.node.__enter__()
             print('Network interfaces changed, daemon node was reset!')
+        finally:
+            with self._condition:
+                self._resetting = False
+                self._condition.notify_all()
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ros2cli.daemon.graph_snapshot as graph_snapshot
+from ros2cli.daemon.graph_snapshot import GraphSnapshotUnavailable
+from ros2cli.daemon.graph_snapshot import open_graph_snapshot
+
 from ros2cli.node.daemon import add_arguments as add_daemon_node_arguments
 from ros2cli.node.daemon import DaemonNode
 from ros2cli.node.daemon import is_daemon_running
@@ -20,26 +24,79 @@ from ros2cli.node.direct import add_arguments as add_direct_node_arguments
 from ros2cli.node.direct import DirectNode
 
 
+class QueryBatch:
+    """
+    A batch of queries to a `NodeStrategy`.
+
+    Queries are recorded by calling node methods on the batch, e.g.
+    ``batch.count_publishers('/chatter')``, and all issued at once on `flush()`.
+    Through a daemon, the whole batch takes a single round trip.
+    """
+
+    def __init__(self, node):
+        self._node = node
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self._calls.append((name, args))
+        return queue
+
+    def __len__(self):
+        return len(self._calls)
+
+    def flush(self):
+        """
+        Issue all queries recorded so far.
+
+        :return: a list with the result of each query, in order
+        :raises: the error of the first failed query, if any
+        """
+        calls, self._calls = self._calls, []
+        daemon_node = self._node.daemon_node
+        if daemon_node and daemon_node.supports_multicall and all(
+            name in daemon_node.methods for name, _ in calls
+        ):
+            return daemon_node.multicall(calls)
+        return [getattr(self._node, name)(*args) for name, args in calls]
+
+
 class NodeStrategy:
 
     def __init__(self, args):
         use_daemon = not getattr(args, 'no_daemon', False)
-        if use_daemon and is_daemon_running(args):
+        # a fresh graph snapshot shows that the daemon is running, and may
+        # answer queries without connecting to it (see `ros2cli.daemon.graph_snapshot`)
+        self._graph_snapshot = open_graph_snapshot() if use_daemon else None
+        self._daemon_connected = False
+        if self._graph_snapshot is not None:
+            self._daemon_node = DaemonNode(args)
+            self._direct_node = None
+        elif use_daemon and is_daemon_running(args):
             self._daemon_node = DaemonNode(args)
             self._direct_node = None
-            if not self._daemon_node.connected:
+            self._daemon_connected = self._daemon_node.connected
+            if not self._daemon_connected:
                 self._direct_node = DirectNode(args)
                 self._daemon_node = None
         else:
             if use_daemon:
                 spawn_daemon(args)
-            self._direct_node = DirectNode(args)
+            # a daemon that was just spawned doesn't know the graph yet
+            self._direct_node = DirectNode(args, seed_from_daemon=False)
             self._daemon_node = None
         self._args = args
         self._in_scope = False
 
     @property
     def daemon_node(self):
+        if self._daemon_node is not None and not self._daemon_connected:
+            # connect on first use only
+            self._daemon_connected = self._daemon_node.connected
+            if not self._daemon_connected:
+                if self._in_scope:
+                    self._daemon_node.__exit__(None, None, None)
+                self._daemon_node = None
         return self._daemon_node
 
     @property
@@ -50,6 +107,10 @@ class NodeStrategy:
                 self._direct_node.__enter__()
         return self._direct_node
 
+    def batch(self):
+        """Make a `QueryBatch` to issue many queries at once."""
+        return QueryBatch(self)
+
     def __enter__(self):
         if self._daemon_node:
             self._daemon_node.__enter__()
@@ -59,12 +120,27 @@ class NodeStrategy:
         return self
 
     def __getattr__(self, name):
+        if self._graph_snapshot is not None and name in graph_snapshot.QUERIES:
+            snapshot_query = getattr(self._graph_snapshot, name)
+
+            def query(*args, **kwargs):
+                try:
+                    return snapshot_query(*args, **kwargs)
+                except GraphSnapshotUnavailable:
+                    return getattr(self._get_node_for(name), name)(*args, **kwargs)
+            return query
+        return getattr(self._get_node_for(name), name)
+
+    def _get_node_for(self, name):
         if self.daemon_node and name in self.daemon_node.methods:
-            return getattr(self.daemon_node, name)
-        return getattr(self.direct_node, name)
+            return self.daemon_node
+        return self.direct_node
 
     def __exit__(self, exc_type, exc_value, traceback):
         self._in_scope = False
+        if self._graph_snapshot is not None:
+            self._graph_snapshot.close()
+            self._graph_snapshot = None
         if self._direct_node:
             self._direct_node.__exit__(exc_type, exc_value, traceback)
         if self._daemon_node:
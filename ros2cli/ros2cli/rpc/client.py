@@ -0,0 +1,133 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+# Raise the same exception type as the XML-RPC transport on remote errors.
+from xmlrpc.client import Fault
+
+from ros2cli.rpc import marshal
+
+
+__all__ = [
+    'Fault',
+    'ServerProxy'
+]
+
+
+class _Method:
+
+    def __init__(self, send, name):
+        self.__send = send
+        self.__name = name
+
+    def __getattr__(self, name):
+        return _Method(self.__send, f'{self.__name}.{name}')
+
+    def __call__(self, *args):
+        return self.__send(self.__name, args)
+
+
+class ServerProxy:
+    """
+    Client for a `ros2cli.rpc.local_server.LocalRPCServer`.
+
+    Methods are invoked like with `xmlrpc.client.ServerProxy`.
+    The connection is kept open across calls, until `close()` is called.
+    """
+
+    def __init__(self, path, *, timeout=None, options=None):
+        """
+        Construct a ServerProxy.
+
+        :param path: path to the server socket.
+        :param timeout: optional timeout, in seconds, for socket operations.
+        :param options: optional dict of options sent along with every request.
+        """
+        self._path = path
+        self._timeout = timeout
+        self._options = dict(options or {})
+        self._sock = None
+        self._stream = None
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def options(self):
+        return self._options
+
+    def connect(self):
+        """Connect to the server, unless already connected."""
+        if self._sock is not None:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self._timeout)
+            sock.connect(self._path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._stream = sock.makefile('rwb')
+
+    def close(self):
+        if self._sock is None:
+            return
+        try:
+            self._stream.close()
+        except OSError:
+            pass
+        self._sock.close()
+        self._sock = None
+        self._stream = None
+
+    def __single_request(self, method, params):
+        self.connect()
+        try:
+            request = [method, params]
+            if self._options:
+                request.append(self._options)
+            marshal.dump(request, self._stream)
+            return marshal.load(self._stream)
+        except BaseException:
+            self.close()
+            raise
+
+    def __request(self, method, params):
+        reused = self._sock is not None
+        try:
+            ok, result = self.__single_request(method, params)
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            if not reused:
+                raise ConnectionResetError(
+                    f'connection to {self._path} closed unexpectedly')
+            # the server closed the idle connection, retry once on a new one
+            try:
+                ok, result = self.__single_request(method, params)
+            except EOFError:
+                raise ConnectionResetError(
+                    f'connection to {self._path} closed unexpectedly')
+        if not ok:
+            raise Fault(1, result)
+        return result
+
+    def __getattr__(self, name):
+        return _Method(self.__request, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,127 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socketserver
+
+from ros2cli.rpc import marshal
+
+
+# idle connections are closed after this duration, in seconds
+KEEP_ALIVE_TIMEOUT = 1.0
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handle ``[method, params]`` requests until the connection is closed.
+
+    Requests may carry a third element, a dict of options that is passed
+    to the server's `dispatch()` as keyword arguments.
+    """
+
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    def handle(self):
+        while not self.server.closing:
+            try:
+                method, params, *options = marshal.load(self.rfile)
+            except (EOFError, TypeError, ValueError, OSError):
+                return
+            request = None
+            if self.server.request_stats is not None:
+                request = self.server.request_stats.start_request(method)
+            try:
+                response = [True, self.server.dispatch(method, params, **dict(*options))]
+            except Exception as e:
+                response = [False, f'{type(e).__name__}: {e}']
+            data = marshal.dumps(response)
+            if request is not None:
+                request.finish(len(data))
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                return
+
+
+class LocalRPCServer(socketserver.UnixStreamServer):
+    """
+    A compact RPC server listening on a Unix domain socket.
+
+    It mimics the registration API of `xmlrpc.server.SimpleXMLRPCServer`,
+    such that the same functions can be served over both transports.
+    """
+
+    # set to stop serving connections that are kept alive
+    closing = False
+
+    # optionally set to record requests, see `ros2cli.daemon.stats.DaemonStats`
+    request_stats = None
+
+    def __init__(self, path, requestHandler=RequestHandler, bind_and_activate=True):
+        self._functions = {}
+        super().__init__(path, requestHandler, bind_and_activate)
+
+    def server_bind(self):
+        # only the current user may connect to the server
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+    def register_function(self, function, name=None):
+        if name is None:
+            name = function.__name__
+        self._functions[name] = function
+        return function
+
+    def register_introspection_functions(self):
+        self._functions['system.listMethods'] = self.system_listMethods
+
+    def register_multicall_functions(self):
+        self._functions['system.multicall'] = self.system_multicall
+
+    def system_listMethods(self):
+        return sorted(self._functions.keys())
+
+    def system_multicall(self, call_list, **options):
+        """
+        Invoke several methods, like `xmlrpc.server.SimpleXMLRPCServer` does.
+
+        :param options: request options to dispatch each invocation with
+        :return: a list with a ``[result]`` list for each successful
+          invocation, or a fault dict for each failed one
+        """
+        results = []
+        for call in call_list:
+            try:
+                results.append([self.dispatch(call['methodName'], call['params'], **options)])
+            except Exception as e:
+                results.append({'faultCode': 1, 'faultString': f'{type(e).__name__}: {e}'})
+        return results
+
+    def dispatch(self, method, params):
+        try:
+            function = self._functions[method]
+        except KeyError:
+            raise Exception(f'method "{method}" is not supported')
+        return function(*params)
@@ -0,0 +1,181 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact message encoding for the ros2cli daemon RPC transport.
+
+Each message is a 4 bytes big endian length prefix followed by a JSON
+document.
+Types beyond those natively supported by JSON are encoded as objects tagged
+with their fully qualified type name, see `dispatch` and `loaders`.
+Like with XML-RPC, tuples are transferred as lists.
+"""
+
+import enum
+import functools
+import json
+import struct
+
+import rclpy.duration
+import rclpy.qos
+import rclpy.topic_endpoint_info
+import rclpy.type_hash
+
+from ros2cli.xmlrpc.marshal.generic import fullname
+
+HEADER = struct.Struct('!I')
+
+MAX_MESSAGE_SIZE = 1 << 30
+
+TYPE_KEY = '__type__'
+
+# map types to functions returning a JSON serializable representation
+dispatch = {}
+
+# map fully qualified type names to functions taking a JSON object
+loaders = {}
+
+
+def _default(value):
+    try:
+        dump = dispatch[type(value)]
+    except KeyError:
+        raise TypeError(
+            f"Object of type '{fullname(type(value))}' is not serializable")
+    return dump(value)
+
+
+def _object_hook(obj):
+    type_name = obj.get(TYPE_KEY)
+    if type_name is None:
+        return obj
+    return loaders[type_name](obj)
+
+
+_encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+
+_decoder = json.JSONDecoder(object_hook=_object_hook)
+
+
+def dumps(value):
+    """Encode a value, including its length prefix."""
+    data = _encoder.encode(value).encode()
+    return HEADER.pack(len(data)) + data
+
+
+def loads(data):
+    """Decode a value, excluding its length prefix."""
+    return _decoder.decode(data.decode())
+
+
+def dump(value, file):
+    file.write(dumps(value))
+    file.flush()
+
+
+def load(file):
+    """
+    Read a value from a file-like object.
+
+    :returns: the decoded value
+    :raises: EOFError if the stream ended
+    """
+    header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise EOFError('connection closed')
+    (size,) = HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f'message of {size} bytes exceeds size limit')
+    data = file.read(size)
+    if len(data) < size:
+        raise EOFError('connection closed')
+    return loads(data)
+
+
+def dump_any_with_slots(value, transform=None):
+    slots = value.__slots__
+    obj = {TYPE_KEY: fullname(type(value))}
+    for slot in slots:
+        member = getattr(value, slot)
+        if isinstance(member, enum.Enum):
+            # enums would be serialized as plain integers otherwise
+            member = dump_any_enum(member)
+        obj[transform(slot) if transform else slot] = member
+    return obj
+
+
+def load_any_with_slots(obj, type_):
+    del obj[TYPE_KEY]
+    return type_(**obj)
+
+
+def dump_any_enum(value):
+    return {TYPE_KEY: fullname(type(value)), 'value': value.value}
+
+
+def load_any_enum(obj, enum_):
+    return enum_(obj['value'])
+
+
+def _strip_underscore(slot):
+    return slot.lstrip('_')
+
+
+def dump_duration(value):
+    return {TYPE_KEY: fullname(type(value)), 'nanoseconds': value.nanoseconds}
+
+
+def load_duration(obj):
+    return rclpy.duration.Duration(nanoseconds=obj['nanoseconds'])
+
+
+dispatch[rclpy.duration.Duration] = dump_duration
+loaders[fullname(rclpy.duration.Duration)] = load_duration
+
+
+def dump_type_hash(value):
+    return {
+        TYPE_KEY: fullname(type(value)),
+        'version': value.version,
+        'value': value.value.hex(),
+    }
+
+
+def load_type_hash(obj):
+    return rclpy.type_hash.TypeHash(
+        version=obj['version'], value=bytes.fromhex(obj['value']))
+
+
+dispatch[rclpy.type_hash.TypeHash] = dump_type_hash
+loaders[fullname(rclpy.type_hash.TypeHash)] = load_type_hash
+
+for slotted_type in (
+    rclpy.qos.QoSProfile,
+    rclpy.topic_endpoint_info.TopicEndpointInfo,
+):
+    dispatch[slotted_type] = functools.partial(
+        dump_any_with_slots, transform=_strip_underscore)
+    loaders[fullname(slotted_type)] = functools.partial(
+        load_any_with_slots, type_=slotted_type)
+
+# enums are dumped as part of the slotted types above
+for enum_type in (
+    rclpy.qos.HistoryPolicy,
+    rclpy.qos.ReliabilityPolicy,
+    rclpy.qos.DurabilityPolicy,
+    rclpy.qos.LivelinessPolicy,
+    rclpy.topic_endpoint_info.TopicEndpointTypeEnum,
+):
+    loaders[fullname(enum_type)] = functools.partial(
+        load_any_enum, enum_=enum_type)
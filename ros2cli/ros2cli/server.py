@@ -0,0 +1,461 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resident server executing ``ros2`` commands on behalf of thin clients.
+
+The server is a daemon process which imports all ``ros2cli`` extensions once.
+For every request it forks a worker which adopts the client's ``argv``,
+environment, working directory and standard streams (passed as file
+descriptors over a Unix domain socket) and runs ``ros2cli.cli.main``.
+Workers never share any ROS context with the server or with each other, so
+every command behaves as if it had been invoked in a fresh interpreter, minus
+the startup cost.
+
+The server is opt-in: set the ``ROS2CLI_SERVER`` environment variable to
+``1`` to route ``ros2`` invocations through it.
+"""
+
+import errno
+import functools
+import hashlib
+import json
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+from ros2cli.helpers import get_runtime_dir
+
+SERVER_ENV_VAR = 'ROS2CLI_SERVER'
+
+DEFAULT_TIMEOUT = 30 * 60
+
+_HEADER = struct.Struct('!I')
+
+_FORWARDED_SIGNALS = ('SIGINT', 'SIGTERM', 'SIGHUP')
+
+# set in the server process and inherited by its workers
+_serving = False
+
+
+def is_server_supported():
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket, 'send_fds') and \
+        hasattr(os, 'fork')
+
+
+def is_server_requested():
+    """Check if ``ros2`` invocations should be executed by the server."""
+    if _serving or not is_server_supported():
+        return False
+    return os.environ.get(SERVER_ENV_VAR, '').lower() in ('1', 'on', 'true', 'yes')
+
+
+def get_server_path():
+    """
+    Get the path of the server socket.
+
+    Servers are keyed by interpreter and import paths, such that a server
+    never executes code from a different environment than its clients.
+    The directory of the invoked script (``sys.path[0]``) is ignored.
+    """
+    key = '\0'.join([
+        sys.executable, os.environ.get('AMENT_PREFIX_PATH', ''), *sys.path[1:]])
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(get_runtime_dir(), f'ros2cli-server-{os.getuid()}-{digest}.sock')
+
+
+def _send_message(sock, message, fds=()):
+    data = json.dumps(message).encode()
+    data = _HEADER.pack(len(data)) + data
+    if fds:
+        sent = socket.send_fds(sock, [data], fds)
+        data = data[sent:]
+    sock.sendall(data)
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def _recv_message(sock, *, maxfds=0):
+    """
+    Receive a message and the file descriptors attached to it.
+
+    :returns: a tuple with the message and list of file descriptors,
+      the message is ``None`` if the peer closed the connection
+    """
+    fds = []
+    if maxfds:
+        header, fds, _, _ = socket.recv_fds(sock, _HEADER.size, maxfds)
+        if header and len(header) < _HEADER.size:
+            rest = _recv_exactly(sock, _HEADER.size - len(header))
+            header = header + rest if rest is not None else None
+    else:
+        header = _recv_exactly(sock, _HEADER.size)
+    if not header:
+        return None, fds
+    data = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if data is None:
+        return None, fds
+    return json.loads(data.decode()), fds
+
+
+def _connect():
+    """
+    Connect to the server, if it's running.
+
+    The environment, working directory and standard streams of clients are
+    handed over to the server, so it must be trusted: its socket must be in
+    the private runtime directory of the current user (see
+    `ros2cli.helpers.get_runtime_dir()`), and its peer must be run by the
+    current user too, where that can be told.
+
+    :return: the connected socket, or `None` if the server can't be reached
+      or trusted, in which case commands must be executed locally.
+    """
+    if not is_server_supported():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(get_server_path())
+        if not _is_same_user(sock):
+            raise PermissionError(errno.EACCES, 'The ros2 server is run by another user')
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def is_server_running():
+    sock = _connect()
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+def _bind(sock, path):
+    # only the current user may connect to the server
+    umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(umask)
+
+
+def spawn_server(*, timeout=None, debug=False):
+    """
+    Spawn the server if it's not running.
+
+    Like ``ros2cli.node.daemon.spawn_daemon``, the listening socket is bound
+    in the calling process and handed over to the server process.
+
+    :param timeout: optional duration, in seconds, to wait
+      until the server is ready.
+    :param debug: if `True`, the server process will output
+      to the current `stdout` and `stderr` streams.
+    :return: `True` if the the server was spawned,
+      `False` if it was already running.
+    """
+    from ros2cli.daemon.daemonize import daemonize
+
+    path = get_server_path()
+    server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            _bind(server_socket, path)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE or is_server_running():
+                raise
+            # remove the socket of a server which didn't shut down cleanly
+            os.unlink(path)
+            _bind(server_socket, path)
+    except OSError as e:
+        server_socket.close()
+        if e.errno == errno.EADDRINUSE:
+            return False
+        raise
+    server_socket.listen()
+    server_socket.set_inheritable(True)
+
+    try:
+        daemonize(
+            functools.partial(serve, server_socket),
+            tags={'name': 'ros2-server'}, timeout=timeout, debug=debug)
+    finally:
+        server_socket.close()
+    return True
+
+
+def shutdown_server():
+    """
+    Shut down the server if it's running.
+
+    :return: `True` if the server was shut down,
+      `False` if it was not running.
+    """
+    sock = _connect()
+    if sock is None:
+        return False
+    with sock:
+        try:
+            _send_message(sock, {'shutdown': True})
+            _recv_message(sock)
+        except OSError:
+            return False
+    return True
+
+
+def run_on_server(argv):
+    """
+    Run a ``ros2`` command on the server.
+
+    If the server is not running it is spawned in the background and the
+    command has to be executed locally this one time.
+
+    :param list argv: the command line arguments
+    :returns: the exit code of the command,
+      ``None`` if the command must be executed locally
+    """
+    for fd in (0, 1, 2):
+        try:
+            os.fstat(fd)
+        except OSError:
+            # can't hand over closed standard streams
+            return None
+
+    sock = _connect()
+    if sock is None:
+        try:
+            spawn_server()
+        except (OSError, RuntimeError):
+            pass
+        return None
+
+    with sock:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        request = {'argv': argv, 'env': dict(os.environ), 'cwd': os.getcwd()}
+        try:
+            _send_message(sock, request, fds=[0, 1, 2])
+            reply, _ = _recv_message(sock)
+        except OSError:
+            reply = None
+        if reply is None:
+            return None
+
+        pid = reply['pid']
+
+        def forward_signal(signum, frame):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+        handlers = {}
+        for name in _FORWARDED_SIGNALS:
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                handlers[signum] = signal.signal(signum, forward_signal)
+        try:
+            reply, _ = _recv_message(sock)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    if reply is None:
+        return 'Lost connection to the ros2 server'
+    returncode = reply['returncode']
+    if returncode < 0:
+        # terminate the same way the command did
+        signal.signal(-returncode, signal.SIG_DFL)
+        os.kill(os.getpid(), -returncode)
+        return 128 - returncode
+    return returncode
+
+
+def _exit_code(rc):
+    if rc is None:
+        return 0
+    if isinstance(rc, int):
+        return rc
+    print(rc, file=sys.stderr)
+    return 1
+
+
+def _run_command(request, fds):
+    """Run a command in a worker process, this function never returns."""
+    rc = 1
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        sys.stdin = open(0, 'r', closefd=False)
+        sys.stdout = open(1, 'w', buffering=1 if os.isatty(1) else -1, closefd=False)
+        sys.stderr = open(2, 'w', buffering=1, closefd=False, errors='backslashreplace')
+
+        os.chdir(request['cwd'])
+        os.environ.clear()
+        os.environ.update(request['env'])
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        # re-validate the entry point index in case packages have been installed
+        import ros2cli.entry_points
+        ros2cli.entry_points._distribution_index = None
+
+        from ros2cli.cli import main
+        sys.argv = ['ros2', *request['argv']]
+        try:
+            rc = _exit_code(main(argv=request['argv']))
+        except SystemExit as e:
+            rc = _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(rc)
+
+
+def _supervise(conn, request, fds):
+    """Run the requested command in a worker and report its exit status."""
+    # the worker holds the write end of the pipe until it exits
+    exit_fd, worker_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        os.close(exit_fd)
+        _run_command(request, fds)
+    os.close(worker_fd)
+    for fd in fds:
+        os.close(fd)
+
+    try:
+        _send_message(conn, {'pid': pid})
+        client_gone = False
+        while True:
+            readable, _, _ = select.select(
+                [exit_fd] if client_gone else [exit_fd, conn], [], [])
+            if exit_fd in readable:
+                break
+            if not conn.recv(1):
+                # the client is gone, stop the command as well
+                client_gone = True
+                os.kill(pid, signal.SIGTERM)
+        _, status = os.waitpid(pid, 0)
+        _send_message(conn, {'returncode': os.waitstatus_to_exitcode(status)})
+    except OSError:
+        pass
+    return 0
+
+
+def _is_same_user(conn):
+    """Check whether the peer of a Unix domain socket is run by the current user."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        # rely on the permissions of the socket file and its directory
+        return True
+    creds = conn.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', creds)
+    return uid == os.getuid()
+
+
+def _preload_extensions():
+    from ros2cli.entry_points import get_all_entry_points
+
+    for group in get_all_entry_points().values():
+        for _, entry_point in group.values():
+            try:
+                entry_point.load()
+            except Exception as e:
+                print(f"Failed to preload entry point '{entry_point.name}': {e}")
+
+
+def _close_server_socket(server_socket, path):
+    server_socket.close()
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def serve(server_socket, *, timeout=DEFAULT_TIMEOUT):
+    """
+    Serve ``ros2`` commands on the given listening Unix domain socket.
+
+    :param server_socket: a bound and listening socket
+    :param timeout: how long to wait before shutting
+      down the server due to inactivity.
+    """
+    global _serving
+    _serving = True
+
+    path = server_socket.getsockname()
+    _preload_extensions()
+
+    # supervisor processes are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    server_socket.settimeout(timeout)
+    print('Serving ros2 commands on ' + path)
+    try:
+        while True:
+            try:
+                conn, _ = server_socket.accept()
+            except socket.timeout:
+                print('Shutdown due to timeout')
+                break
+            with conn:
+                if not _is_same_user(conn):
+                    continue
+                try:
+                    request, fds = _recv_message(conn, maxfds=3)
+                except (OSError, ValueError):
+                    continue
+                if request is None:
+                    pass
+                elif request.get('shutdown'):
+                    print('Remote shutdown requested')
+                    # stop accepting connections before acknowledging
+                    _close_server_socket(server_socket, path)
+                    _send_message(conn, {})
+                    break
+                elif len(fds) == 3:
+                    pid = os.fork()
+                    if pid == 0:
+                        server_socket.close()
+                        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                        rc = 1
+                        try:
+                            rc = _supervise(conn, request, fds)
+                        finally:
+                            os._exit(rc)
+                for fd in fds:
+                    os.close(fd)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _close_server_socket(server_socket, path)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from ros2cli.node.daemon import spawn_daemon
+from ros2cli.node.daemon import spawn_multi_domain_daemon
 from ros2cli.verb.daemon import VerbExtension
 
 
@@ -23,9 +24,17 @@ class StartVerb(VerbExtension):
         parser.add_argument(
             '--debug', '-d', action='store_true',
             help='Print debug messages')
+        parser.add_argument(
+            '--multi-domain', action='store_true',
+            help='Start a daemon serving all ROS domains, instead of '
+                 'one for the current domain only')
 
     def main(self, *, args):
-        if spawn_daemon(args, timeout=10.0, debug=args.debug):
+        if args.multi_domain:
+            spawned = spawn_multi_domain_daemon(timeout=10.0, debug=args.debug)
+        else:
+            spawned = spawn_daemon(args, timeout=10.0, debug=args.debug)
+        if spawned:
             print('The daemon has been started')
         else:
             print('The daemon is already running')
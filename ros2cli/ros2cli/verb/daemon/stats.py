@@ -0,0 +1,98 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ros2cli.daemon.stats import estimate_percentile
+from ros2cli.node.daemon import DaemonNode
+from ros2cli.verb.daemon import VerbExtension
+
+COLUMNS = (
+    ('METHOD', '<40'), ('CALLS', '>8'), ('ERRORS', '>6'),
+    ('CALL MEAN', '>10'), ('CALL P99', '>10'), ('CALL MAX', '>10'),
+    ('MARSHAL MEAN', '>12'), ('MARSHAL P99', '>12'),
+    ('RESPONSE MEAN', '>13'), ('RESPONSE MAX', '>13'),
+)
+
+
+def format_duration(value):
+    if value is None:
+        return '-'
+    return f'{value * 1e3:.3f}ms'
+
+
+def format_size(value):
+    if value is None:
+        return '-'
+    if value < 1024:
+        return f'{value:.0f}B'
+    for unit in ('KiB', 'MiB', 'GiB'):
+        value /= 1024
+        if value < 1024:
+            break
+    return f'{value:.1f}{unit}'
+
+
+def get_mean(histogram):
+    if not histogram['count']:
+        return None
+    return histogram['sum'] / histogram['count']
+
+
+def get_total_time(method_stats):
+    return method_stats['call_time']['sum'] + method_stats['marshalling_time']['sum']
+
+
+class StatsVerb(VerbExtension):
+    """Output statistics of the requests served by the daemon."""
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            '--sort-by', choices=('time', 'calls', 'size'), default='time',
+            help='Sort methods by total time spent serving them, number of calls, '
+                 'or total size of responses')
+
+    def main(self, *, args):
+        with DaemonNode(args) as node:
+            if not node.connected:
+                return 'The daemon is not running'
+            try:
+                stats = node.system.stats()
+            except Exception as e:
+                return f'Failed to get statistics from the daemon: {e}'
+
+        sort_keys = {
+            'time': get_total_time,
+            'calls': lambda method_stats: method_stats['calls'],
+            'size': lambda method_stats: method_stats['response_size']['sum'],
+        }
+        methods = sorted(
+            stats['methods'].items(),
+            key=lambda item: sort_keys[args.sort_by](item[1]), reverse=True)
+
+        print(f"Uptime: {stats['uptime']:.1f}s")
+        print(' '.join(format(title, spec) for title, spec in COLUMNS))
+        for method, method_stats in methods:
+            call_time = method_stats['call_time']
+            marshalling_time = method_stats['marshalling_time']
+            response_size = method_stats['response_size']
+            values = (
+                method, str(method_stats['calls']), str(method_stats['errors']),
+                format_duration(get_mean(call_time)),
+                format_duration(estimate_percentile(call_time, 0.99)),
+                format_duration(call_time['max']),
+                format_duration(get_mean(marshalling_time)),
+                format_duration(estimate_percentile(marshalling_time, 0.99)),
+                format_size(get_mean(response_size)),
+                format_size(response_size['max']),
+            )
+            print(' '.join(format(value, spec) for value, (_, spec) in zip(values, COLUMNS)))
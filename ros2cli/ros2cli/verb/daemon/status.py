@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from ros2cli.node.daemon import is_daemon_running
+from ros2cli.server import is_server_running
 from ros2cli.verb.daemon import VerbExtension
 
 
@@ -24,3 +25,5 @@ class StatusVerb(VerbExtension):
             print('The daemon is running')
         else:
             print('The daemon is not running')
+        if is_server_running():
+            print('The command server is running')
@@ -13,14 +13,28 @@
 # limitations under the License.
 
 from ros2cli.node.daemon import shutdown_daemon
+from ros2cli.node.daemon import shutdown_multi_domain_daemon
+from ros2cli.server import shutdown_server
 from ros2cli.verb.daemon import VerbExtension
 
 
 class StopVerb(VerbExtension):
     """Stop the daemon if it is running."""
 
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            '--multi-domain', action='store_true',
+            help='Stop the daemon serving all ROS domains, instead of '
+                 'the one for the current domain')
+
     def main(self, *, args):
-        if shutdown_daemon(args, timeout=10.0):
+        if args.multi_domain:
+            stopped = shutdown_multi_domain_daemon(timeout=10.0)
+        else:
+            stopped = shutdown_daemon(args, timeout=10.0)
+        if stopped:
             print('The daemon has been stopped')
         else:
             print('The daemon is not running')
+        if shutdown_server():
+            print('The command server has been stopped')
@@ -0,0 +1,139 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import time
+
+from rclpy.node import HIDDEN_NODE_PREFIX
+from rclpy.topic_or_service_is_hidden import topic_or_service_is_hidden
+
+from ros2cli.daemon.graph_watch import MAX_WATCH_TIMEOUT
+from ros2cli.daemon.graph_watch import THROTTLED_WATCH_PERIOD
+from ros2cli.helpers import wait_for
+from ros2cli.node.daemon import DaemonNode
+from ros2cli.node.daemon import is_daemon_running
+from ros2cli.node.daemon import spawn_daemon
+from ros2cli.verb.daemon import VerbExtension
+
+# how long, in seconds, to wait for the daemon to come back
+# after the connection to it was lost, e.g. while it restarts
+RECONNECT_TIMEOUT = 5.0
+
+
+def is_hidden_event(event):
+    if event['node'].rsplit('/', 1)[-1].startswith(HIDDEN_NODE_PREFIX):
+        return True
+    return 'topic' in event and topic_or_service_is_hidden(event['topic'])
+
+
+def get_event_key(event):
+    return tuple(
+        (key, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+        for key, value in sorted(event.items()) if key != 'event')
+
+
+def format_event(event):
+    sign = '+' if event['event'] == 'added' else '-'
+    if event['kind'] == 'node':
+        return f"{sign} node {event['node']}"
+    qos = event['qos']
+    history = qos['history'].lower()
+    if history == 'keep_last':
+        history += f"({qos['depth']})"
+    qos_summary = ', '.join([
+        qos['reliability'].lower(), qos['durability'].lower(),
+        history, qos['liveliness'].lower()])
+    return (
+        f"{sign} {event['kind']} {event['topic']} [{event['type']}] "
+        f"{event['node']} ({qos_summary})")
+
+
+def is_daemon_back(args):
+    try:
+        return is_daemon_running(args)
+    except OSError:
+        # e.g. the daemon is (re)starting
+        return False
+
+
+def watch_graph(node, graph):
+    """
+    Watch the graph through the daemon.
+
+    :param node: a connected `DaemonNode`.
+    :param graph: the graph as seen so far, a dict of added events keyed by
+      `get_event_key()`, updated as changes are received.  Only actual
+      changes are reported when the daemon sends the whole graph again,
+      e.g. after a restart.
+    :return: a generator of lists of change events.
+    """
+    sequence = 0
+    epoch = None
+    while True:
+        result = node.get_graph_changes(sequence, MAX_WATCH_TIMEOUT, epoch)
+        changes = result['changes']
+        if result['reset']:
+            new_graph = {get_event_key(event): event for event in changes}
+            changes = [
+                {**event, 'event': 'removed'} for key, event in graph.items()
+                if key not in new_graph
+            ] + [
+                event for key, event in new_graph.items() if key not in graph
+            ]
+        for event in changes:
+            key = get_event_key(event)
+            if event['event'] == 'added':
+                graph[key] = event
+            else:
+                graph.pop(key, None)
+        sequence = result['sequence']
+        epoch = result['epoch']
+        yield changes
+        if result['throttled']:
+            time.sleep(THROTTLED_WATCH_PERIOD)
+
+
+class WatchVerb(VerbExtension):
+    """Output changes to the ROS graph as they happen."""
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument(
+            '-a', '--all', action='store_true',
+            help='Output changes to hidden nodes and topics as well')
+
+    def main(self, *, args):
+        spawn_daemon(args, timeout=10.0)
+        graph = {}
+        try:
+            while True:
+                with DaemonNode(args) as node:
+                    if not node.connected:
+                        return 'The daemon is not running'
+                    if 'get_graph_changes' not in node.methods:
+                        return 'The daemon does not support watching the graph'
+                    watching = False
+                    try:
+                        for changes in watch_graph(node, graph):
+                            watching = True
+                            for event in changes:
+                                if args.all or not is_hidden_event(event):
+                                    print(format_event(event), flush=True)
+                    except OSError as e:
+                        if not watching:
+                            return f'Failed to watch the graph: {e}'
+                # the connection was lost, e.g. as the daemon restarted
+                if not wait_for(functools.partial(is_daemon_back, args), RECONNECT_TIMEOUT):
+                    return 'Lost connection to the daemon'
+        except KeyboardInterrupt:
+            pass
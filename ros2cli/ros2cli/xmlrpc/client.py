@@ -12,12 +12,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from http.client import HTTPConnection
+import socket
 # Alias xmlrpc.client module objects to ensure client code uses ros2cli.xmlrpc
 from xmlrpc.client import ProtocolError
 from xmlrpc.client import ServerProxy
+from xmlrpc.client import Transport
 
 
 __all__ = [
     'ProtocolError',
-    'ServerProxy'
+    'ServerProxy',
+    'UnixStreamTransport'
 ]
+
+
+class UnixStreamHTTPConnection(HTTPConnection):
+
+    def __init__(self, path, host='localhost', **kwargs):
+        super().__init__(host, **kwargs)
+        self.socket_path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class UnixStreamTransport(Transport):
+    """A `Transport` for XML-RPC servers listening on a Unix domain socket."""
+
+    def __init__(self, path, **kwargs):
+        """
+        Construct a UnixStreamTransport.
+
+        :param path: path to the server socket.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+
+    def make_connection(self, host):
+        # reuse the connection like Transport does
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        self._connection = host, UnixStreamHTTPConnection(self.path)
+        return self._connection[1]
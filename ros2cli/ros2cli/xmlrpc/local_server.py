@@ -12,28 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import errno
+import os
 import socket
+from socketserver import UnixStreamServer
 import struct
 # Import SimpleXMLRPCRequestHandler to re-export it.
 from xmlrpc.server import SimpleXMLRPCRequestHandler  # noqa
 from xmlrpc.server import SimpleXMLRPCServer
 
-import psutil
+from ros2cli.network_interfaces import get_interface_address_cache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
 
 
 def get_local_ipaddrs():
-    return [
-        addr.address
-        for _, addrs in psutil.net_if_addrs().items()
-        for addr in addrs
-        if addr.family == socket.AF_INET
-    ]
+    return get_interface_address_cache().get_ipv4_addresses()
 
 
 class LocalXMLRPCServer(SimpleXMLRPCServer):
 
     allow_reuse_address = False
 
+    # set to stop serving connections that are kept alive
+    closing = False
+
+    # optionally set to record requests, see `ros2cli.daemon.stats.DaemonStats`
+    request_stats = None
+
     def server_bind(self):
         # Prevent listening socket from lingering in TIME_WAIT state after close()
         self.socket.setsockopt(
@@ -51,3 +60,131 @@ class LocalXMLRPCServer(SimpleXMLRPCServer):
         if client_address[0] not in get_local_ipaddrs():
             return False
         return super(LocalXMLRPCServer, self).verify_request(request, client_address)
+
+    def _marshaled_dispatch(self, data, dispatch_method=None, path=None):
+        if self.request_stats is None:
+            return super()._marshaled_dispatch(data, dispatch_method, path)
+        request = self.request_stats.start_request()
+        response = super()._marshaled_dispatch(data, dispatch_method, path)
+        request.finish(len(response))
+        return response
+
+    def _dispatch(self, method, params):
+        if self.request_stats is not None:
+            # the first method dispatched is the one requested, others
+            # are dispatched as part of a system.multicall request
+            self.request_stats.set_request_method(method)
+        return super()._dispatch(method, params)
+
+
+class UnixXMLRPCRequestHandler(SimpleXMLRPCRequestHandler):
+
+    # Nagle's algorithm only applies to TCP
+    disable_nagle_algorithm = False
+
+    def address_string(self):
+        # peers of Unix domain sockets are usually unnamed
+        return self.client_address or 'local'
+
+
+class LocalUnixXMLRPCServer(LocalXMLRPCServer):
+    """
+    An XML-RPC server listening on a Unix domain socket.
+
+    Only the current user may connect to the server, as enforced by the
+    permissions of the socket file, so no address checks are needed.
+    A socket file left behind by a server which didn't shut down cleanly
+    is replaced.  Servers starting concurrently on the same path are
+    serialized by a lock file next to the socket file, from binding the
+    socket until listening on it, such that only one of them takes over.
+    """
+
+    address_family = socket.AF_UNIX
+
+    def __init__(self, path, requestHandler=UnixXMLRPCRequestHandler, *args, **kwargs):
+        self._lock_fd = None
+        self._is_bound = False
+        super().__init__(path, requestHandler, *args, **kwargs)
+
+    def _lock(self):
+        if fcntl is None:
+            return
+        fd = os.open(self.server_address + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError:
+            os.close(fd)
+            raise
+        self._lock_fd = fd
+
+    def _unlock(self):
+        if self._lock_fd is None:
+            return
+        # closing the file releases the lock, the file itself is left
+        # in place as other servers may be waiting on it already
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+    def _bind(self):
+        # only the current user may connect to the server
+        umask = os.umask(0o177)
+        try:
+            UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(umask)
+
+    def server_bind(self):
+        # released once listening, see server_activate()
+        self._lock()
+        try:
+            try:
+                self._bind()
+            except OSError as e:
+                if e.errno != errno.EADDRINUSE or self._is_path_in_use():
+                    raise
+                try:
+                    os.unlink(self.server_address)
+                except FileNotFoundError:
+                    pass
+                self._bind()
+            self._is_bound = True
+        except BaseException:
+            self._unlock()
+            raise
+
+    def server_activate(self):
+        try:
+            super().server_activate()
+        finally:
+            self._unlock()
+
+    def _is_path_in_use(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.server_address)
+        except OSError as e:
+            # nobody is listening, or the socket file is gone already
+            if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+                return False
+            raise
+        finally:
+            sock.close()
+        return True
+
+    def get_request(self):
+        return UnixStreamServer.get_request(self)
+
+    def verify_request(self, request, client_address):
+        return True
+
+    def server_close(self):
+        self._unlock()
+        # the path belongs to another server if binding it failed
+        if self._is_bound:
+            # unlink first, such that the path is never taken over by another
+            # server in between (see server_bind())
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+        super().server_close()
@@ -54,8 +54,10 @@ commands and verbs.""",
         ],
         'ros2cli.daemon.verb': [
             'start = ros2cli.verb.daemon.start:StartVerb',
+            'stats = ros2cli.verb.daemon.stats:StatsVerb',
             'status = ros2cli.verb.daemon.status:StatusVerb',
             'stop = ros2cli.verb.daemon.stop:StopVerb',
+            'watch = ros2cli.verb.daemon.watch:WatchVerb',
         ],
         'console_scripts': [
             'ros2 = ros2cli.cli:main',
@@ -0,0 +1,88 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure how long the ros2 CLI takes to print help for each command and verb.
+
+Each ``ros2 <command> [<verb>] --help`` invocation is timed in a new
+interpreter, first with cold caches, i.e. an empty ``ROS_HOME``, and then
+with the entry point and extension spec caches warmed up.
+Run as a script, e.g.::
+
+    python3 benchmark_cli_startup.py --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from ros2cli.entry_points import get_all_entry_points
+from ros2cli.entry_points import get_entry_points
+
+MAIN = 'import sys; from ros2cli.cli import main; sys.exit(main())'
+
+
+def get_invocations():
+    invocations = [[]]
+    group_names = get_all_entry_points().keys()
+    for command in sorted(get_entry_points('ros2cli.command')):
+        invocations.append([command])
+        # e.g. ros2topic.verb, or ros2cli.daemon.verb
+        for group_name in group_names:
+            if group_name.endswith(f'{command}.verb'):
+                for verb in sorted(get_entry_points(group_name)):
+                    invocations.append([command, verb])
+    return invocations
+
+
+def run(argv, env):
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', MAIN, *argv, '--help'], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--runs', type=int, default=3,
+        help='number of warm runs of each invocation (default: 3)')
+    args = parser.parse_args()
+
+    invocations = get_invocations()
+    cold_durations = []
+    warm_durations = []
+    print(f'{"invocation":40} {"cold (ms)":>10} {"warm (ms)":>10}')
+    for argv in invocations:
+        with tempfile.TemporaryDirectory() as ros_home:
+            env = dict(os.environ, ROS_HOME=ros_home)
+            cold_duration = run(argv, env)
+            warm_duration = statistics.median(run(argv, env) for _ in range(args.runs))
+        cold_durations.append(cold_duration)
+        warm_durations.append(warm_duration)
+        name = ' '.join(['ros2', *argv])
+        print(f'{name:40} {cold_duration * 1e3:10.1f} {warm_duration * 1e3:10.1f}')
+    print(
+        f'{len(invocations)} invocations, median cold: '
+        f'{statistics.median(cold_durations) * 1e3:.1f} ms, median warm: '
+        f'{statistics.median(warm_durations) * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
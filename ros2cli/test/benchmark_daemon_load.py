@@ -0,0 +1,89 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load test the ros2cli daemon with many concurrent clients.
+
+Every client is a separate process with its own `DaemonNode`, which issues
+a number of graph queries and records their latencies.
+The daemon is spawned if it is not running already.
+Run as a script, e.g.::
+
+    python3 benchmark_daemon_load.py --clients 200 --calls 20
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import statistics
+import time
+
+from ros2cli.node.daemon import DaemonNode
+from ros2cli.node.daemon import is_daemon_running
+from ros2cli.node.daemon import spawn_daemon
+
+QUERIES = {
+    'get_node_names_and_namespaces': (),
+    'get_topic_names_and_types': (),
+    'get_service_names_and_types': (),
+    'get_publishers_info_by_topic': ('/rosout',),
+}
+
+
+def run_client(query, num_calls):
+    latencies = []
+    with DaemonNode(args=[]) as node:
+        if not node.connected:
+            raise RuntimeError('failed to connect to the daemon')
+        for _ in range(num_calls):
+            start = time.perf_counter()
+            getattr(node, query)(*QUERIES[query])
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--clients', type=int, default=100,
+        help='number of concurrent clients (default: 100)')
+    parser.add_argument(
+        '--calls', type=int, default=10,
+        help='number of queries issued by each client (default: 10)')
+    parser.add_argument(
+        '--query', choices=sorted(QUERIES), default='get_topic_names_and_types',
+        help='graph query issued by clients (default: get_topic_names_and_types)')
+    args = parser.parse_args()
+
+    if not is_daemon_running(args=[]):
+        spawn_daemon(args=[], timeout=10.0)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.clients) as executor:
+        futures = [
+            executor.submit(run_client, args.query, args.calls)
+            for _ in range(args.clients)
+        ]
+        latencies = [latency for future in futures for latency in future.result()]
+    duration = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f'{len(latencies)} queries from {args.clients} clients in {duration:.2f} s')
+    print(f'p50: {percentiles[49] * 1e3:.2f} ms')
+    print(f'p90: {percentiles[89] * 1e3:.2f} ms')
+    print(f'p99: {percentiles[98] * 1e3:.2f} ms')
+    print(f'max: {max(latencies) * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure how long it takes to spawn the ros2cli daemon.
+
+The daemon is repeatedly spawned, either forked from this process or
+started as a new interpreter, and timed until it answers its first query.
+The duration of each phase of the spawn is printed as well.
+A running daemon is shut down first.
+Run as a script, e.g.::
+
+    python3 benchmark_daemon_spawn.py --runs 5
+"""
+
+import argparse
+import statistics
+import time
+
+from ros2cli.node.daemon import DaemonNode
+from ros2cli.node.daemon import is_daemon_running
+from ros2cli.node.daemon import shutdown_daemon
+from ros2cli.node.daemon import spawn_daemon
+
+
+def time_spawn(fork):
+    start = time.perf_counter()
+    if not spawn_daemon(args=[], timeout=10.0, debug=True, fork=fork):
+        raise RuntimeError('the daemon is running already')
+    spawned = time.perf_counter()
+    with DaemonNode(args=[]) as node:
+        while not node.connected:
+            time.sleep(0.001)
+        node.get_node_names_and_namespaces()
+    answered = time.perf_counter()
+    shutdown_daemon(args=[], timeout=10.0)
+    return spawned - start, answered - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--runs', type=int, default=5,
+        help='number of times the daemon is spawned in each mode (default: 5)')
+    args = parser.parse_args()
+
+    if is_daemon_running(args=[]):
+        shutdown_daemon(args=[], timeout=10.0)
+
+    for fork in (False, True):
+        results = [time_spawn(fork) for _ in range(args.runs)]
+        spawn_durations, answer_durations = zip(*results)
+        mode = 'fork' if fork else 'interpreter'
+        print(f'{mode}: spawned in {statistics.median(spawn_durations) * 1e3:.1f} ms, '
+              f'first answer after {statistics.median(answer_durations) * 1e3:.1f} ms '
+              f'(median of {args.runs})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the per request overhead of network interface checks in the daemon.
+
+Before serving a request, the daemon checks whether network interfaces
+changed (`NetworkAwareNode`) and, for XML-RPC, whether the client address is
+local (`LocalXMLRPCServer.verify_request`).
+Both checks are timed as done by enumerating interfaces every time, and as
+done with the shared `InterfaceAddressCache`.
+Optionally, dummy interfaces are created (requires root on Linux) to mimic
+hosts with many virtual interfaces.
+Run as a script, e.g.::
+
+    python3 benchmark_network_interfaces.py --iterations 1000
+"""
+
+import argparse
+import socket
+import subprocess
+import time
+
+import psutil
+
+from ros2cli.network_interfaces import InterfaceAddressCache
+
+
+def uncached_check(addresses_at_start):
+    # what was done for every request before addresses were cached
+    addresses_changed = psutil.net_if_addrs() != addresses_at_start
+    local_ipaddrs = [
+        addr.address
+        for _, addrs in psutil.net_if_addrs().items()
+        for addr in addrs
+        if addr.family == socket.AF_INET
+    ]
+    return addresses_changed, '127.0.0.1' in local_ipaddrs
+
+
+def cached_check(cache, fingerprint_at_start):
+    addresses_changed = cache.get_fingerprint() != fingerprint_at_start
+    return addresses_changed, '127.0.0.1' in cache.get_ipv4_addresses()
+
+
+def time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--iterations', type=int, default=1000,
+        help='number of checks to time (default: 1000)')
+    parser.add_argument(
+        '--dummy-interfaces', type=int, default=0,
+        help='number of dummy interfaces to create for the duration '
+             'of the benchmark (default: 0)')
+    args = parser.parse_args()
+
+    dummy_interfaces = [f'r2cbench{i}' for i in range(args.dummy_interfaces)]
+    try:
+        for i, name in enumerate(dummy_interfaces):
+            subprocess.run(['ip', 'link', 'add', name, 'type', 'dummy'], check=True)
+            subprocess.run([
+                'ip', 'addr', 'add', f'10.{i // 250}.{i % 250}.1/24', 'dev', name
+            ], check=True)
+
+        print(f'{len(psutil.net_if_addrs())} network interfaces')
+        addresses_at_start = psutil.net_if_addrs()
+        uncached = time_per_call(
+            lambda: uncached_check(addresses_at_start), args.iterations)
+        print(f'uncached: {uncached * 1e6:.1f} us per request')
+
+        cache = InterfaceAddressCache()
+        try:
+            fingerprint_at_start = cache.get_fingerprint()
+            cached = time_per_call(
+                lambda: cached_check(cache, fingerprint_at_start), args.iterations)
+        finally:
+            cache.close()
+        print(f'cached: {cached * 1e6:.1f} us per request ({uncached / cached:.0f}x)')
+    finally:
+        for name in dummy_interfaces:
+            subprocess.run(['ip', 'link', 'delete', name], check=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the XML-RPC and the compact RPC daemon transports.
+
+Synthetic graph queries are served by both transports in this process and
+timed end to end, i.e. including (un)marshalling and a loopback round trip.
+Run as a script, e.g.::
+
+    python3 benchmark_rpc_transports.py --topics 2000 --endpoints 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from xmlrpc.client import ServerProxy as XMLRPCServerProxy
+from xmlrpc.server import SimpleXMLRPCServer
+
+import rclpy.qos
+import rclpy.topic_endpoint_info
+
+from ros2cli.rpc.client import ServerProxy as RPCServerProxy
+from ros2cli.rpc.local_server import LocalRPCServer
+import ros2cli.xmlrpc  # noqa: F401
+
+
+def make_graph(num_topics, num_endpoints):
+    topic_names_and_types = [
+        (f'/node_{i}/topic_{i}', ['std_msgs/msg/String']) for i in range(num_topics)
+    ]
+    publishers_info = [
+        rclpy.topic_endpoint_info.TopicEndpointInfo(
+            node_name=f'node_{i}', node_namespace='/', topic_type='std_msgs/msg/String',
+            endpoint_type=rclpy.topic_endpoint_info.TopicEndpointTypeEnum.PUBLISHER,
+            endpoint_gid=list(range(16)), qos_profile=rclpy.qos.QoSProfile(depth=10))
+        for i in range(num_endpoints)
+    ]
+    return topic_names_and_types, publishers_info
+
+
+def serve_in_background(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--topics', type=int, default=2000,
+        help='number of topics in the synthetic graph (default: 2000)')
+    parser.add_argument(
+        '--endpoints', type=int, default=500,
+        help='number of endpoints in a topic info query (default: 500)')
+    parser.add_argument(
+        '--repeat', type=int, default=20,
+        help='number of times each query is timed (default: 20)')
+    args = parser.parse_args()
+
+    topic_names_and_types, publishers_info = make_graph(args.topics, args.endpoints)
+
+    xmlrpc_server = SimpleXMLRPCServer(
+        ('localhost', 0), logRequests=False, allow_none=True)
+    rpc_server = LocalRPCServer(
+        os.path.join(tempfile.mkdtemp(), 'benchmark.sock'))
+    for server in (xmlrpc_server, rpc_server):
+        server.register_function(
+            lambda: topic_names_and_types, 'get_topic_names_and_types')
+        server.register_function(
+            lambda topic_name: publishers_info, 'get_publishers_info_by_topic')
+        serve_in_background(server)
+
+    proxies = {
+        'xmlrpc': XMLRPCServerProxy(
+            'http://localhost:%d/' % xmlrpc_server.server_address[1], allow_none=True),
+        'rpc': RPCServerProxy(rpc_server.server_address),
+    }
+    try:
+        for query, function in (
+            ('get_topic_names_and_types', lambda proxy: proxy.get_topic_names_and_types()),
+            ('get_publishers_info_by_topic',
+             lambda proxy: proxy.get_publishers_info_by_topic('/topic')),
+        ):
+            for name, proxy in proxies.items():
+                best, mean = measure(lambda: function(proxy), args.repeat)
+                print(f'{query:<30} {name:<8} best: {best * 1e3:8.2f} ms '
+                      f'mean: {mean * 1e3:8.2f} ms')
+    finally:
+        for server in (xmlrpc_server, rpc_server):
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+
+import pytest
+
+from ros2cli import entry_points
+from ros2cli.command import add_subparsers_on_demand
+from ros2cli.plugin_system import _extension_instances
+
+COMMANDS_MODULE = '''
+from ros2cli.command import CommandExtension
+
+loaded = True
+
+
+class FooCommand(CommandExtension):
+    """Do foo."""
+
+    def add_arguments(self, parser, cli_name):
+        parser.add_argument('--bar', action='store_true')
+
+
+class QuxCommand(CommandExtension):
+    """Do qux."""
+'''
+
+
+@pytest.fixture
+def commands(tmp_path, monkeypatch):
+    prefix = tmp_path / 'site-packages'
+    dist_path = prefix / 'test_commands-0.1.0.dist-info'
+    dist_path.mkdir(parents=True)
+    (dist_path / 'METADATA').write_text('Name: test_commands\nVersion: 0.1.0\n')
+    (dist_path / 'entry_points.txt').write_text(
+        '[test.command]\n'
+        'foo = test_commands:FooCommand\n'
+        'qux = test_commands:QuxCommand\n')
+    (prefix / 'test_commands.py').write_text(COMMANDS_MODULE)
+    monkeypatch.setenv('ROS_HOME', str(tmp_path / 'ros_home'))
+    monkeypatch.setattr(sys, 'path', [str(prefix)])
+    monkeypatch.setattr(entry_points, '_distribution_index', None)
+    yield
+    sys.modules.pop('test_commands', None)
+    for extension_class in list(_extension_instances):
+        if extension_class.__module__ == 'test_commands':
+            del _extension_instances[extension_class]
+
+
+def make_parser(argv):
+    parser = argparse.ArgumentParser(
+        prog='test', formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_subparsers_on_demand(
+        parser, 'test', '_command', 'test.command', required=False, argv=argv)
+    return parser
+
+
+def test_descriptions_are_cached(commands):
+    help_text = make_parser([]).format_help()
+    assert 'foo  Do foo' in help_text
+    assert 'qux  Do qux' in help_text
+    assert 'test_commands' in sys.modules
+
+    # extensions need not be loaded again to describe them
+    del sys.modules['test_commands']
+    help_text = make_parser([]).format_help()
+    assert 'foo  Do foo' in help_text
+    assert 'test_commands' not in sys.modules
+
+
+def test_selected_extension_is_loaded(commands):
+    make_parser([])
+    del sys.modules['test_commands']
+    parser = make_parser(['foo', '--bar'])
+    args = parser.parse_args(['foo', '--bar'])
+    assert args.bar
+    assert type(args._command).__name__ == 'FooCommand'
@@ -205,6 +205,20 @@ def test_get_action_client_names_and_types_by_node(daemon_node):
     assert [TEST_ACTION_NAME, [TEST_ACTION_TYPE]] in action_names_and_types
 
 
+def test_get_node_graph(daemon_node):
+    node_graph = daemon_node.get_node_graph()
+    endpoints = next(
+        endpoints for name, namespace, endpoints in node_graph
+        if name == TEST_NODE_NAME and namespace == TEST_NODE_NAMESPACE
+    )
+    assert [TEST_TOPIC_NAME, [TEST_TOPIC_TYPE]] in endpoints['publishers']
+    assert [TEST_TOPIC_NAME, [TEST_TOPIC_TYPE]] in endpoints['subscribers']
+    assert [TEST_SERVICE_NAME, [TEST_SERVICE_TYPE]] in endpoints['service_servers']
+    assert [TEST_SERVICE_NAME, [TEST_SERVICE_TYPE]] in endpoints['service_clients']
+    assert [TEST_ACTION_NAME, [TEST_ACTION_TYPE]] in endpoints['action_servers']
+    assert [TEST_ACTION_NAME, [TEST_ACTION_TYPE]] in endpoints['action_clients']
+
+
 def test_get_publishers_info_by_topic(daemon_node):
     publishers_info = daemon_node.get_publishers_info_by_topic(TEST_TOPIC_NAME)
     assert len(publishers_info) == 1
@@ -0,0 +1,99 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import threading
+
+import pytest
+
+import ros2cli.daemon as daemon
+from ros2cli.daemon.multi_domain import MultiDomainRPCServer
+from ros2cli.node import daemon as daemon_node
+from ros2cli.node.daemon import is_multi_domain_daemon_running
+from ros2cli.node.daemon import shutdown_daemon
+from ros2cli.node.daemon import shutdown_multi_domain_daemon
+
+from ros2cli.xmlrpc.local_server import LocalUnixXMLRPCServer
+
+
+def serve(server):
+    closed = threading.Event()
+
+    def close():
+        server.shutdown()
+        server.server_close()
+        closed.set()
+
+    def shutdown_handler():
+        # like the daemons do, stop serving once the request is answered
+        threading.Thread(target=close).start()
+    server.register_introspection_functions()
+    server.register_function(shutdown_handler, 'system.shutdown')
+    threading.Thread(target=server.serve_forever).start()
+    return close, closed
+
+
+@pytest.fixture
+def daemons(tmp_path, monkeypatch):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    xmlrpc_path = os.path.join(str(tmp_path), 'xmlrpc.sock')
+    multi_domain_path = os.path.join(str(tmp_path), 'multi.sock')
+    monkeypatch.setattr(daemon, 'get_xmlrpc_server_path', lambda: xmlrpc_path)
+    monkeypatch.setattr(
+        daemon_node, 'get_multi_domain_server_path', lambda: multi_domain_path)
+    servers = [
+        LocalUnixXMLRPCServer(
+            xmlrpc_path, logRequests=False,
+            requestHandler=daemon.UnixRequestHandler, allow_none=True),
+        MultiDomainRPCServer(multi_domain_path),
+    ]
+    closers = [serve(server) for server in servers]
+    yield servers
+    for close, closed in closers:
+        if not closed.is_set():
+            close()
+        assert closed.wait(5.0)
+
+
+def test_shutdown_daemon_spares_multi_domain_daemon(daemons):
+    assert shutdown_daemon(args=[], timeout=5.0)
+    assert not shutdown_daemon(args=[], timeout=5.0)
+    assert is_multi_domain_daemon_running()
+
+    assert shutdown_multi_domain_daemon(timeout=5.0)
+    assert not is_multi_domain_daemon_running()
+    assert not shutdown_multi_domain_daemon(timeout=5.0)
+
+
+def test_methods_cached_per_daemon_instance(tmp_path):
+    path = os.path.join(str(tmp_path), 'daemon.sock')
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.close()
+    options = {'domain_id': 0}
+    identity = daemon_node._get_socket_identity(path)
+    assert daemon_node._load_methods(path, options, identity) is None
+    daemon_node._store_methods(path, options, identity, ['get_node_names'])
+    assert daemon_node._load_methods(path, options, identity) == ['get_node_names']
+    assert daemon_node._load_methods(path, {'domain_id': 1}, identity) is None
+
+    # a restarted daemon binds its socket anew
+    os.unlink(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.close()
+    new_identity = daemon_node._get_socket_identity(path)
+    assert daemon_node._load_methods(path, options, new_identity) is None
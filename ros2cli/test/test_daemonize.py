@@ -0,0 +1,66 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import os
+import select
+
+import pytest
+
+from ros2cli.daemon.daemonize import daemonize
+from ros2cli.daemon.daemonize import is_fork_safe
+from ros2cli.daemon.daemonize import list_open_fds
+
+
+def write_pid(fd):
+    os.write(fd, str(os.getpid()).encode())
+
+
+def test_list_open_fds():
+    fds = list_open_fds()
+    if fds is None:
+        pytest.skip('file descriptors can not be listed')
+    read_fd, write_fd = os.pipe()
+    try:
+        assert {0, 1, 2, read_fd, write_fd} <= set(list_open_fds())
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_daemonize_fork():
+    if not is_fork_safe():
+        pytest.skip('this process can not be forked safely')
+    read_fd, write_fd = os.pipe()
+    # a non-inheritable descriptor must not leak into the daemon
+    leaked_read_fd, leaked_write_fd = os.pipe()
+    try:
+        os.set_inheritable(write_fd, True)
+        daemonize(functools.partial(write_pid, write_fd), timeout=5.0, fork=True)
+        os.close(write_fd)
+        os.close(leaked_write_fd)
+        # the daemon closes its end of the leaked pipe before writing its pid,
+        # so the leaked read end may become readable first: wait on each
+        # read end separately
+        readable, _, _ = select.select([read_fd], [], [], 5.0)
+        assert readable
+        pid = int(os.read(read_fd, 32))
+        assert pid != os.getpid()
+        # the daemon released its end of the leaked pipe, so the read end
+        # reports EOF, and never data
+        readable, _, _ = select.select([leaked_read_fd], [], [], 5.0)
+        assert readable and os.read(leaked_read_fd, 1) == b''
+    finally:
+        os.close(read_fd)
+        os.close(leaked_read_fd)
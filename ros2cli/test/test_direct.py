@@ -13,15 +13,23 @@
 # limitations under the License.
 
 import argparse
+import time
+import types
 
 import pytest
 
+import ros2cli.node.direct
 from ros2cli.node.direct import add_arguments as add_direct_node_arguments
+from ros2cli.node.direct import DEFAULT_QUIET_PERIOD
 from ros2cli.node.direct import DEFAULT_TIMEOUT
 from ros2cli.node.direct import DirectNode
+from ros2cli.node.direct import GraphSettleMonitor
 
 TEST_NODE_NAME = 'test_node'
 
+ENDPOINT_COUNTS = {
+    'subscribers': 0, 'publishers': 1, 'service_servers': 0, 'service_clients': 0}
+
 
 @pytest.fixture(scope='function')
 def test_arguments_parser():
@@ -34,6 +42,14 @@ def test_default_arguments(test_arguments_parser):
     args = test_arguments_parser.parse_args()
     assert not args.use_sim_time
     assert DEFAULT_TIMEOUT == args.spin_time
+    assert 'fixed' == args.discovery_mode
+
+
+def test_discovery_mode_arguments(test_arguments_parser):
+    args = test_arguments_parser.parse_args(['--discovery-mode', 'adaptive'])
+    assert 'adaptive' == args.discovery_mode
+    with pytest.raises(SystemExit):
+        test_arguments_parser.parse_args(['--discovery-mode', 'unknown'])
 
 
 def test_use_sim_time_arguments(test_arguments_parser):
@@ -61,3 +77,119 @@ def test_use_sim_time_parameter():
     # args = argparse.Namespace(use_sim_time=True)
     # with DirectNode(args, node_name=TEST_NODE_NAME) as direct_node:
     #     assert direct_node.node.get_parameter('use_sim_time').value
+
+
+def test_discovery_seeded_from_daemon(monkeypatch):
+    args = argparse.Namespace(spin_time=10.0)
+    # the daemon knows no other node but a ros2cli one, nothing to wait for
+    monkeypatch.setattr(
+        ros2cli.node.direct, 'get_daemon_node_graph',
+        lambda args: {('_ros2cli_1234', '/'): ENDPOINT_COUNTS})
+    start = time.monotonic()
+    with DirectNode(args, node_name=TEST_NODE_NAME):
+        pass
+    assert time.monotonic() - start < args.spin_time
+
+    # a node that never shows up, wait for as long as without a daemon
+    monkeypatch.setattr(
+        ros2cli.node.direct, 'get_daemon_node_graph',
+        lambda args: {('missing_node', '/'): ENDPOINT_COUNTS})
+    args = argparse.Namespace(spin_time=0.5)
+    start = time.monotonic()
+    with DirectNode(args, node_name=TEST_NODE_NAME):
+        pass
+    assert time.monotonic() - start >= args.spin_time
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeGraphNode:
+
+    def __init__(self):
+        self.nodes = [('talker', '/')]
+        self.topics = [('/chatter', ['std_msgs/msg/String'])]
+
+    def get_node_names_and_namespaces(self):
+        return list(self.nodes)
+
+    def get_topic_names_and_types(self):
+        return list(self.topics)
+
+    def get_service_names_and_types(self):
+        return []
+
+    def get_publisher_names_and_types_by_node(self, node_name, node_namespace):
+        return list(self.topics)
+
+    def get_subscriber_names_and_types_by_node(self, node_name, node_namespace):
+        return []
+
+    def get_service_names_and_types_by_node(self, node_name, node_namespace):
+        return []
+
+    def get_client_names_and_types_by_node(self, node_name, node_namespace):
+        return []
+
+
+def test_graph_settle_monitor():
+    clock = FakeClock()
+    node = FakeGraphNode()
+    monitor = GraphSettleMonitor(node, quiet_period=0.2, clock=clock)
+    assert not monitor.is_settled()
+    clock.now += 0.1
+    assert not monitor.is_settled()
+    clock.now += 0.15
+    assert monitor.is_settled()
+
+    # any change restarts the quiet period
+    node.topics.append(('/rosout', ['rcl_interfaces/msg/Log']))
+    assert not monitor.is_settled()
+    clock.now += 0.1
+    assert not monitor.is_settled()
+    clock.now += 0.15
+    assert monitor.is_settled()
+
+
+def test_has_discovered_endpoints():
+    node = FakeGraphNode()
+    direct_node = types.SimpleNamespace(node=node)
+    nodes = {('talker', '/'): dict(ENDPOINT_COUNTS, publishers=2)}
+    # the node is known, but not all of its endpoints
+    assert not DirectNode._has_discovered(direct_node, nodes)
+    node.topics.append(('/rosout', ['rcl_interfaces/msg/Log']))
+    assert DirectNode._has_discovered(direct_node, nodes)
+    assert nodes == {}
+
+    # without endpoint counts, only the node itself is waited for
+    nodes = {('talker', '/'): None, ('listener', '/'): None}
+    assert not DirectNode._has_discovered(direct_node, nodes)
+    assert nodes == {('listener', '/'): None}
+    node.nodes.append(('listener', '/'))
+    assert DirectNode._has_discovered(direct_node, nodes)
+
+
+def test_adaptive_discovery_mode(monkeypatch):
+    monkeypatch.setattr(ros2cli.node.direct, 'get_daemon_node_graph', lambda args: None)
+    args = argparse.Namespace(spin_time=10.0, discovery_mode='adaptive')
+    start = time.monotonic()
+    with DirectNode(args, node_name=TEST_NODE_NAME):
+        pass
+    assert time.monotonic() - start < args.spin_time
+
+
+def test_adaptive_discovery_mode_default_spin_time(test_arguments_parser, monkeypatch):
+    monkeypatch.setattr(ros2cli.node.direct, 'get_daemon_node_graph', lambda args: None)
+    args = test_arguments_parser.parse_args(['--discovery-mode', 'adaptive'])
+    assert DEFAULT_QUIET_PERIOD < args.spin_time
+    start = time.monotonic()
+    with DirectNode(args, node_name=TEST_NODE_NAME):
+        pass
+    # faster than the fixed discovery mode
+    assert time.monotonic() - start < args.spin_time
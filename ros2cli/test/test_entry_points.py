@@ -0,0 +1,109 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+
+import pytest
+
+from ros2cli import entry_points
+from ros2cli.entry_points import get_entry_point_cache_path
+from ros2cli.entry_points import get_entry_points
+from ros2cli.entry_points import get_extension_spec_cache_path
+from ros2cli.entry_points import get_extension_specs
+from ros2cli.entry_points import rebuild_entry_point_cache
+from ros2cli.entry_points import store_extension_specs
+
+
+def write_distribution(prefix, name, content):
+    dist_path = prefix / f'{name}-0.1.0.dist-info'
+    dist_path.mkdir(exist_ok=True)
+    (dist_path / 'METADATA').write_text(f'Name: {name}\nVersion: 0.1.0\n')
+    entry_points_path = dist_path / 'entry_points.txt'
+    if entry_points_path.exists():
+        # make sure the modification is visible on coarse grained filesystems
+        stat = entry_points_path.stat()
+        entry_points_path.write_text(content)
+        os.utime(entry_points_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    else:
+        entry_points_path.write_text(content)
+
+
+@pytest.fixture
+def prefix(tmp_path, monkeypatch):
+    prefix = tmp_path / 'site-packages'
+    prefix.mkdir()
+    monkeypatch.setenv('ROS_HOME', str(tmp_path / 'ros_home'))
+    monkeypatch.setattr(sys, 'path', [str(prefix)])
+    monkeypatch.setattr(entry_points, '_distribution_index', None)
+    return prefix
+
+
+def test_cache_is_written(prefix):
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    assert list(get_entry_points('test.group')) == ['bar']
+
+    with open(get_entry_point_cache_path(), 'r') as h:
+        cache = json.load(h)
+    assert str(prefix) in cache['paths']
+
+
+def test_cache_is_used(prefix, monkeypatch):
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    get_entry_points('test.group')
+
+    def fail(path):
+        raise AssertionError(f"'{path}' should not be rescanned")
+    monkeypatch.setattr(entry_points, '_scan_path', fail)
+    monkeypatch.setattr(entry_points, '_distribution_index', None)
+    assert get_entry_points('test.group')['bar'].value == 'foo.bar:Bar'
+
+
+def test_cache_is_invalidated(prefix, monkeypatch):
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    assert list(get_entry_points('test.group')) == ['bar']
+
+    write_distribution(prefix, 'foo', '[test.group]\nbaz = foo.baz:Baz\n')
+    write_distribution(prefix, 'qux', '[test.group]\nqux = qux:Qux\n')
+    monkeypatch.setattr(entry_points, '_distribution_index', None)
+    assert sorted(get_entry_points('test.group')) == ['baz', 'qux']
+
+
+def test_rebuild_cache(prefix):
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    os.makedirs(os.path.dirname(get_entry_point_cache_path()), exist_ok=True)
+    with open(get_entry_point_cache_path(), 'w') as h:
+        # a corrupted index must not prevent rebuilding it
+        h.write('not json')
+    assert rebuild_entry_point_cache() == 1
+    assert list(get_entry_points('test.group')) == ['bar']
+
+
+def test_extension_specs(prefix, monkeypatch):
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    assert get_extension_specs('test.group') is None
+    store_extension_specs('test.group', {'bar': {'description': 'Bar'}})
+    assert get_extension_specs('test.group') == {'bar': {'description': 'Bar'}}
+    assert get_extension_specs('other.group') is None
+
+    # specs are discarded along with the entry point index
+    write_distribution(prefix, 'foo', '[test.group]\nbar = foo.bar:Bar\n')
+    monkeypatch.setattr(entry_points, '_distribution_index', None)
+    assert get_extension_specs('test.group') is None
+
+    store_extension_specs('test.group', {'bar': {'description': 'Bar'}})
+    assert rebuild_entry_point_cache() == 1
+    assert not os.path.exists(get_extension_spec_cache_path())
+    assert get_extension_specs('test.group') is None
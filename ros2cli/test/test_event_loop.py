@@ -0,0 +1,64 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from ros2cli.daemon.event_loop import EventLoop
+from ros2cli.rpc.client import ServerProxy
+from ros2cli.rpc.local_server import LocalRPCServer
+
+
+@pytest.fixture
+def rpc_server(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    server = LocalRPCServer(os.path.join(str(tmp_path), 'rpc.sock'))
+    try:
+        yield server
+    finally:
+        server.server_close()
+
+
+def test_wait_timeout(rpc_server):
+    with EventLoop([rpc_server]) as event_loop:
+        start = time.monotonic()
+        assert event_loop.wait(0.1) == []
+        assert time.monotonic() - start >= 0.1
+
+
+def test_wait_for_connection(rpc_server):
+    with EventLoop([rpc_server]) as event_loop:
+        proxy = ServerProxy(rpc_server.server_address)
+        try:
+            proxy.connect()
+            assert event_loop.wait(5) == [rpc_server]
+        finally:
+            proxy.close()
+
+
+def test_wake(rpc_server):
+    with EventLoop([rpc_server]) as event_loop:
+        timer = threading.Timer(0.1, event_loop.wake)
+        timer.start()
+        start = time.monotonic()
+        assert event_loop.wait(5) == []
+        assert time.monotonic() - start < 5
+        timer.join()
+        # wake ups are consumed
+        assert event_loop.wait(0) == []
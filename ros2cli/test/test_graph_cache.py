@@ -0,0 +1,132 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from ros2cli.daemon.graph_cache import are_graph_changes_announced
+from ros2cli.daemon.graph_cache import GraphCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def graph_cache(clock):
+    return GraphCache(max_age=5.0, settle_time=1.0, clock=clock)
+
+
+@pytest.fixture
+def query(graph_cache):
+    calls = []
+
+    def get_topic_names_and_types(*args):
+        calls.append(args)
+        return [['/topic', ['std_msgs/msg/String']]]
+    cached_query = graph_cache.cached(get_topic_names_and_types)
+    cached_query.calls = calls
+    return cached_query
+
+
+def test_cached_until_change(graph_cache, clock, query):
+    assert query.__name__ == 'get_topic_names_and_types'
+    assert query() == query()
+    assert len(query.calls) == 1
+
+    graph_cache.notify_change()
+    assert len(graph_cache) == 0
+    query()
+    assert len(query.calls) == 2
+
+
+def test_cached_by_arguments(query):
+    query('node', '/')
+    query('node', '/')
+    query('other_node', '/')
+    assert query.calls == [('node', '/'), ('other_node', '/')]
+
+
+def test_not_cached_while_settling(graph_cache, clock, query):
+    graph_cache.notify_change()
+    clock.now += 0.5
+    query()
+    query()
+    assert len(query.calls) == 2
+
+    clock.now += 0.5
+    query()
+    query()
+    assert len(query.calls) == 3
+
+
+def test_expires_after_max_age(clock, query):
+    query()
+    clock.now += 4.9
+    query()
+    assert len(query.calls) == 1
+    clock.now += 0.1
+    query()
+    assert len(query.calls) == 2
+
+
+def test_unhashable_arguments_are_not_cached(query):
+    query(['node'])
+    query(['node'])
+    assert len(query.calls) == 2
+
+
+def test_is_settled(graph_cache, clock):
+    assert graph_cache.is_settled()
+    graph_cache.notify_change()
+    assert not graph_cache.is_settled()
+    clock.now += 1.0
+    assert graph_cache.is_settled()
+
+
+def test_changes_are_polled_before_lookups(graph_cache, clock):
+    calls = []
+
+    def get_node_names():
+        calls.append(None)
+        return [['node', '/']]
+
+    def poll():
+        # a change announced since the last lookup
+        if len(calls) == 1:
+            graph_cache.notify_change()
+            clock.now += 1.0
+    query = graph_cache.cached(get_node_names, poll=poll)
+    query()
+    query()
+    assert len(calls) == 2
+    query()
+    assert len(calls) == 2
+
+
+def test_are_graph_changes_announced():
+    assert are_graph_changes_announced('rmw_fastrtps_cpp')
+    assert are_graph_changes_announced('rmw_fastrtps_dynamic_cpp')
+    assert are_graph_changes_announced('rmw_cyclonedds_cpp')
+    assert are_graph_changes_announced('rmw_connextdds')
+    assert not are_graph_changes_announced('rmw_zenoh_cpp')
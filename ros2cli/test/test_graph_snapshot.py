@@ -0,0 +1,141 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from ros2cli.daemon.graph_snapshot import ENDPOINT_KINDS
+from ros2cli.daemon.graph_snapshot import GraphSnapshot
+from ros2cli.daemon.graph_snapshot import GraphSnapshotUnavailable
+from ros2cli.daemon.graph_snapshot import GraphSnapshotWriter
+from ros2cli.daemon.graph_snapshot import is_graph_snapshot_supported
+
+pytestmark = pytest.mark.skipif(
+    not is_graph_snapshot_supported(),
+    reason='Graph snapshots are not supported on this platform')
+
+TOPICS = [
+    ('/rosout', ['rcl_interfaces/msg/Log']),
+    ('/chatter', ['std_msgs/msg/String']),
+]
+
+SERVICES = [
+    ('/talker/describe_parameters', ['rcl_interfaces/srv/DescribeParameters']),
+]
+
+
+def make_endpoints(**endpoints):
+    return {kind: endpoints.get(kind, []) for kind in ENDPOINT_KINDS}
+
+
+NODE_GRAPH = [
+    ('talker', '/', make_endpoints(
+        publishers=[('/chatter', ['std_msgs/msg/String']),
+                    ('/rosout', ['rcl_interfaces/msg/Log'])],
+        service_servers=SERVICES)),
+    ('listener', '/ns', make_endpoints(
+        subscribers=[('/chatter', ['std_msgs/msg/String'])])),
+    ('émetteur', '/', make_endpoints()),
+]
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def writer(tmp_path, clock):
+    writer = GraphSnapshotWriter(str(tmp_path / 'graph'), clock=clock)
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def snapshot(writer, clock):
+    writer.publish(TOPICS, SERVICES, NODE_GRAPH, max_age=5.0)
+    with GraphSnapshot(writer.path, clock=clock) as snapshot:
+        yield snapshot
+
+
+def test_queries(snapshot):
+    assert snapshot.is_fresh()
+    assert snapshot.get_node_names_and_namespaces() == sorted(
+        (name, namespace) for name, namespace, _ in NODE_GRAPH)
+    assert snapshot.get_topic_names_and_types() == sorted(TOPICS)
+    assert snapshot.get_service_names_and_types() == SERVICES
+    assert snapshot.get_node_graph() == sorted(NODE_GRAPH, key=lambda entry: entry[:2])
+
+
+def test_node_queries(snapshot):
+    assert snapshot.get_publisher_names_and_types_by_node('talker', '/') == [
+        ('/chatter', ['std_msgs/msg/String']), ('/rosout', ['rcl_interfaces/msg/Log'])]
+    assert snapshot.get_subscriber_names_and_types_by_node('listener', '/ns') == [
+        ('/chatter', ['std_msgs/msg/String'])]
+    assert snapshot.get_service_names_and_types_by_node('talker', '/') == SERVICES
+    assert snapshot.get_client_names_and_types_by_node('émetteur', '/') == []
+
+    with pytest.raises(GraphSnapshotUnavailable):
+        snapshot.get_publisher_names_and_types_by_node('listener', '/')
+    with pytest.raises(GraphSnapshotUnavailable):
+        snapshot.get_publisher_names_and_types_by_node('talker', '/', no_demangle=True)
+    with pytest.raises(AttributeError):
+        snapshot.count_publishers
+
+
+def test_invalidated_on_change(writer, snapshot):
+    writer.invalidate()
+    assert not snapshot.is_fresh()
+    with pytest.raises(GraphSnapshotUnavailable):
+        snapshot.get_node_names_and_namespaces()
+
+
+def test_expired(snapshot, clock):
+    clock.now += 5.0
+    assert not snapshot.is_fresh()
+    with pytest.raises(GraphSnapshotUnavailable):
+        snapshot.get_topic_names_and_types()
+
+
+def test_replaced(writer, snapshot, clock):
+    writer.publish([], [], [], max_age=5.0)
+    # the previous snapshot goes stale, but remains readable
+    assert not snapshot.is_fresh()
+    with GraphSnapshot(writer.path, clock=clock) as new_snapshot:
+        assert new_snapshot.is_fresh()
+        assert new_snapshot.sequence > snapshot.sequence
+        assert new_snapshot.get_node_graph() == []
+
+
+def test_removed_on_close(writer, snapshot):
+    writer.close()
+    assert not snapshot.is_fresh()
+    assert not os.path.exists(writer.path)
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / 'graph'
+    path.write_bytes(b'not a graph snapshot, but long enough to hold a header')
+    with pytest.raises(ValueError):
+        GraphSnapshot(str(path))
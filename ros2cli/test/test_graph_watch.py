@@ -0,0 +1,182 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from ros2cli.daemon.graph_watch import diff_graph_snapshots
+from ros2cli.daemon.graph_watch import GraphWatcher
+from ros2cli.daemon.graph_watch import WATCH_LINGER
+
+TALKER = ('node', '/talker')
+CHATTER_PUBLISHER = (
+    'publisher', '/chatter', 'std_msgs/msg/String', '/talker',
+    (('history', 'KEEP_LAST'), ('depth', 7), ('reliability', 'RELIABLE'),
+     ('durability', 'VOLATILE'), ('liveliness', 'AUTOMATIC')))
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def graph():
+    return {TALKER}
+
+
+@pytest.fixture
+def watcher(graph, clock):
+    watching = threading.Event()
+    watcher = GraphWatcher(lambda: set(graph), on_watch=watching.set, clock=clock)
+    watcher.watching = watching
+    return watcher
+
+
+def wait_for_changes(watcher, sequence):
+    result = {}
+
+    def target():
+        result.update(watcher.get_graph_changes(sequence, 10.0))
+    watcher.watching.clear()
+    thread = threading.Thread(target=target)
+    thread.start()
+    watcher.watching.wait()
+    return thread, result
+
+
+def test_diff_graph_snapshots():
+    events = diff_graph_snapshots({TALKER}, {CHATTER_PUBLISHER})
+    assert events == [
+        {'event': 'removed', 'kind': 'node', 'node': '/talker'},
+        {
+            'event': 'added', 'kind': 'publisher', 'node': '/talker',
+            'topic': '/chatter', 'type': 'std_msgs/msg/String',
+            'qos': {
+                'history': 'KEEP_LAST', 'depth': 7, 'reliability': 'RELIABLE',
+                'durability': 'VOLATILE', 'liveliness': 'AUTOMATIC',
+            },
+        },
+    ]
+
+
+def test_no_snapshot_unless_watched(watcher):
+    watcher.update()
+    assert not watcher.watched
+    result = watcher.get_graph_changes(0, 0)
+    assert result == {
+        'sequence': 0, 'epoch': None, 'changes': [], 'reset': False, 'throttled': False}
+
+
+def test_watch_graph_changes(watcher, graph, clock):
+    thread, result = wait_for_changes(watcher, 0)
+    watcher.update()
+    thread.join()
+    assert result['reset']
+    assert [event['node'] for event in result['changes']] == ['/talker']
+    sequence = result['sequence']
+
+    thread, result = wait_for_changes(watcher, sequence)
+    graph.add(CHATTER_PUBLISHER)
+    # nothing changes until notified, or snapshots get old
+    watcher.update(max_age=1.0)
+    assert thread.is_alive()
+    watcher.notify_change()
+    watcher.update(max_age=1.0)
+    thread.join()
+    assert not result['reset']
+    assert result['sequence'] == sequence + 1
+    assert [(event['event'], event['kind']) for event in result['changes']] == [
+        ('added', 'publisher')]
+
+    # changes are kept for clients coming back shortly
+    graph.clear()
+    clock.now += 1.0
+    watcher.update(max_age=1.0)
+    result = watcher.get_graph_changes(sequence, 0)
+    assert not result['reset']
+    assert [(event['event'], event['kind']) for event in result['changes']] == [
+        ('added', 'publisher'), ('removed', 'node'), ('removed', 'publisher')]
+
+    # and forgotten otherwise
+    clock.now += WATCH_LINGER
+    watcher.update()
+    assert not watcher.watched
+    result = watcher.get_graph_changes(result['sequence'], 0)
+    assert result['changes'] == []
+    assert not result['reset']
+
+
+def test_close_releases_watchers(watcher):
+    thread, result = wait_for_changes(watcher, 0)
+    watcher.close()
+    thread.join()
+    assert result == {
+        'sequence': 0, 'epoch': None, 'changes': [], 'reset': False, 'throttled': False}
+
+
+def test_changes_of_another_epoch(watcher, graph, clock):
+    thread, result = wait_for_changes(watcher, 0)
+    watcher.update()
+    thread.join()
+    assert result['epoch'] == watcher.epoch
+    sequence = result['sequence']
+
+    # the same sequence number, from a watcher that has since been replaced
+    new_watcher = GraphWatcher(lambda: set(graph), clock=clock)
+    assert new_watcher.epoch != watcher.epoch
+    thread = threading.Thread(target=lambda: result.update(
+        new_watcher.get_graph_changes(sequence, 10.0, watcher.epoch)))
+    thread.start()
+    while thread.is_alive():
+        new_watcher.update()
+        thread.join(0.01)
+    assert result['reset']
+    assert result['epoch'] == new_watcher.epoch
+    assert [event['node'] for event in result['changes']] == ['/talker']
+
+    result = new_watcher.get_graph_changes(result['sequence'], 0, result['epoch'])
+    assert not result['reset']
+    assert result['changes'] == []
+
+
+def test_watchers_are_throttled(graph, clock):
+    watching = threading.Event()
+    watcher = GraphWatcher(
+        lambda: set(graph), max_watchers=1, on_watch=watching.set, clock=clock)
+    watcher.watching = watching
+    thread, result = wait_for_changes(watcher, 0)
+    watcher.update()
+    thread.join()
+    assert not result['throttled']
+
+    # the only watcher allowed waits for changes
+    thread, result = wait_for_changes(watcher, result['sequence'])
+    # others are answered right away
+    other_result = watcher.get_graph_changes(0, 10.0)
+    assert other_result['throttled']
+    assert other_result['reset']
+    watcher.close()
+    thread.join()
+    assert not result['throttled']
@@ -0,0 +1,50 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+
+import pytest
+
+from ros2cli.helpers import get_runtime_dir
+
+
+@pytest.fixture
+def runtime_dir(tmp_path, monkeypatch):
+    if not hasattr(os, 'getuid'):
+        pytest.skip('user ids are not supported')
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    return os.path.join(str(tmp_path), f'ros2cli-{os.getuid()}')
+
+
+def test_get_runtime_dir(runtime_dir):
+    assert get_runtime_dir() == runtime_dir
+    assert stat.S_IMODE(os.stat(runtime_dir).st_mode) == 0o700
+    # reused as is
+    assert get_runtime_dir() == runtime_dir
+
+
+def test_get_runtime_dir_not_private(runtime_dir):
+    os.mkdir(runtime_dir)
+    os.chmod(runtime_dir, 0o777)
+    with pytest.raises(PermissionError):
+        get_runtime_dir()
+
+
+def test_get_runtime_dir_symlink(runtime_dir, tmp_path):
+    target = tmp_path / 'elsewhere'
+    target.mkdir(mode=0o700)
+    os.symlink(str(target), runtime_dir)
+    with pytest.raises(PermissionError):
+        get_runtime_dir()
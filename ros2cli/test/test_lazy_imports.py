@@ -0,0 +1,54 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+CHECK_IMPORTED_MODULES = """
+import json
+import sys
+
+from ros2cli.cli import main
+
+try:
+    main(argv=sys.argv[1:])
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules.keys())))
+"""
+
+
+def get_imported_modules(argv):
+    proc = subprocess.run(
+        [sys.executable, '-c', CHECK_IMPORTED_MODULES, *argv],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        universal_newlines=True, check=True, timeout=60)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize('argv,unwanted_modules', [
+    (['--help'], ['rclpy', 'rosidl_runtime_py', 'yaml', 'argcomplete']),
+    (['extension_points'], ['rclpy', 'rosidl_runtime_py', 'yaml']),
+    (['pkg', 'prefix', 'ros2cli'], ['rclpy', 'rosidl_runtime_py', 'yaml']),
+    (['multicast', '--help'], ['rclpy', 'rosidl_runtime_py', 'yaml']),
+    (['interface', 'list'], ['rclpy']),
+])
+def test_no_heavy_imports(argv, unwanted_modules):
+    imported_modules = get_imported_modules(argv)
+    for module in unwanted_modules:
+        assert module not in imported_modules, \
+            f"'ros2 {' '.join(argv)}' must not import '{module}'"
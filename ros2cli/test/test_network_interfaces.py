@@ -0,0 +1,111 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+import socket
+
+import psutil
+
+import pytest
+
+import ros2cli.network_interfaces
+from ros2cli.network_interfaces import InterfaceAddressCache
+from ros2cli.network_interfaces import InterfaceChangeMonitor
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_interface_change_monitor_without_netlink(monkeypatch):
+    monkeypatch.setattr(ros2cli.network_interfaces, '_open_netlink_socket', lambda: None)
+    clock = FakeClock()
+    monitor = InterfaceChangeMonitor(min_interval=1.0, clock=clock)
+    try:
+        assert not monitor.may_have_changed()
+        clock.now += 1.0
+        assert monitor.may_have_changed()
+        # changes are assumed at most every min_interval seconds
+        assert not monitor.may_have_changed()
+        clock.now += 0.5
+        assert not monitor.may_have_changed()
+        clock.now += 0.5
+        assert monitor.may_have_changed()
+    finally:
+        monitor.close()
+
+
+def test_interface_change_monitor_with_netlink():
+    monitor = InterfaceChangeMonitor()
+    try:
+        if monitor._sock is None:
+            pytest.skip('netlink is not supported')
+        # nothing changed since the monitor was created
+        assert not monitor.may_have_changed()
+    finally:
+        monitor.close()
+
+
+# like the addresses returned by psutil.net_if_addrs()
+NetIfAddress = namedtuple('NetIfAddress', ['family', 'address', 'netmask', 'broadcast', 'ptp'])
+
+
+class FakeMonitor:
+
+    def __init__(self):
+        self.changed = False
+
+    def may_have_changed(self):
+        changed, self.changed = self.changed, False
+        return changed
+
+    def close(self):
+        pass
+
+
+def test_interface_address_cache(monkeypatch):
+    addresses = {
+        'lo': [NetIfAddress(socket.AF_INET, '127.0.0.1', '255.0.0.0', None, None)],
+    }
+    calls = []
+
+    def net_if_addrs():
+        calls.append(None)
+        return dict(addresses)
+    monkeypatch.setattr(psutil, 'net_if_addrs', net_if_addrs)
+
+    monitor = FakeMonitor()
+    cache = InterfaceAddressCache(monitor=monitor)
+    fingerprint = cache.get_fingerprint()
+    assert cache.get_ipv4_addresses() == {'127.0.0.1'}
+    assert cache.get_addresses() == addresses
+    # interfaces are only enumerated once, until they change
+    assert len(calls) == 1
+
+    monitor.changed = True
+    assert cache.get_fingerprint() == fingerprint
+    assert len(calls) == 2
+
+    addresses['eth0'] = [
+        NetIfAddress(socket.AF_INET, '10.0.0.2', '255.255.255.0', None, None)]
+    assert cache.get_fingerprint() == fingerprint
+    monitor.changed = True
+    assert cache.get_fingerprint() != fingerprint
+    assert cache.get_ipv4_addresses() == {'127.0.0.1', '10.0.0.2'}
+    assert len(calls) == 3
@@ -0,0 +1,197 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import select
+import socket
+import threading
+
+import pytest
+
+import rclpy.duration
+import rclpy.qos
+import rclpy.topic_endpoint_info
+
+from ros2cli.daemon import handle_request_in_executor
+from ros2cli.rpc import marshal
+from ros2cli.rpc.client import Fault
+from ros2cli.rpc.client import ServerProxy
+from ros2cli.rpc.local_server import LocalRPCServer
+
+
+TEST_QOS_PROFILE = rclpy.qos.QoSProfile(
+    reliability=rclpy.qos.ReliabilityPolicy.BEST_EFFORT,
+    durability=rclpy.qos.DurabilityPolicy.TRANSIENT_LOCAL,
+    deadline=rclpy.duration.Duration(seconds=1, nanoseconds=5),
+    depth=5
+)
+
+
+def test_marshal_builtin_types():
+    value = ['a', 1, 2.5, None, True, {'b': [('c', ['d'])]}]
+    data = marshal.dumps(value)
+    assert marshal.HEADER.unpack(data[:marshal.HEADER.size])[0] == len(data) - 4
+    assert marshal.loads(data[marshal.HEADER.size:]) == \
+        ['a', 1, 2.5, None, True, {'b': [['c', ['d']]]}]
+
+
+def test_marshal_qos_profile():
+    data = marshal.dumps(TEST_QOS_PROFILE)
+    qos_profile = marshal.loads(data[marshal.HEADER.size:])
+    assert isinstance(qos_profile, rclpy.qos.QoSProfile)
+    assert qos_profile == TEST_QOS_PROFILE
+    assert qos_profile.reliability is rclpy.qos.ReliabilityPolicy.BEST_EFFORT
+    assert qos_profile.deadline.nanoseconds == 1000000005
+
+
+def test_marshal_topic_endpoint_info():
+    info = rclpy.topic_endpoint_info.TopicEndpointInfo(
+        node_name='node', node_namespace='/ns', topic_type='test_msgs/msg/Empty',
+        endpoint_type=rclpy.topic_endpoint_info.TopicEndpointTypeEnum.PUBLISHER,
+        endpoint_gid=list(range(16)), qos_profile=TEST_QOS_PROFILE)
+    data = marshal.dumps([info])
+    [loaded_info] = marshal.loads(data[marshal.HEADER.size:])
+    assert loaded_info.node_name == 'node'
+    assert loaded_info.node_namespace == '/ns'
+    assert loaded_info.topic_type == 'test_msgs/msg/Empty'
+    assert loaded_info.endpoint_type == \
+        rclpy.topic_endpoint_info.TopicEndpointTypeEnum.PUBLISHER
+    assert loaded_info.endpoint_gid == list(range(16))
+    assert loaded_info.qos_profile == TEST_QOS_PROFILE
+
+
+def test_marshal_unsupported_type():
+    with pytest.raises(TypeError):
+        marshal.dumps(object())
+
+
+@pytest.fixture
+def rpc_server(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    path = os.path.join(str(tmp_path), 'rpc.sock')
+    server = LocalRPCServer(path)
+    server.register_introspection_functions()
+    server.register_function(lambda a, b: a + b, 'add')
+    server.register_function(lambda: TEST_QOS_PROFILE, 'get_qos_profile')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+    assert not os.path.exists(path)
+
+
+def test_server_proxy(rpc_server):
+    with ServerProxy(rpc_server.server_address, timeout=5) as proxy:
+        assert proxy.system.listMethods() == [
+            'add', 'get_qos_profile', 'system.listMethods']
+        assert proxy.add(1, 2) == 3
+        assert proxy.get_qos_profile() == TEST_QOS_PROFILE
+        with pytest.raises(Fault):
+            proxy.unknown()
+        with pytest.raises(Fault):
+            proxy.add(1)
+
+
+def test_server_proxy_reconnects(rpc_server):
+    with ServerProxy(rpc_server.server_address, timeout=5) as proxy:
+        assert proxy.add(1, 2) == 3
+        # the server closes idle connections
+        proxy._sock.shutdown(socket.SHUT_RDWR)
+        assert proxy.add(2, 3) == 5
+
+
+def test_concurrent_requests(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    server = LocalRPCServer(os.path.join(str(tmp_path), 'rpc.sock'))
+    unblock = threading.Event()
+    server.register_function(lambda: unblock.wait(5), 'slow')
+    server.register_function(lambda: True, 'fast')
+
+    stop = False
+
+    def serve():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            while not stop:
+                readable, _, _ = select.select([server], [], [], 0.1)
+                if readable:
+                    handle_request_in_executor(server, executor)
+    thread = threading.Thread(target=serve)
+    thread.start()
+    try:
+        slow_result = []
+
+        def call_slow():
+            with ServerProxy(server.server_address, timeout=5) as proxy:
+                slow_result.append(proxy.slow())
+        slow_thread = threading.Thread(target=call_slow)
+        slow_thread.start()
+        # a pending slow request must not block other requests
+        with ServerProxy(server.server_address, timeout=5) as proxy:
+            assert proxy.fast() is True
+        assert not slow_result
+        unblock.set()
+        slow_thread.join()
+        assert slow_result == [True]
+    finally:
+        unblock.set()
+        stop = True
+        thread.join()
+        server.server_close()
+
+
+class ScopedRPCServer(LocalRPCServer):
+
+    def dispatch(self, method, params, *, scope=None):
+        if method == 'system.multicall':
+            return self.system_multicall(*params, scope=scope)
+        if method.startswith('system.'):
+            return super().dispatch(method, params)
+        return [scope, super().dispatch(method, params)]
+
+
+def test_server_proxy_options(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    server = ScopedRPCServer(os.path.join(str(tmp_path), 'rpc.sock'))
+    server.register_multicall_functions()
+    server.register_function(lambda a, b: a + b, 'add')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        with ServerProxy(server.server_address, timeout=5) as proxy:
+            assert proxy.add(1, 2) == [None, 3]
+        with ServerProxy(
+            server.server_address, timeout=5, options={'scope': 'a'}
+        ) as proxy:
+            assert proxy.add(1, 2) == ['a', 3]
+            assert proxy.system.multicall([
+                {'methodName': 'add', 'params': [1, 2]},
+                {'methodName': 'add', 'params': [3, 4]},
+            ]) == [[['a', 3]], [['a', 7]]]
+        with ServerProxy(
+            server.server_address, timeout=5, options={'unknown': True}
+        ) as proxy:
+            with pytest.raises(Fault):
+                proxy.add(1, 2)
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
@@ -0,0 +1,78 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from ros2cli.helpers import wait_for
+import ros2cli.server
+from ros2cli.server import is_server_running
+from ros2cli.server import is_server_supported
+from ros2cli.server import run_on_server
+from ros2cli.server import shutdown_server
+from ros2cli.server import spawn_server
+
+pytestmark = pytest.mark.skipif(
+    not is_server_supported(), reason='the ros2 server requires POSIX')
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert spawn_server(timeout=5.0)
+    yield
+    assert shutdown_server()
+
+
+def test_spawn_and_shutdown(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    assert not is_server_running()
+    # the first invocation spawns the server and runs the command locally
+    assert run_on_server(['--help']) is None
+    assert not spawn_server(timeout=5.0)
+    assert wait_for(is_server_running, timeout=5.0)
+    assert shutdown_server()
+    assert not shutdown_server()
+
+
+def test_run_command(server, capfd):
+    assert run_on_server(['--help']) == 0
+    out, _ = capfd.readouterr()
+    assert out.startswith('usage: ros2')
+
+
+def test_run_invalid_command(server, capfd):
+    assert run_on_server(['not-a-command']) == 2
+    _, err = capfd.readouterr()
+    assert 'invalid choice' in err
+
+
+def test_untrusted_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    # e.g. created by another user, that could listen in
+    runtime_dir = tmp_path / f'ros2cli-{os.getuid()}'
+    runtime_dir.mkdir(mode=0o777)
+    runtime_dir.chmod(0o777)
+    assert run_on_server(['--help']) is None
+    assert not list(runtime_dir.iterdir())
+    assert not is_server_running()
+
+
+def test_server_of_another_user(server, monkeypatch):
+    assert is_server_running()
+    with monkeypatch.context() as m:
+        m.setattr(ros2cli.server, '_is_same_user', lambda sock: False)
+        assert not is_server_running()
+        assert run_on_server(['--help']) is None
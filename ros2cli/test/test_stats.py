@@ -0,0 +1,138 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import threading
+
+import pytest
+
+from ros2cli.daemon.stats import DaemonStats
+from ros2cli.daemon.stats import estimate_percentile
+from ros2cli.daemon.stats import Histogram
+
+from ros2cli.rpc.client import ServerProxy as RPCServerProxy
+from ros2cli.rpc.local_server import LocalRPCServer
+
+from ros2cli.xmlrpc.client import ServerProxy as XMLRPCServerProxy
+from ros2cli.xmlrpc.client import UnixStreamTransport
+from ros2cli.xmlrpc.local_server import LocalUnixXMLRPCServer
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_histogram():
+    histogram = Histogram(1.0)
+    for value in (0.0, 0.5, 1.0, 3.0, 3.5, 1000.0):
+        histogram.record(value)
+    histogram = histogram.to_dict()
+    assert histogram['count'] == 6
+    assert histogram['sum'] == 1008.0
+    assert histogram['min'] == 0.0
+    assert histogram['max'] == 1000.0
+    assert histogram['buckets'] == [[1.0, 2], [2.0, 1], [4.0, 2], [1024.0, 1]]
+
+    assert estimate_percentile(histogram, 0.5) == 2.0
+    assert estimate_percentile(histogram, 0.75) == 4.0
+    assert estimate_percentile(histogram, 0.99) == 1000.0
+    assert estimate_percentile(Histogram(1.0).to_dict(), 0.5) is None
+
+
+def test_daemon_stats():
+    clock = FakeClock()
+    stats = DaemonStats(clock=clock)
+
+    def get_topic_names_and_types():
+        clock.now += 0.25
+        return []
+    query = stats.instrument(get_topic_names_and_types)
+    failing_query = stats.instrument(lambda: 1 / 0, 'divide')
+
+    request = stats.start_request()
+    stats.set_request_method('system.multicall')
+    stats.set_request_method('get_topic_names_and_types')
+    query()
+    with pytest.raises(ZeroDivisionError):
+        failing_query()
+    clock.now += 0.5
+    request.finish(1000)
+
+    # calls outside of requests are recorded too
+    query()
+
+    methods = stats.to_dict()['methods']
+    assert set(methods) == {'system.multicall', 'get_topic_names_and_types', 'divide'}
+    assert methods['get_topic_names_and_types']['calls'] == 2
+    assert methods['get_topic_names_and_types']['call_time']['sum'] == 0.5
+    assert methods['get_topic_names_and_types']['requests'] == 0
+    assert methods['divide']['errors'] == 1
+    multicall = methods['system.multicall']
+    assert multicall['calls'] == 0
+    assert multicall['requests'] == 1
+    assert multicall['marshalling_time']['sum'] == 0.5
+    assert multicall['response_size']['sum'] == 1000
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    return os.path.join(str(tmp_path), 'daemon.sock')
+
+
+def serve(server, stats):
+    server.register_multicall_functions()
+    server.register_function(stats.instrument(lambda a, b: a + b, 'add'), 'add')
+    server.register_function(stats.to_dict, 'system.stats')
+    server.request_stats = stats
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize('transport', ['rpc', 'xmlrpc'])
+def test_server_request_stats(socket_path, transport):
+    stats = DaemonStats()
+    if transport == 'rpc':
+        server = LocalRPCServer(socket_path)
+        proxy = RPCServerProxy(socket_path, timeout=5)
+    else:
+        server = LocalUnixXMLRPCServer(socket_path, logRequests=False, allow_none=True)
+        proxy = XMLRPCServerProxy(
+            'http://localhost/', transport=UnixStreamTransport(socket_path), allow_none=True)
+    thread = serve(server, stats)
+    try:
+        with proxy:
+            assert proxy.add(1, 2) == 3
+            proxy.system.multicall([
+                {'methodName': 'add', 'params': [1, 2]},
+                {'methodName': 'add', 'params': [3, 4]},
+            ])
+            methods = proxy.system.stats()['methods']
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+    assert methods['add']['calls'] == 3
+    assert methods['add']['requests'] == 1
+    assert methods['add']['response_size']['count'] == 1
+    assert methods['system.multicall']['requests'] == 1
+    assert methods['system.multicall']['calls'] == 0
@@ -16,9 +16,11 @@ import argparse
 
 import pytest
 
+from ros2cli.daemon.graph_snapshot import GraphSnapshotUnavailable
 from ros2cli.node.daemon import is_daemon_running
 from ros2cli.node.daemon import shutdown_daemon
 from ros2cli.node.daemon import spawn_daemon
+import ros2cli.node.strategy
 from ros2cli.node.strategy import NodeStrategy
 
 
@@ -66,3 +68,60 @@ def test_enforce_no_daemon(enforce_daemon_is_running):
     with NodeStrategy(args=args) as node:
         assert node._daemon_node is None
         assert node._direct_node is not None
+
+
+def test_batch_with_daemon_running(enforce_daemon_is_running):
+    with NodeStrategy(args=[]) as node:
+        assert node.daemon_node.supports_multicall
+        batch = node.batch()
+        batch.get_node_names_and_namespaces()
+        batch.count_publishers('/rosout')
+        assert len(batch) == 2
+        node_names_and_namespaces, count = batch.flush()
+        assert isinstance(node_names_and_namespaces, list)
+        assert isinstance(count, int)
+        assert len(batch) == 0
+        # no direct node is needed for batched queries
+        assert node._direct_node is None
+
+
+def test_batch_with_no_daemon_running(enforce_no_daemon_is_running):
+    args = argparse.Namespace(no_daemon=True)
+    with NodeStrategy(args=args) as node:
+        batch = node.batch()
+        batch.count_publishers('/rosout')
+        batch.count_subscribers('/rosout')
+        assert len(batch.flush()) == 2
+
+
+class FakeGraphSnapshot:
+
+    def __init__(self):
+        self.fresh = True
+        self.closed = False
+
+    def get_topic_names_and_types(self):
+        if not self.fresh:
+            raise GraphSnapshotUnavailable('stale')
+        return [('/chatter', ['std_msgs/msg/String'])]
+
+    def close(self):
+        self.closed = True
+
+
+def test_with_graph_snapshot(monkeypatch):
+    snapshot = FakeGraphSnapshot()
+    monkeypatch.setattr(ros2cli.node.strategy, 'open_graph_snapshot', lambda: snapshot)
+    with NodeStrategy(args=[]) as node:
+        assert node._daemon_node is not None
+        assert node._direct_node is None
+        assert node.get_topic_names_and_types() == [('/chatter', ['std_msgs/msg/String'])]
+        # the daemon was not even connected to
+        assert not node._daemon_connected
+
+        snapshot.fresh = False
+        monkeypatch.setattr(
+            node, '_get_node_for', lambda name: argparse.Namespace(
+                get_topic_names_and_types=lambda: [('/rosout', ['rcl_interfaces/msg/Log'])]))
+        assert node.get_topic_names_and_types() == [('/rosout', ['rcl_interfaces/msg/Log'])]
+    assert snapshot.closed
@@ -0,0 +1,117 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from ros2cli.xmlrpc.client import ServerProxy
+from ros2cli.xmlrpc.client import UnixStreamTransport
+from ros2cli.xmlrpc.local_server import LocalUnixXMLRPCServer
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    if not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets are not supported')
+    return os.path.join(str(tmp_path), 'xmlrpc.sock')
+
+
+@pytest.fixture
+def unix_xmlrpc_server(socket_path):
+    server = LocalUnixXMLRPCServer(socket_path, logRequests=False, allow_none=True)
+    server.register_introspection_functions()
+    server.register_function(lambda a, b: a + b, 'add')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_unix_xmlrpc_server(unix_xmlrpc_server, socket_path):
+    # only the current user may connect
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+    transport = UnixStreamTransport(socket_path)
+    with ServerProxy('http://localhost/', transport=transport, allow_none=True) as proxy:
+        assert 'add' in proxy.system.listMethods()
+        assert proxy.add(1, 2) == 3
+
+
+def test_unix_xmlrpc_server_in_use(unix_xmlrpc_server, socket_path):
+    with pytest.raises(OSError) as excinfo:
+        LocalUnixXMLRPCServer(socket_path)
+    assert excinfo.value.errno == errno.EADDRINUSE
+    # the socket file of the server in use is left alone
+    assert os.path.exists(socket_path)
+
+
+def test_unix_xmlrpc_server_replaces_stale_socket(socket_path):
+    # a socket file without a server listening on it
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.close()
+    server = LocalUnixXMLRPCServer(socket_path)
+    server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_unix_xmlrpc_servers_started_concurrently(socket_path):
+    # a socket file without a server listening on it
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    sock.close()
+    servers = []
+    errors = []
+    barrier = threading.Barrier(4)
+
+    def start():
+        barrier.wait()
+        try:
+            servers.append(LocalUnixXMLRPCServer(socket_path))
+        except OSError as e:
+            errors.append(e.errno)
+    threads = [threading.Thread(target=start) for _ in range(barrier.parties)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        # only one server takes the stale socket file over
+        assert len(servers) == 1
+        assert errors == [errno.EADDRINUSE] * (barrier.parties - 1)
+    finally:
+        for server in servers:
+            server.server_close()
+
+
+def test_unix_xmlrpc_server_path_not_in_use(unix_xmlrpc_server, socket_path):
+    assert unix_xmlrpc_server._is_path_in_use()
+    os.unlink(socket_path)
+    assert not unix_xmlrpc_server._is_path_in_use()
+
+
+def test_unix_stream_transport_without_server(socket_path):
+    transport = UnixStreamTransport(socket_path)
+    with ServerProxy('http://localhost/', transport=transport) as proxy:
+        with pytest.raises(FileNotFoundError):
+            proxy.system.listMethods()
@@ -27,6 +27,7 @@ from rclpy.parameter import get_parameter_value
 from rclpy.task import Future
 
 from ros2cli.node.strategy import NodeStrategy
+from ros2node.api import get_node_graph
 from ros2node.api import get_node_names
 from ros2node.api import get_service_server_info
 from ros2pkg.api import get_executable_paths
@@ -291,13 +292,25 @@ def find_container_node_names(*, node, node_names):
     :return: list of `ros2node.api.NodeName` instances for nodes that are
         component containers
     """
+    services_by_node = None
+    node_graph = get_node_graph(node=node, include_hidden=True)
+    if node_graph is not None:
+        services_by_node = {
+            endpoints.node_name.full_name: endpoints.service_servers
+            for endpoints in node_graph
+        }
     container_node_names = []
     for n in node_names:
-        try:
-            services = get_service_server_info(
-                node=node, remote_node_name=n.full_name, include_hidden=True)
-        except rclpy.node.NodeNameNonExistentError:
-            continue
+        if services_by_node is not None:
+            services = services_by_node.get(n.full_name)
+            if services is None:
+                continue
+        else:
+            try:
+                services = get_service_server_info(
+                    node=node, remote_node_name=n.full_name, include_hidden=True)
+            except rclpy.node.NodeNameNonExistentError:
+                continue
         if not any(s.name.endswith('_container/load_node') and
                    'composition_interfaces/srv/LoadNode' in s.types
                    for s in services):
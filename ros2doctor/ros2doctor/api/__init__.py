@@ -16,12 +16,7 @@ from typing import List
 from typing import Set
 from typing import Tuple
 
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata
-
-from ros2cli.node.strategy import NodeStrategy
+from ros2cli.entry_points import get_entry_points
 from ros2doctor.api.format import doctor_warn
 
 
@@ -91,11 +86,7 @@ def run_checks(*, include_warnings=False) -> Tuple[Set[str], int, int]:
     fail_categories = set()  # remove repeating elements
     fail = 0
     total = 0
-    entry_points = importlib_metadata.entry_points()
-    if hasattr(entry_points, 'select'):
-        groups = entry_points.select(group='ros2doctor.checks')
-    else:
-        groups = entry_points.get('ros2doctor.checks', [])
+    groups = get_entry_points('ros2doctor.checks').values()
     for check_entry_pt in groups:
         try:
             check_class = check_entry_pt.load()
@@ -126,11 +117,7 @@ def generate_reports(*, categories=None) -> List[Report]:
     :return: list of Report objects
     """
     reports = []
-    entry_points = importlib_metadata.entry_points()
-    if hasattr(entry_points, 'select'):
-        groups = entry_points.select(group='ros2doctor.report')
-    else:
-        groups = entry_points.get('ros2doctor.report', [])
+    groups = get_entry_points('ros2doctor.report').values()
     for report_entry_pt in groups:
         try:
             report_class = report_entry_pt.load()
@@ -157,6 +144,9 @@ def generate_reports(*, categories=None) -> List[Report]:
 
 def get_topic_names(skip_topics: List = ()) -> List:
     """Get all topic names using rclpy API."""
+    # import lazily to not load rclpy when merely listing the doctor command
+    from ros2cli.node.strategy import NodeStrategy
+
     topics = []
     with NodeStrategy(None) as node:
         topic_names_types = node.get_topic_names_and_types()
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ros2cli.node.direct import DirectNode
+from ros2cli.node.strategy import NodeStrategy
 from ros2doctor.api import DoctorCheck
 from ros2doctor.api import DoctorReport
 from ros2doctor.api import get_topic_names
@@ -24,6 +24,16 @@ from ros2doctor.api.format import doctor_warn
 SKIP_TOPICS = ['/parameter_events', '/rosout']
 
 
+def _count_publishers_and_subscribers(node, topics):
+    """Count publishers and subscribers of each topic, in a single query batch."""
+    batch = node.batch()
+    for topic in topics:
+        batch.count_publishers(topic)
+        batch.count_subscribers(topic)
+    counts = batch.flush()
+    return list(zip(counts[::2], counts[1::2]))
+
+
 class TopicCheck(DoctorCheck):
     """Check for pub without sub or sub without pub."""
 
@@ -34,10 +44,9 @@ class TopicCheck(DoctorCheck):
         """Check publisher and subscriber counts."""
         result = Result()
         to_be_checked = get_topic_names(skip_topics=SKIP_TOPICS)
-        with DirectNode(None) as node:
-            for topic in to_be_checked:
-                pub_count = node.count_publishers(topic)
-                sub_count = node.count_subscribers(topic)
+        with NodeStrategy(None) as node:
+            counts = _count_publishers_and_subscribers(node, to_be_checked)
+            for topic, (pub_count, sub_count) in zip(to_be_checked, counts):
                 if pub_count > 0 and sub_count == 0:
                     doctor_warn(f'Publisher without subscriber detected on {topic}.')
                     result.add_warning()
@@ -60,9 +69,10 @@ class TopicReport(DoctorReport):
             report.add_to_report('topic', 'none')
             report.add_to_report('publisher count', 0)
             report.add_to_report('subscriber count', 0)
-        with DirectNode(None) as node:
-            for topic in to_be_reported:
+        with NodeStrategy(None) as node:
+            counts = _count_publishers_and_subscribers(node, to_be_reported)
+            for topic, (pub_count, sub_count) in zip(to_be_reported, counts):
                 report.add_to_report('topic', topic)
-                report.add_to_report('publisher count', node.count_publishers(topic))
-                report.add_to_report('subscriber count', node.count_subscribers(topic))
+                report.add_to_report('publisher count', pub_count)
+                report.add_to_report('subscriber count', sub_count)
         return report
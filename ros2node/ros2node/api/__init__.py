@@ -27,6 +27,9 @@ INFO_NONUNIQUE_WARNING_TEMPLATE = (
 
 NodeName = namedtuple('NodeName', ('name', 'namespace', 'full_name'))
 TopicInfo = namedtuple('Topic', ('name', 'types'))
+NodeEndpoints = namedtuple('NodeEndpoints', (
+    'node_name', 'subscribers', 'publishers', 'service_servers',
+    'service_clients', 'action_servers', 'action_clients'))
 
 
 def _is_hidden_name(name):
@@ -81,6 +84,12 @@ def wait_for_node(node, node_name, include_hidden_nodes=False, timeout=1.0) -> b
     return wait_for(node_available, timeout)
 
 
+def _to_topic_infos(names_and_types, include_hidden):
+    return [
+        TopicInfo(name=n, types=t)
+        for n, t in names_and_types if include_hidden or not _is_hidden_name(n)]
+
+
 def get_topics(remote_node_name, func, *, include_hidden_topics=False):
     node = parse_node_name(remote_node_name)
     names_and_types = func(node.name, node.namespace)
@@ -145,6 +154,75 @@ def get_action_client_info(*, node, remote_node_name, include_hidden=False):
         for n, t in names_and_types if include_hidden or not _is_hidden_name(n)]
 
 
+def get_node_endpoints(*, node, remote_node_name, include_hidden=False):
+    """
+    Get the endpoints of a node.
+
+    With a `ros2cli.node.strategy.NodeStrategy`, all endpoints are queried
+    in a single batch.
+
+    :param node: a node-like instance
+    :param remote_node_name: the full name of the node to query
+    :return: a `NodeEndpoints` instance
+    """
+    remote_node = parse_node_name(remote_node_name)
+    queries = (
+        'get_subscriber_names_and_types_by_node',
+        'get_publisher_names_and_types_by_node',
+        'get_service_names_and_types_by_node',
+        'get_client_names_and_types_by_node',
+        'get_action_server_names_and_types_by_node',
+        'get_action_client_names_and_types_by_node',
+    )
+    if isinstance(node, NodeStrategy):
+        batch = node.batch()
+        for query in queries:
+            getattr(batch, query)(remote_node.name, remote_node.namespace)
+        results = batch.flush()
+    else:
+        results = [
+            getattr(node, query)(remote_node.name, remote_node.namespace)
+            for query in queries
+        ]
+    return NodeEndpoints(remote_node, *(
+        _to_topic_infos(names_and_types, include_hidden) for names_and_types in results))
+
+
+def get_node_graph(*, node, include_hidden=False):
+    """
+    Get the endpoints of all nodes in the graph with a single daemon query.
+
+    Querying the whole graph is only worth it if it saves round trips to the
+    daemon, e.g. a `ros2cli.node.direct.DirectNode` answers per node queries
+    just as fast.
+
+    :param node: a `ros2cli.node.strategy.NodeStrategy` instance
+    :param include_hidden: whether to include hidden nodes and endpoints
+    :return: a list of `NodeEndpoints` instances, or `None` if `node` does not
+      use a daemon that supports querying the whole graph at once
+    """
+    if not isinstance(node, NodeStrategy):
+        return None
+    daemon_node = node.daemon_node
+    if daemon_node is None or 'get_node_graph' not in daemon_node.methods:
+        return None
+
+    node_graph = []
+    for name, namespace, endpoints in daemon_node.get_node_graph():
+        if not include_hidden and (not name or name.startswith(HIDDEN_NODE_PREFIX)):
+            continue
+        node_graph.append(NodeEndpoints(
+            node_name=NodeName(
+                name=name,
+                namespace=namespace,
+                full_name=namespace + ('' if namespace.endswith('/') else '/') + name),
+            **{
+                kind: _to_topic_infos(endpoints[kind], include_hidden)
+                for kind in NodeEndpoints._fields[1:]
+            }))
+    return node_graph
+
+
 class NodeNameCompleter:
     """Callable returning a list of node names."""
 
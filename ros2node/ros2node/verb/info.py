@@ -16,13 +16,9 @@ import sys
 
 from ros2cli.node.strategy import add_arguments
 from ros2cli.node.strategy import NodeStrategy
-from ros2node.api import get_action_client_info
-from ros2node.api import get_action_server_info
+from ros2node.api import get_node_endpoints
+from ros2node.api import get_node_graph
 from ros2node.api import get_node_names
-from ros2node.api import get_publisher_info
-from ros2node.api import get_service_client_info
-from ros2node.api import get_service_server_info
-from ros2node.api import get_subscriber_info
 from ros2node.api import INFO_NONUNIQUE_WARNING_TEMPLATE
 from ros2node.api import NodeNameCompleter
 from ros2node.verb import VerbExtension
@@ -47,7 +43,12 @@ class InfoVerb(VerbExtension):
 
     def main(self, *, args):
         with NodeStrategy(args) as node:
-            node_names = get_node_names(node=node, include_hidden_nodes=args.include_hidden)
+            node_graph = get_node_graph(node=node, include_hidden=args.include_hidden)
+            if node_graph is not None:
+                node_names = [endpoints.node_name for endpoints in node_graph]
+            else:
+                node_names = get_node_names(
+                    node=node, include_hidden_nodes=args.include_hidden)
             count = [n.full_name for n in node_names].count(args.node_name)
             if count > 1:
                 print(
@@ -56,29 +57,25 @@ class InfoVerb(VerbExtension):
                     file=sys.stderr)
             if count > 0:
                 print(args.node_name)
-                subscribers = get_subscriber_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                if node_graph is not None:
+                    endpoints = next(
+                        endpoints for endpoints in node_graph
+                        if endpoints.node_name.full_name == args.node_name)
+                else:
+                    endpoints = get_node_endpoints(
+                        node=node, remote_node_name=args.node_name,
+                        include_hidden=args.include_hidden)
                 print('  Subscribers:')
-                print_names_and_types(subscribers)
-                publishers = get_publisher_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                print_names_and_types(endpoints.subscribers)
                 print('  Publishers:')
-                print_names_and_types(publishers)
-                service_servers = get_service_server_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                print_names_and_types(endpoints.publishers)
                 print('  Service Servers:')
-                print_names_and_types(service_servers)
-                service_clients = get_service_client_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                print_names_and_types(endpoints.service_servers)
                 print('  Service Clients:')
-                print_names_and_types(service_clients)
-                actions_servers = get_action_server_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                print_names_and_types(endpoints.service_clients)
                 print('  Action Servers:')
-                print_names_and_types(actions_servers)
-                actions_clients = get_action_client_info(
-                    node=node, remote_node_name=args.node_name, include_hidden=args.include_hidden)
+                print_names_and_types(endpoints.action_servers)
                 print('  Action Clients:')
-                print_names_and_types(actions_clients)
+                print_names_and_types(endpoints.action_clients)
             else:
                 return "Unable to find node '" + args.node_name + "'"
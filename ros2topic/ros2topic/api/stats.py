@@ -0,0 +1,295 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Windowed statistics for ``ros2 topic hz``, ``delay`` and ``bw``.
+
+Statistics are maintained incrementally as values enter and leave the
+window, so that both recording a value and getting statistics take constant
+(amortized) time, regardless of the window size.
+Percentiles are optionally estimated from a `QuantileSketch` of the window.
+"""
+
+import collections
+import math
+
+PERCENTILES = (0.5, 0.9, 0.99, 0.999)
+
+HISTOGRAM_BIN_COUNT = 10
+
+HISTOGRAM_BAR_WIDTH = 40
+
+
+class QuantileSketch:
+    """
+    A histogram of integer values with logarithmic buckets, to estimate quantiles.
+
+    As in HDR histograms, values up to ``2**precision`` are counted exactly,
+    and larger values in buckets whose width is at most ``2**(1 - precision)``
+    times their lower bound, bounding the relative error of estimates.
+    Values can be removed as well as added, for the sketch to follow a window
+    of values, and memory use depends on the range of the values rather than
+    on how many values are counted.
+    """
+
+    def __init__(self, precision=8):
+        """
+        Construct a QuantileSketch.
+
+        :param precision: number of significant bits of bucketed values.
+        """
+        self._precision = precision
+        self._exact_limit = 1 << precision
+        self._buckets = {}
+        self.count = 0
+
+    def _get_key(self, value):
+        if value < 0:
+            # keys of negative values sort before, and in reverse
+            return -1 - self._get_key(-value)
+        if value < self._exact_limit:
+            return value
+        shift = value.bit_length() - self._precision
+        return (shift << (self._precision - 1)) + (value >> shift)
+
+    def _get_bounds(self, key):
+        """Get the integer range ``[lower, upper)`` of values counted by a bucket."""
+        if key < 0:
+            lower, upper = self._get_bounds(-1 - key)
+            return 1 - upper, 1 - lower
+        if key < self._exact_limit:
+            return key, key + 1
+        shift = (key >> (self._precision - 1)) - 1
+        mantissa = key - (shift << (self._precision - 1))
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def _get_estimate(self, key):
+        lower, upper = self._get_bounds(key)
+        return (lower + upper - 1) / 2
+
+    def clear(self):
+        """Forget all values."""
+        self._buckets.clear()
+        self.count = 0
+
+    def add(self, value):
+        key = self._get_key(int(value))
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        self.count += 1
+
+    def remove(self, value):
+        """Remove a value, which must have been added before."""
+        key = self._get_key(int(value))
+        count = self._buckets[key] - 1
+        if count:
+            self._buckets[key] = count
+        else:
+            del self._buckets[key]
+        self.count -= 1
+
+    def quantile(self, fraction):
+        """
+        Estimate a quantile of the values.
+
+        :param fraction: the quantile, as a fraction in the [0, 1] range.
+        :return: the estimated value, or `None` if there are no values.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(fraction * self.count), 1)
+        seen = 0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen >= rank:
+                return self._get_estimate(key)
+        return self._get_estimate(key)
+
+    def histogram(self, low, high, bin_count):
+        """
+        Count values in bins of equal width.
+
+        :param low: lower bound of the first bin.
+        :param high: upper bound of the last bin.
+        :param bin_count: number of bins.
+        :return: list of counts, one per bin.
+        """
+        bins = [0] * bin_count
+        width = (high - low) / bin_count
+        for key, count in self._buckets.items():
+            if width > 0:
+                index = int((self._get_estimate(key) - low) / width)
+            else:
+                index = 0
+            bins[min(max(index, 0), bin_count - 1)] += count
+        return bins
+
+
+def get_percentile_name(fraction):
+    """Get the name of a percentile, e.g. ``'p99.9'`` for ``0.999``."""
+    return 'p%g' % (fraction * 100)
+
+
+def format_distribution(stats, format_value):
+    """
+    Format the percentiles and histogram of windowed statistics for printing.
+
+    :param stats: `WindowedStats` tracking percentiles, with values.
+    :param format_value: function formatting values.
+    :return: list of lines.
+    """
+    percentiles = ' '.join(
+        '%s: %s' % (get_percentile_name(fraction), format_value(stats.percentile(fraction)))
+        for fraction in PERCENTILES)
+    return [percentiles, *format_histogram(
+        stats.min, stats.max, stats.histogram(), format_value)]
+
+
+def format_histogram(low, high, bins, format_value):
+    """
+    Format a histogram for printing, as text lines of bars.
+
+    :param low: lower bound of the first bin.
+    :param high: upper bound of the last bin.
+    :param bins: list of counts, see `WindowedStats.histogram()`.
+    :param format_value: function formatting the bounds of bins.
+    :return: list of lines.
+    """
+    width = (high - low) / len(bins)
+    max_count = max(bins)
+    bounds = [format_value(low + i * width) for i in range(len(bins) + 1)]
+    bound_width = max(len(bound) for bound in bounds)
+    lines = []
+    for i, count in enumerate(bins):
+        bar = '#' * math.ceil(count * HISTOGRAM_BAR_WIDTH / max_count) if max_count else ''
+        lines.append('%s - %s |%s| %d' % (
+            bounds[i].rjust(bound_width), bounds[i + 1].rjust(bound_width),
+            bar.ljust(HISTOGRAM_BAR_WIDTH), count))
+    return lines
+
+
+class WindowedStats:
+    """
+    Statistics of the last values recorded, up to a window size.
+
+    Values are expected to be integers, e.g. durations in nanoseconds or
+    sizes in bytes, for which running sums are exact and the variance does
+    not drift as values leave the window.
+    Floating point values are supported, within the usual rounding errors,
+    except for percentiles which are estimated from integer values.
+    """
+
+    def __init__(self, window_size, *, track_percentiles=False):
+        """
+        Construct a WindowedStats.
+
+        :param window_size: maximum number of values to keep.
+        :param track_percentiles: whether to maintain a `QuantileSketch`
+          of the values, see `percentile()` and `histogram()`.
+        """
+        self.window_size = window_size
+        self._sketch = QuantileSketch() if track_percentiles else None
+        self._values = collections.deque()
+        self._sum = 0
+        self._sum_of_squares = 0
+        # monotonic queues of (index, value) pairs, the front of which
+        # is the minimum, respectively the maximum, of the window
+        self._min_queue = collections.deque()
+        self._max_queue = collections.deque()
+        self._count = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __bool__(self):
+        return bool(self._values)
+
+    def clear(self):
+        """Forget all values."""
+        self._values.clear()
+        self._sum = 0
+        self._sum_of_squares = 0
+        self._min_queue.clear()
+        self._max_queue.clear()
+        if self._sketch is not None:
+            self._sketch.clear()
+
+    def append(self, value):
+        """Record a value, forgetting the oldest one if the window is full."""
+        if len(self._values) >= self.window_size:
+            oldest = self._values.popleft()
+            self._sum -= oldest
+            self._sum_of_squares -= oldest * oldest
+            oldest_index = self._count - self.window_size
+            if self._min_queue[0][0] == oldest_index:
+                self._min_queue.popleft()
+            if self._max_queue[0][0] == oldest_index:
+                self._max_queue.popleft()
+            if self._sketch is not None:
+                self._sketch.remove(oldest)
+        self._values.append(value)
+        self._sum += value
+        self._sum_of_squares += value * value
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((self._count, value))
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((self._count, value))
+        self._count += 1
+        if self._sketch is not None:
+            self._sketch.add(value)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def mean(self):
+        return self._sum / len(self._values)
+
+    @property
+    def min(self):
+        return self._min_queue[0][1]
+
+    @property
+    def max(self):
+        return self._max_queue[0][1]
+
+    @property
+    def std_dev(self):
+        """Get the (population) standard deviation of the values."""
+        n = len(self._values)
+        variance = (n * self._sum_of_squares - self._sum * self._sum) / (n * n)
+        return math.sqrt(max(variance, 0))
+
+    @property
+    def tracks_percentiles(self):
+        return self._sketch is not None
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile of the values, if tracked.
+
+        :param fraction: the percentile, as a fraction in the [0, 1] range.
+        """
+        return min(max(self._sketch.quantile(fraction), self.min), self.max)
+
+    def histogram(self, bin_count=HISTOGRAM_BIN_COUNT):
+        """
+        Count values, if percentiles are tracked, in bins of equal width.
+
+        :param bin_count: number of bins between the min and max values.
+        :return: list of counts, one per bin.
+        """
+        return self._sketch.histogram(self.min, self.max, bin_count)
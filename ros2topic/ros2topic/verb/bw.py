@@ -29,6 +29,7 @@
 # This file is originally from:
 # https://github.com/ros/ros_comm/blob/6e5016f4b2266d8a60c9a1e163c4928b8fc7115e/tools/rostopic/src/rostopic/__init__.py
 
+import collections
 import sys
 import threading
 import traceback
@@ -40,6 +41,8 @@ from ros2cli.node.direct import DirectNode
 from ros2topic.api import get_msg_class
 from ros2topic.api import positive_int
 from ros2topic.api import TopicNameCompleter
+from ros2topic.api.stats import format_distribution
+from ros2topic.api.stats import WindowedStats
 from ros2topic.verb import VerbExtension
 
 DEFAULT_WINDOW_SIZE = 100
@@ -70,20 +73,26 @@ class BwVerb(VerbExtension):
             '--window', '-w', type=positive_int, default=DEFAULT_WINDOW_SIZE,
             help='maximum window size, in # of messages, for calculating rate '
                  f'(default: {DEFAULT_WINDOW_SIZE})', metavar='WINDOW')
+        parser.add_argument(
+            '--percentiles', action='store_true',
+            help='also print percentiles and a histogram of message sizes, '
+                 'estimated with bounded memory')
         add_direct_node_arguments(parser)
 
     def main(self, *, args):
         with DirectNode(args) as node:
-            _rostopic_bw(node.node, args.topic, window_size=args.window)
+            _rostopic_bw(
+                node.node, args.topic, window_size=args.window, percentiles=args.percentiles)
 
 
 class ROSTopicBandwidth(object):
 
-    def __init__(self, node, window_size):
+    def __init__(self, node, window_size, percentiles=False):
         self.lock = threading.Lock()
         self.last_printed_tn = 0
-        self.sizes = []
-        self.times = []
+        self.sizes = WindowedStats(window_size, track_percentiles=percentiles)
+        self.percentiles = percentiles
+        self.times = collections.deque(maxlen=window_size)
         self.window_size = window_size
         self.use_sim_time = node.get_parameter('use_sim_time').value
         self.clock = node.get_clock()
@@ -98,10 +107,6 @@ class ROSTopicBandwidth(object):
                 # inefficient. Optimize here if a better solution is found.
                 self.sizes.append(len(data))  # AnyMsg instance
                 assert len(self.times) == len(self.sizes)
-
-                if len(self.times) > self.window_size:
-                    self.times.pop(0)
-                    self.sizes.pop(0)
             except Exception:
                 traceback.print_exc()
 
@@ -115,17 +120,14 @@ class ROSTopicBandwidth(object):
             t0 = self.times[0]
             if tn <= t0:
                 print('WARNING: time is reset!', file=sys.stderr)
-                self.times = []
-                self.sizes = []
+                self.times.clear()
+                self.sizes.clear()
                 return None, None, None, None, None
 
-            total = sum(self.sizes)
-            bytes_per_s = total / ((tn.nanoseconds - t0.nanoseconds) * 1.e-9)
-            mean = total / n
-
-            # min and max
-            max_s = max(self.sizes)
-            min_s = min(self.sizes)
+            bytes_per_s = self.sizes.sum / ((tn.nanoseconds - t0.nanoseconds) * 1.e-9)
+            mean = self.sizes.mean
+            max_s = self.sizes.max
+            min_s = self.sizes.min
 
         return bytes_per_s, n, mean, min_s, max_s
 
@@ -138,19 +140,25 @@ class ROSTopicBandwidth(object):
         # min/max and even mean are likely to be much smaller,
         # but for now I prefer unit consistency
         if bytes_per_s < 1000:
-            bw, mean, min_s, max_s = map(str_bytes, (bytes_per_s, mean, min_s, max_s))
+            str_size = str_bytes
         elif bytes_per_s < 1000000:
-            bw, mean, min_s, max_s = map(str_kilobytes, (bytes_per_s, mean, min_s, max_s))
+            str_size = str_kilobytes
         else:
-            bw, mean, min_s, max_s = map(str_megabytes, (bytes_per_s, mean, min_s, max_s))
+            str_size = str_megabytes
+        bw, mean, min_s, max_s = map(str_size, (bytes_per_s, mean, min_s, max_s))
 
         # Bandwidth is per second
         bw += '/s'
 
         print(f'{bw} from {n} messages\n\tMessage size mean: {mean} min: {min_s} max: {max_s}')
+        if self.percentiles:
+            with self.lock:
+                lines = format_distribution(self.sizes, str_size) if self.sizes else []
+            for line in lines:
+                print('\t' + line)
 
 
-def _rostopic_bw(node, topic, window_size=DEFAULT_WINDOW_SIZE):
+def _rostopic_bw(node, topic, window_size=DEFAULT_WINDOW_SIZE, percentiles=False):
     """Periodically print the received bandwidth of a topic to console until shutdown."""
     # pause bw until topic is published
     msg_class = get_msg_class(node, topic, blocking=True, include_hidden_topics=True)
@@ -158,7 +166,7 @@ def _rostopic_bw(node, topic, window_size=DEFAULT_WINDOW_SIZE):
         node.destroy_node()
         return
 
-    rt = ROSTopicBandwidth(node, window_size)
+    rt = ROSTopicBandwidth(node, window_size, percentiles=percentiles)
     node.create_subscription(
         msg_class,
         topic,
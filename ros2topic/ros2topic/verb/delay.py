@@ -29,8 +29,6 @@
 # This file is originally from:
 # https://github.com/ros/ros_comm/blob/6e5016f4b2266d8a60c9a1e163c4928b8fc7115e/tools/rostopic/src/rostopic/__init__.py
 
-import math
-
 import rclpy
 
 from rclpy.qos import qos_profile_sensor_data
@@ -40,6 +38,8 @@ from ros2cli.node.direct import DirectNode
 from ros2topic.api import get_msg_class
 from ros2topic.api import positive_int
 from ros2topic.api import TopicNameCompleter
+from ros2topic.api.stats import format_distribution
+from ros2topic.api.stats import WindowedStats
 from ros2topic.verb import VerbExtension
 
 DEFAULT_WINDOW_SIZE = 10000
@@ -58,6 +58,10 @@ class DelayVerb(VerbExtension):
             '--window', '-w', type=positive_int, default=DEFAULT_WINDOW_SIZE,
             help='window size, in # of messages, for calculating rate, '
                  'string to (default: %d)' % DEFAULT_WINDOW_SIZE)
+        parser.add_argument(
+            '--percentiles', action='store_true',
+            help='also print percentiles and a histogram of the delays, '
+                 'estimated with bounded memory')
         add_direct_node_arguments(parser)
 
     def main(self, *, args):
@@ -67,19 +71,20 @@ class DelayVerb(VerbExtension):
 def main(args):
     with DirectNode(args) as node:
         _rostopic_delay(
-            node.node, args.topic, window_size=args.window)
+            node.node, args.topic, window_size=args.window, percentiles=args.percentiles)
 
 
 class ROSTopicDelay(object):
     """Receives messages for a topic and computes timestamp delay."""
 
-    def __init__(self, node, window_size):
+    def __init__(self, node, window_size, percentiles=False):
         import threading
         self.lock = threading.Lock()
         self.last_msg_tn = 0
         self.msg_t0 = -1.
         self.msg_tn = 0
-        self.delays = []
+        self.delays = WindowedStats(window_size, track_percentiles=percentiles)
+        self.percentiles = percentiles
 
         self.window_size = window_size
 
@@ -100,23 +105,20 @@ class ROSTopicDelay(object):
             if curr_rostime.nanoseconds == 0:
                 if len(self.delays) > 0:
                     print('time has reset, resetting counters')
-                    self.delays = []
+                    self.delays.clear()
                 return
 
             curr = curr_rostime.nanoseconds
             if self.msg_t0 < 0 or self.msg_t0 > curr:
                 self.msg_t0 = curr
                 self.msg_tn = curr
-                self.delays = []
+                self.delays.clear()
             else:
                 # store the duration nanoseconds in self.delays
                 duration = (curr_rostime - Time.from_msg(msg.header.stamp))
                 self.delays.append(duration.nanoseconds)
                 self.msg_tn = curr
 
-            if len(self.delays) > self.window_size:
-                self.delays.pop(0)
-
     def get_delay(self):
         """
         Calculate the average publishing delay.
@@ -131,12 +133,10 @@ class ROSTopicDelay(object):
             if not self.delays:
                 return
             n = len(self.delays)
-
-            mean = sum(self.delays) / n
-            std_dev = math.sqrt(sum((x - mean)**2 for x in self.delays) / n)
-
-            max_delta = max(self.delays)
-            min_delta = min(self.delays)
+            mean = self.delays.mean
+            std_dev = self.delays.std_dev
+            max_delta = self.delays.max
+            min_delta = self.delays.min
 
             self.last_msg_tn = self.msg_tn
         return mean, min_delta, max_delta, std_dev, n
@@ -153,15 +153,26 @@ class ROSTopicDelay(object):
         # convert nanoseconds to seconds when print
         print('average delay: %.3f\n\tmin: %.3fs max: %.3fs std dev: %.5fs window: %s'
               % (delay * 1e-9, min_delta * 1e-9, max_delta * 1e-9, std_dev * 1e-9, window))
+        if self.percentiles:
+            with self.lock:
+                lines = format_distribution(
+                    self.delays, _format_duration) if self.delays else []
+            for line in lines:
+                print('\t' + line)
+
+
+def _format_duration(nanoseconds):
+    return '%.3fs' % (nanoseconds * 1e-9)
 
 
-def _rostopic_delay(node, topic, window_size=DEFAULT_WINDOW_SIZE):
+def _rostopic_delay(node, topic, window_size=DEFAULT_WINDOW_SIZE, percentiles=False):
     """
     Periodically print the publishing delay of a topic to console until shutdown.
 
     :param topic: topic name, ``str``
     :param window_size: number of messages to average over, ``unsigned_int``
     :param blocking: pause delay until topic is published, ``bool``
+    :param percentiles: also print percentiles and a histogram of delays, ``bool``
     """
     # pause hz until topic is published
     msg_class = get_msg_class(node, topic, blocking=True, include_hidden_topics=True)
@@ -170,7 +181,7 @@ def _rostopic_delay(node, topic, window_size=DEFAULT_WINDOW_SIZE):
         node.destroy_node()
         return
 
-    rt = ROSTopicDelay(node, window_size)
+    rt = ROSTopicDelay(node, window_size, percentiles=percentiles)
     node.create_subscription(
         msg_class,
         topic,
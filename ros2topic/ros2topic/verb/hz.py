@@ -31,32 +31,49 @@
 
 from collections import defaultdict
 
+import fnmatch
 import functools
-import math
+import re
 import threading
+import time
 
 import rclpy
 
 from rclpy.clock import Clock
 from rclpy.clock import ClockType
+from rclpy.expand_topic_name import expand_topic_name
 from rclpy.qos import qos_profile_sensor_data
+from rclpy.topic_or_service_is_hidden import topic_or_service_is_hidden
 from ros2cli.node.direct import add_arguments as add_direct_node_arguments
 from ros2cli.node.direct import DirectNode
 from ros2topic.api import get_msg_class
+from ros2topic.api import get_topic_names_and_types
 from ros2topic.api import positive_int
 from ros2topic.api import TopicNameCompleter
+from ros2topic.api.stats import format_distribution
+from ros2topic.api.stats import get_percentile_name
+from ros2topic.api.stats import PERCENTILES
+from ros2topic.api.stats import WindowedStats
 from ros2topic.verb import VerbExtension
+from rosidl_runtime_py.utilities import get_message
 
 DEFAULT_WINDOW_SIZE = 10000
 
+# how often, in seconds, rates of multiple topics are printed
+# and topic name patterns are matched against the graph again
+TABLE_PERIOD = 1.0
+
+MESSAGE_TIMESTAMPS = ('source', 'received')
+
 
 class HzVerb(VerbExtension):
     """Print the average publishing rate to screen."""
 
     def add_arguments(self, parser, cli_name):
         arg = parser.add_argument(
-            'topic_name',
-            help="Name of the ROS topic to listen to (e.g. '/chatter')")
+            'topic_list', nargs='+', metavar='topic_name',
+            help="Names of the ROS topics to listen to (e.g. '/chatter'), "
+                 "or glob patterns matching them (e.g. '/camera/*')")
         arg.completer = TopicNameCompleter(
             include_hidden_topics_key='include_hidden_topics')
         parser.add_argument(
@@ -68,11 +85,25 @@ class HzVerb(VerbExtension):
             '--filter',
             dest='filter_expr', default=None,
             help='only measure messages matching the specified Python expression', metavar='EXPR')
-        parser.add_argument(
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
             '--wall-time',
             dest='use_wtime', default=False, action='store_true',
             help='calculates rate using wall time which can be helpful'
                  ' when clock is not published during simulation')
+        group.add_argument(
+            '--message-timestamp', choices=MESSAGE_TIMESTAMPS, default=None,
+            help='calculates rate using the timestamps of messages reported by the '
+                 'middleware, when they were published (source) or received, '
+                 'which is not affected by delays in handling messages')
+        parser.add_argument(
+            '--percentiles', action='store_true',
+            help='also print percentiles and a histogram of the intervals '
+                 'between messages, estimated with bounded memory')
+        parser.add_argument(
+            '--regex', action='store_true',
+            help='match topic names against the given regular expressions '
+                 'instead of glob patterns')
         add_direct_node_arguments(parser)
 
     def main(self, *, args):
@@ -80,7 +111,6 @@ class HzVerb(VerbExtension):
 
 
 def main(args):
-    topic = args.topic_name
     if args.filter_expr:
         def expr_eval(expr):
             def eval_fn(m):
@@ -91,25 +121,33 @@ def main(args):
         filter_expr = None
 
     with DirectNode(args) as node:
-        _rostopic_hz(node.node, topic, window_size=args.window_size, filter_expr=filter_expr,
-                     use_wtime=args.use_wtime)
+        _rostopic_hz(node.node, args.topic_list, window_size=args.window_size,
+                     filter_expr=filter_expr, use_wtime=args.use_wtime, use_regex=args.regex,
+                     message_timestamp=args.message_timestamp, percentiles=args.percentiles)
 
 
 class ROSTopicHz(object):
     """ROSTopicHz receives messages for a topic and computes frequency."""
 
-    def __init__(self, node, window_size, filter_expr=None, use_wtime=False):
+    def __init__(
+        self, node, window_size, filter_expr=None, use_wtime=False, message_timestamp=None,
+        percentiles=False
+    ):
         self.lock = threading.Lock()
         self.last_printed_tn = 0
         self.msg_t0 = -1
         self.msg_tn = 0
-        self.times = []
+        self.times = WindowedStats(window_size, track_percentiles=percentiles)
         self._last_printed_tn = defaultdict(int)
         self._msg_t0 = defaultdict(lambda: -1)
         self._msg_tn = defaultdict(int)
-        self._times = defaultdict(list)
+        self._times = defaultdict(
+            lambda: WindowedStats(window_size, track_percentiles=percentiles))
         self.filter_expr = filter_expr
         self.use_wtime = use_wtime
+        self.message_timestamp = message_timestamp
+        self.percentiles = percentiles
+        self._message_timestamp_missing = False
 
         self.window_size = window_size
 
@@ -160,7 +198,7 @@ class ROSTopicHz(object):
         """
         Calculate interval time.
 
-        :param m: Message instance
+        :param m: Message instance, or serialized message if no filter is used
         :param topic: Topic name
         """
         # ignore messages that don't match filter
@@ -175,27 +213,61 @@ class ROSTopicHz(object):
             if curr_rostime.nanoseconds == 0:
                 if len(self.get_times(topic=topic)) > 0:
                     print('time has reset, resetting counters')
-                    self.set_times([], topic=topic)
+                    self.get_times(topic=topic).clear()
                 return
 
-            curr = curr_rostime.nanoseconds
-            msg_t0 = self.get_msg_t0(topic=topic)
-            if msg_t0 < 0 or msg_t0 > curr:
-                self.set_msg_t0(curr, topic=topic)
-                self.set_msg_tn(curr, topic=topic)
-                self.set_times([], topic=topic)
-            else:
-                self.get_times(topic=topic).append(curr - self.get_msg_tn(topic=topic))
-                self.set_msg_tn(curr, topic=topic)
+            self._record_time(curr_rostime.nanoseconds, topic=topic)
 
-            if len(self.get_times(topic=topic)) > self.window_size:
-                self.get_times(topic=topic).pop(0)
+    def callback_hz_with_info(self, m, info, topic=None):
+        """
+        Calculate interval time from the timestamp of a message.
 
-    def get_hz(self, topic=None):
+        :param m: Message instance, or serialized message if no filter is used
+        :param info: Message info, as provided by the middleware
+        :param topic: Topic name
+        """
+        # ignore messages that don't match filter
+        if self.filter_expr is not None and not self.filter_expr(m):
+            return
+        curr = info[self.message_timestamp + '_timestamp']
+        with self.lock:
+            if not curr:
+                if not self._message_timestamp_missing:
+                    print('WARNING: the middleware does not provide %s timestamps' %
+                          self.message_timestamp)
+                    self._message_timestamp_missing = True
+                return
+            self._record_time(curr, topic=topic)
+
+    def get_callback(self, topic=None):
+        """Get the subscription callback for a topic, according to the time source in use."""
+        if self.message_timestamp is None:
+            return functools.partial(self.callback_hz, topic=topic)
+        return functools.partial(self.callback_hz_with_info, topic=topic)
+
+    def _record_time(self, curr, topic=None):
+        # callers hold the lock
+        msg_t0 = self.get_msg_t0(topic=topic)
+        if msg_t0 < 0 or msg_t0 > curr:
+            self.set_msg_t0(curr, topic=topic)
+            self.set_msg_tn(curr, topic=topic)
+            self.get_times(topic=topic).clear()
+        elif curr < self.get_msg_tn(topic=topic):
+            # e.g. message timestamps from the clocks of several publishers,
+            # or messages delivered out of order: skip rather than record
+            # a negative interval
+            return
+        else:
+            self.get_times(topic=topic).append(curr - self.get_msg_tn(topic=topic))
+            self.set_msg_tn(curr, topic=topic)
+
+    def get_hz(self, topic=None, *, min_interval=1e9):
         """
         Calculate the average publishing rate.
 
         :param topic: topic name, ``list`` of ``str``
+        :param min_interval: minimum duration, in nanoseconds, covered by
+          messages received since the rate was last calculated
         :returns: tuple of stat results
             (rate, min_delta, max_delta, standard deviation, window number)
             None when waiting for the first message or there is no new one
@@ -205,21 +277,17 @@ class ROSTopicHz(object):
         elif self.get_last_printed_tn(topic=topic) == 0:
             self.set_last_printed_tn(self.get_msg_tn(topic=topic), topic=topic)
             return
-        elif self.get_msg_tn(topic=topic) < self.get_last_printed_tn(topic=topic) + 1e9:
+        elif self.get_msg_tn(topic=topic) < self.get_last_printed_tn(topic=topic) + min_interval:
             return
         with self.lock:
             # Get frequency every one minute
             times = self.get_times(topic=topic)
             n = len(times)
-            mean = sum(times) / n
+            mean = times.mean
             rate = 1. / mean if mean > 0. else 0
-
-            # std dev
-            std_dev = math.sqrt(sum((x - mean)**2 for x in times) / n)
-
-            # min and max
-            max_delta = max(times)
-            min_delta = min(times)
+            std_dev = times.std_dev
+            max_delta = times.max
+            min_delta = times.min
 
             self.set_last_printed_tn(self.get_msg_tn(topic=topic), topic=topic)
 
@@ -233,17 +301,83 @@ class ROSTopicHz(object):
         rate, min_delta, max_delta, std_dev, window = ret
         print('average rate: %.3f\n\tmin: %.3fs max: %.3fs std dev: %.5fs window: %s'
               % (rate * 1e9, min_delta * 1e-9, max_delta * 1e-9, std_dev * 1e-9, window))
+        if self.percentiles:
+            with self.lock:
+                times = self.get_times(topic=topic)
+                lines = format_distribution(times, _format_duration) if times else []
+            for line in lines:
+                print('\t' + line)
         return
 
+    def print_hz_table(self, topics):
+        """Print the average publishing rates of several topics to screen, as a table."""
+        rows = []
+        for topic in topics:
+            # any newer message will do, the table is printed periodically
+            ret = self.get_hz(topic, min_interval=1)
+            if ret is None:
+                continue
+            rate, min_delta, max_delta, std_dev, window = ret
+            row = (
+                topic, '%.3f' % (rate * 1e9), '%.3fs' % (min_delta * 1e-9),
+                '%.3fs' % (max_delta * 1e-9), '%.5fs' % (std_dev * 1e-9), str(window))
+            if self.percentiles:
+                with self.lock:
+                    times = self.get_times(topic=topic)
+                    if not times:
+                        continue
+                    row += tuple(
+                        _format_duration(times.percentile(fraction))
+                        for fraction in PERCENTILES)
+            rows.append(row)
+        if not rows:
+            return
+        header = ('topic', 'rate', 'min_delta', 'max_delta', 'std_dev', 'window')
+        if self.percentiles:
+            header += tuple(get_percentile_name(fraction) for fraction in PERCENTILES)
+        widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+        for row in [header, *rows]:
+            print('  '.join(
+                [row[0].ljust(widths[0])] +
+                [value.rjust(width) for value, width in zip(row[1:], widths[1:])]))
+        print()
+
+
+def _format_duration(nanoseconds):
+    return '%.3fs' % (nanoseconds * 1e-9)
+
+
+def _is_topic_pattern(name):
+    return any(c in name for c in '*?[')
 
-def _rostopic_hz(node, topic, window_size=DEFAULT_WINDOW_SIZE, filter_expr=None, use_wtime=False):
+
+def _rostopic_hz(
+    node, topics, window_size=DEFAULT_WINDOW_SIZE, filter_expr=None, use_wtime=False,
+    use_regex=False, message_timestamp=None, percentiles=False
+):
     """
-    Periodically print the publishing rate of a topic to console until shutdown.
+    Periodically print the publishing rate of topics to console until shutdown.
 
-    :param topic: topic name, ``list`` of ``str``
+    :param topics: topic names or patterns, ``list`` of ``str``
     :param window_size: number of messages to average over, -1 for infinite, ``int``
     :param filter_expr: Python filter expression that is called with m, the message instance
+    :param use_wtime: use wall time instead of ROS time, ``bool``
+    :param use_regex: match topic names against regular expressions
+      rather than glob patterns, ``bool``
+    :param message_timestamp: use the ``'source'`` or ``'received'`` timestamps
+      of messages instead of the time they are handled, ``str``
+    :param percentiles: also print percentiles and a histogram of intervals, ``bool``
     """
+    if isinstance(topics, str):
+        topics = [topics]
+    if len(topics) > 1 or use_regex or _is_topic_pattern(topics[0]):
+        _rostopic_hz_table(
+            node, topics, window_size=window_size, filter_expr=filter_expr,
+            use_wtime=use_wtime, use_regex=use_regex, message_timestamp=message_timestamp,
+            percentiles=percentiles)
+        return
+    topic = topics[0]
+
     # pause hz until topic is published
     msg_class = get_msg_class(
         node, topic, blocking=True, include_hidden_topics=True)
@@ -252,12 +386,17 @@ def _rostopic_hz(node, topic, window_size=DEFAULT_WINDOW_SIZE, filter_expr=None,
         node.destroy_node()
         return
 
-    rt = ROSTopicHz(node, window_size, filter_expr=filter_expr, use_wtime=use_wtime)
+    rt = ROSTopicHz(
+        node, window_size, filter_expr=filter_expr, use_wtime=use_wtime,
+        message_timestamp=message_timestamp, percentiles=percentiles)
+    # only filters need the content of messages, rates can be measured
+    # without paying for the deserialization of (possibly large) messages
     node.create_subscription(
         msg_class,
         topic,
-        functools.partial(rt.callback_hz, topic=topic),
-        qos_profile_sensor_data)
+        rt.get_callback(topic),
+        qos_profile_sensor_data,
+        raw=filter_expr is None)
 
     while rclpy.ok():
         rclpy.spin_once(node)
@@ -265,3 +404,79 @@ def _rostopic_hz(node, topic, window_size=DEFAULT_WINDOW_SIZE, filter_expr=None,
 
     node.destroy_node()
     rclpy.shutdown()
+
+
+def _rostopic_hz_table(
+    node, topics, window_size=DEFAULT_WINDOW_SIZE, filter_expr=None, use_wtime=False,
+    use_regex=False, message_timestamp=None, percentiles=False
+):
+    """
+    Periodically print the publishing rates of many topics as a table, from a single node.
+
+    Topics appearing in the graph while running are subscribed to as well,
+    if they match any of the given patterns.
+    See `_rostopic_hz()` for the parameters.
+    """
+    names = set()
+    patterns = []
+    for topic in topics:
+        if use_regex:
+            try:
+                patterns.append(re.compile(topic))
+            except re.error as e:
+                raise RuntimeError(f"Invalid regular expression '{topic}': {e}")
+        elif _is_topic_pattern(topic):
+            if not topic.startswith('/'):
+                topic = '/' + topic
+            patterns.append(re.compile(fnmatch.translate(topic)))
+        else:
+            try:
+                names.add(expand_topic_name(topic, node.get_name(), node.get_namespace()))
+            except ValueError as e:
+                raise RuntimeError(e)
+
+    rt = ROSTopicHz(
+        node, window_size, filter_expr=filter_expr, use_wtime=use_wtime,
+        message_timestamp=message_timestamp, percentiles=percentiles)
+    subscribed_topics = set()
+    ignored_topics = set()
+
+    def subscribe_to_matching_topics():
+        # unlike named topics, patterns do not match hidden topics
+        for name, types in get_topic_names_and_types(node=node, include_hidden_topics=True):
+            if name in subscribed_topics or name in ignored_topics:
+                continue
+            if name not in names and not any(
+                pattern.fullmatch(name) for pattern in patterns
+                if not topic_or_service_is_hidden(name)
+            ):
+                continue
+            if len(types) > 1:
+                print("WARNING: ignoring topic '%s', as it contains more than one type: [%s]" %
+                      (name, ', '.join(types)))
+                ignored_topics.add(name)
+                continue
+            node.create_subscription(
+                get_message(types[0]),
+                name,
+                rt.get_callback(name),
+                qos_profile_sensor_data,
+                raw=filter_expr is None)
+            subscribed_topics.add(name)
+
+    subscribe_to_matching_topics()
+    for name in sorted(names.difference(subscribed_topics, ignored_topics)):
+        print('WARNING: topic [%s] does not appear to be published yet' % name)
+    if patterns and not subscribed_topics:
+        print('WARNING: no published topic matches yet')
+
+    next_print_time = time.monotonic() + TABLE_PERIOD
+    while rclpy.ok():
+        rclpy.spin_once(node, timeout_sec=max(next_print_time - time.monotonic(), 0))
+        if time.monotonic() >= next_print_time:
+            next_print_time += TABLE_PERIOD
+            subscribe_to_matching_topics()
+            rt.print_hz_table(sorted(subscribed_topics))
+
+    node.destroy_node()
+    rclpy.shutdown()
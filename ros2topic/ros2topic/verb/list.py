@@ -56,12 +56,18 @@ class ListVerb(VerbExtension):
             topic_names_and_types = get_topic_names_and_types(
                 node=node,
                 include_hidden_topics=args.include_hidden_topics)
-            for (topic_name, topic_types) in topic_names_and_types:
-                if args.verbose:
-                    pub_count = node.count_publishers(topic_name)
-                    sub_count = node.count_subscribers(topic_name)
+            if args.verbose:
+                batch = node.batch()
+                for (topic_name, _) in topic_names_and_types:
+                    batch.count_publishers(topic_name)
+                    batch.count_subscribers(topic_name)
+                counts = batch.flush()
+                for (topic_name, topic_types), pub_count, sub_count in zip(
+                    topic_names_and_types, counts[::2], counts[1::2]
+                ):
                     topic_info.append((topic_name, topic_types, pub_count, sub_count))
-                else:
+            else:
+                for (topic_name, topic_types) in topic_names_and_types:
                     topic_info.append((topic_name, topic_types, 0, 0))
 
         if args.count_topics:
@@ -0,0 +1,104 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cost of the windowed statistics of ``ros2 topic hz``.
+
+Synthetic message intervals, as from a jittery 1 kHz publisher, are fed to
+`WindowedStats` and statistics are computed once per simulated second, as
+``ros2 topic hz`` prints them.
+The list based approach it replaced is measured for comparison.
+With ``--percentiles``, percentiles and a histogram are estimated as well.
+Run as a script, e.g.::
+
+    python3 benchmark_windowed_stats.py --messages 1000000 --window 100000 --percentiles
+"""
+
+import argparse
+import math
+import random
+import time
+
+from ros2topic.api.stats import PERCENTILES
+from ros2topic.api.stats import WindowedStats
+
+RATE = 1000
+
+
+def get_intervals(num_messages):
+    rng = random.Random(0)
+    period = 10**9 // RATE
+    return [period + int(rng.gauss(0, period / 20)) for _ in range(num_messages)]
+
+
+def run_windowed_stats(intervals, window_size, percentiles=False):
+    stats = WindowedStats(window_size, track_percentiles=percentiles)
+    for i, interval in enumerate(intervals):
+        stats.append(interval)
+        if i % RATE == 0:
+            _ = stats.mean, stats.std_dev, stats.min, stats.max
+            if percentiles:
+                _ = [stats.percentile(fraction) for fraction in PERCENTILES]
+                _ = stats.histogram()
+
+
+def run_list(intervals, window_size, percentiles=False):
+    times = []
+    for i, interval in enumerate(intervals):
+        times.append(interval)
+        if len(times) > window_size:
+            times.pop(0)
+        if i % RATE == 0:
+            mean = sum(times) / len(times)
+            math.sqrt(sum((x - mean)**2 for x in times) / len(times))
+            _ = min(times), max(times)
+            if percentiles:
+                sorted_times = sorted(times)
+                _ = [
+                    sorted_times[min(int(fraction * len(times)), len(times) - 1)]
+                    for fraction in PERCENTILES
+                ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--messages', type=int, default=1000000,
+        help='number of synthetic messages (default: 1000000)')
+    parser.add_argument(
+        '--window', type=int, default=10000,
+        help='window size, in # of messages (default: 10000)')
+    parser.add_argument(
+        '--percentiles', action='store_true',
+        help='estimate percentiles and a histogram as well')
+    parser.add_argument(
+        '--skip-list', action='store_true',
+        help='do not measure the list based approach')
+    args = parser.parse_args()
+
+    intervals = get_intervals(args.messages)
+    runs = [('windowed stats', run_windowed_stats)]
+    if not args.skip_list:
+        runs.append(('list', run_list))
+    for name, run in runs:
+        start = time.perf_counter()
+        run(intervals, args.window, args.percentiles)
+        duration = time.perf_counter() - start
+        print(
+            f'{name}: {duration:.2f} s, '
+            f'{duration / args.messages * 1e9:.0f} ns per message')
+
+
+if __name__ == '__main__':
+    main()
@@ -839,6 +839,75 @@ class TestROS2TopicCLI(unittest.TestCase):
         average_rate = float(average_rate_line_pattern.match(head_line).group(1))
         assert math.isclose(average_rate, 0.5, rel_tol=1e-2)
 
+    @launch_testing.markers.retry_on_failure(times=5, delay=1)
+    def test_topic_hz_with_message_timestamps(self):
+        average_rate_line_pattern = re.compile(r'average rate: (\d+.\d{3})')
+        stats_line_pattern = re.compile(
+            r'\s*min: \d+.\d{3}s max: \d+.\d{3}s std dev: \d+.\d{5}s window: \d+'
+        )
+        with self.launch_topic_command(
+            arguments=['hz', '--message-timestamp', 'source', '/chatter']
+        ) as topic_command:
+            assert topic_command.wait_for_output(functools.partial(
+                launch_testing.tools.expect_output, expected_lines=[
+                    average_rate_line_pattern, stats_line_pattern
+                ], strict=True
+            ), timeout=10), 'Output does not match: ' + topic_command.output
+        assert topic_command.wait_for_shutdown(timeout=10)
+
+        head_line = topic_command.output.splitlines()[0]
+        average_rate = float(average_rate_line_pattern.match(head_line).group(1))
+        assert math.isclose(average_rate, 1., rel_tol=1e-2)
+
+    @launch_testing.markers.retry_on_failure(times=5, delay=1)
+    def test_topic_hz_percentiles(self):
+        average_rate_line_pattern = re.compile(r'average rate: (\d+.\d{3})')
+        stats_line_pattern = re.compile(
+            r'\s*min: \d+.\d{3}s max: \d+.\d{3}s std dev: \d+.\d{5}s window: \d+'
+        )
+        percentiles_line_pattern = re.compile(
+            r'\s*p50: (\d+.\d{3})s p90: \d+.\d{3}s p99: \d+.\d{3}s p99.9: \d+.\d{3}s'
+        )
+        histogram_line_pattern = re.compile(r'\s*\d+.\d{3}s - \d+.\d{3}s \|#*\s*\| \d+')
+        with self.launch_topic_command(
+            arguments=['hz', '--percentiles', '/chatter']
+        ) as topic_command:
+            assert topic_command.wait_for_output(functools.partial(
+                launch_testing.tools.expect_output, expected_lines=[
+                    average_rate_line_pattern, stats_line_pattern,
+                    percentiles_line_pattern, histogram_line_pattern
+                ], strict=True
+            ), timeout=10), 'Output does not match: ' + topic_command.output
+        assert topic_command.wait_for_shutdown(timeout=10)
+
+        percentiles_line = topic_command.output.splitlines()[2]
+        median = float(percentiles_line_pattern.match(percentiles_line).group(1))
+        assert math.isclose(median, 1., rel_tol=1e-2)
+
+    @launch_testing.markers.retry_on_failure(times=5, delay=1)
+    def test_multiple_topics_hz(self):
+        header_line_pattern = re.compile(
+            r'topic\s+rate\s+min_delta\s+max_delta\s+std_dev\s+window')
+        chatter_line_pattern = re.compile(
+            r'/chatter\s+(\d+.\d{3})\s+\d+.\d{3}s\s+\d+.\d{3}s\s+\d+.\d{5}s\s+\d+')
+        defaults_line_pattern = re.compile(
+            r'/defaults\s+(\d+.\d{3})\s+\d+.\d{3}s\s+\d+.\d{3}s\s+\d+.\d{5}s\s+\d+')
+        with self.launch_topic_command(
+            arguments=['hz', '/chatter', '/def*']
+        ) as topic_command:
+            assert topic_command.wait_for_output(functools.partial(
+                launch_testing.tools.expect_output, expected_lines=[
+                    header_line_pattern, chatter_line_pattern, defaults_line_pattern
+                ], strict=False
+            ), timeout=10), 'Output does not match: ' + topic_command.output
+        assert topic_command.wait_for_shutdown(timeout=10)
+
+        for line in topic_command.output.splitlines():
+            match = chatter_line_pattern.match(line) or defaults_line_pattern.match(line)
+            if match:
+                assert math.isclose(float(match.group(1)), 1., rel_tol=1e-2)
+        assert '_hidden_chatter' not in topic_command.output
+
     @launch_testing.markers.retry_on_failure(times=5, delay=1)
     def test_topic_bw(self):
         with self.launch_topic_command(arguments=['bw', '/defaults']) as topic_command:
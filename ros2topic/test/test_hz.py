@@ -0,0 +1,33 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ros2topic.verb.hz import ROSTopicHz
+
+
+class FakeNode:
+
+    def get_clock(self):
+        return None
+
+
+def test_out_of_order_message_timestamps():
+    hz = ROSTopicHz(FakeNode(), window_size=10, message_timestamp='source')
+    # two publishers with slightly different clocks, interleaved
+    for timestamp in (1000, 2000, 1900, 3000, 2900, 4000):
+        hz.callback_hz_with_info(None, {'source_timestamp': timestamp}, topic='/chatter')
+    times = hz.get_times(topic='/chatter')
+    assert len(times) == 3
+    assert times.min == 1000
+    assert times.max == 1000
+    assert hz.get_msg_tn(topic='/chatter') == 4000
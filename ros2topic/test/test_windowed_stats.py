@@ -0,0 +1,142 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import random
+import statistics
+
+import pytest
+
+from ros2topic.api.stats import format_histogram
+from ros2topic.api.stats import QuantileSketch
+from ros2topic.api.stats import WindowedStats
+
+
+def test_empty():
+    stats = WindowedStats(3)
+    assert len(stats) == 0
+    assert not stats
+    assert stats.sum == 0
+
+
+@pytest.mark.parametrize('window_size', [1, 2, 7, 100])
+def test_matches_window(window_size):
+    rng = random.Random(42)
+    stats = WindowedStats(window_size)
+    values = []
+    for _ in range(500):
+        value = rng.randrange(10**9)
+        stats.append(value)
+        values = (values + [value])[-window_size:]
+        assert len(stats) == len(values)
+        assert stats.sum == sum(values)
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.min == min(values)
+        assert stats.max == max(values)
+        assert stats.std_dev == pytest.approx(statistics.pstdev(values), abs=1e-6)
+
+
+def test_monotonic_values():
+    stats = WindowedStats(3)
+    for value in range(10):
+        stats.append(value)
+    assert (stats.min, stats.max) == (7, 9)
+    for value in reversed(range(10)):
+        stats.append(value)
+    assert (stats.min, stats.max) == (0, 2)
+
+
+def test_clear():
+    stats = WindowedStats(2)
+    stats.append(5)
+    stats.append(7)
+    stats.clear()
+    assert not stats
+    stats.append(1)
+    stats.append(3)
+    stats.append(2)
+    assert stats.sum == 5
+    assert (stats.min, stats.max) == (2, 3)
+    assert stats.std_dev == 0.5
+
+
+def test_float_values():
+    stats = WindowedStats(4)
+    for value in (0.1, 0.2, 0.3, 0.4, 0.5):
+        stats.append(value)
+    assert stats.mean == pytest.approx(0.35)
+    assert stats.std_dev == pytest.approx(math.sqrt(0.0125))
+
+
+def exact_quantile(values, fraction):
+    values = sorted(values)
+    return values[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+@pytest.mark.parametrize('fraction', [0.0, 0.5, 0.9, 0.99, 0.999, 1.0])
+def test_quantile_sketch(fraction):
+    rng = random.Random(42)
+    sketch = QuantileSketch(precision=8)
+    assert sketch.quantile(fraction) is None
+    values = [int(rng.lognormvariate(15, 2)) for _ in range(10000)]
+    for value in values:
+        sketch.add(value)
+    expected = exact_quantile(values, fraction)
+    assert sketch.quantile(fraction) == pytest.approx(expected, rel=2**-7, abs=1)
+
+    for value in values[:5000]:
+        sketch.remove(value)
+    expected = exact_quantile(values[5000:], fraction)
+    assert sketch.quantile(fraction) == pytest.approx(expected, rel=2**-7, abs=1)
+
+
+def test_quantile_sketch_small_and_negative_values():
+    sketch = QuantileSketch(precision=4)
+    values = [-1000, -3, 0, 5, 15, 16, 17, 1000]
+    for value in values:
+        sketch.add(value)
+    # small values are counted exactly
+    assert sketch.quantile(2 / 8) == -3
+    assert sketch.quantile(4 / 8) == 5
+    assert sketch.quantile(5 / 8) == 15
+    assert sketch.quantile(0) == pytest.approx(-1000, rel=2**-3)
+    assert sketch.quantile(1) == pytest.approx(1000, rel=2**-3)
+
+
+def test_windowed_percentiles():
+    stats = WindowedStats(1000, track_percentiles=True)
+    assert stats.tracks_percentiles
+    assert not WindowedStats(1000).tracks_percentiles
+    for value in range(10000):
+        stats.append(value)
+    # only the last 1000 values are left
+    assert stats.percentile(0.0) == 9000
+    assert stats.percentile(0.5) == pytest.approx(9499, rel=2**-7)
+    assert stats.percentile(1.0) == 9999
+    assert sum(stats.histogram(10)) == 1000
+
+    stats.clear()
+    stats.append(7)
+    assert stats.percentile(0.5) == 7
+    assert stats.histogram(4) == [1, 0, 0, 0]
+
+
+def test_format_histogram():
+    lines = format_histogram(0, 20, [1, 4, 0, 2], '{:g}'.format)
+    assert lines == [
+        ' 0 -  5 |##########                              | 1',
+        ' 5 - 10 |########################################| 4',
+        '10 - 15 |                                        | 0',
+        '15 - 20 |####################                    | 2',
+    ]